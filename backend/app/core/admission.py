@@ -0,0 +1,243 @@
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import os
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+
+from fastapi import Request
+
+from app.core.auth import _verify_api_token
+from app.core.errors import AppError
+
+# ─── Admission control ───────────────────────────────────────────────────────
+# Bounds how many requests of a route group run at once. Excess requests wait
+# in a priority queue (SURGEON/ADMIN ahead of observers); once the observer
+# queue is full, or a waiter outlives ADMISSION_QUEUE_TIMEOUT_MS, the request
+# is shed with 503 + Retry-After instead of piling onto the threadpool.
+#
+# Per-group overrides: ADMISSION_<GROUP>_CONCURRENCY / ADMISSION_<GROUP>_QUEUE,
+# e.g. ADMISSION_JOIN_CONCURRENCY=32. ADMISSION_ENABLED=0 disables shedding.
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+_HIGH_PRIORITY_ROLES = {"SURGEON", "ADMIN"}
+
+# group -> (max concurrency, max queued observer requests)
+_DEFAULT_LIMITS: dict[str, tuple[int, int]] = {
+    "auth": (16, 256),
+    "join": (16, 256),
+    "ws": (32, 512),
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, str(default)))
+
+
+@dataclass
+class AdmissionStats:
+    active: int = 0
+    queued: int = 0
+    admitted: int = 0
+    shed: int = 0
+
+
+class AdmissionLimiter:
+    """Priority-aware concurrency limiter. Must be used from a single event loop."""
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.stats = AdmissionStats()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._queued_low = 0
+        self._seq = itertools.count()
+
+    def _shed(self) -> AppError:
+        self.stats.shed += 1
+        return AppError(
+            "OVERLOADED",
+            "Server is busy, retry shortly",
+            503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def acquire(self, priority: int = PRIORITY_LOW) -> None:
+        if self.stats.active < self.max_concurrency and not self._waiters:
+            self.stats.active += 1
+            self.stats.admitted += 1
+            return
+        if priority != PRIORITY_HIGH and self._queued_low >= self.max_queue:
+            raise self._shed()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self.stats.queued += 1
+        if priority != PRIORITY_HIGH:
+            self._queued_low += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                self.release()
+            else:
+                future.cancel()
+            if isinstance(exc, TimeoutError):
+                raise self._shed() from exc
+            raise
+        finally:
+            self.stats.queued -= 1
+            if priority != PRIORITY_HIGH:
+                self._queued_low -= 1
+        self.stats.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # Hand the slot straight to the next waiter; `active` is unchanged.
+                future.set_result(None)
+                return
+        self.stats.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_LOW):
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class AdmissionController:
+    def __init__(self):
+        self.enabled = os.environ.get("ADMISSION_ENABLED", "1") != "0"
+        self._limiters: dict[str, AdmissionLimiter] = {}
+
+    def limiter(self, group: str) -> AdmissionLimiter:
+        limiter = self._limiters.get(group)
+        if limiter is None:
+            concurrency, queue = _DEFAULT_LIMITS.get(group, (32, 256))
+            key = group.upper()
+            limiter = AdmissionLimiter(
+                name=group,
+                max_concurrency=_env_int(f"ADMISSION_{key}_CONCURRENCY", concurrency),
+                max_queue=_env_int(f"ADMISSION_{key}_QUEUE", queue),
+                queue_timeout=_env_int("ADMISSION_QUEUE_TIMEOUT_MS", 2000) / 1000,
+                retry_after=_env_int("ADMISSION_RETRY_AFTER_SECONDS", 1),
+            )
+            self._limiters[group] = limiter
+        return limiter
+
+    def slot(self, group: str, priority: int):
+        if not self.enabled:
+            return nullcontext()
+        return self.limiter(group).slot(priority)
+
+    def snapshot(self) -> dict[str, AdmissionStats]:
+        return {name: limiter.stats for name, limiter in self._limiters.items()}
+
+    def reset(self) -> None:
+        self._limiters.clear()
+
+
+admission = AdmissionController()
+
+
+def role_priority(role: str | None) -> int:
+    return PRIORITY_HIGH if (role or "").upper() in _HIGH_PRIORITY_ROLES else PRIORITY_LOW
+
+
+def request_priority(request: Request) -> int:
+    """Classify a request from its headers alone — no DB access before admission."""
+    authorization = request.headers.get("authorization") or ""
+    if authorization.startswith("Bearer "):
+        claims = _verify_api_token(authorization.removeprefix("Bearer ").strip())
+        return role_priority(claims.get("role") if claims else None)
+    headers = request.headers
+    if "x-dev-role" not in headers and "x-dev-user-id" not in headers:
+        # No credentials at all: anyone can send that, so it must not jump
+        # the observer queue bound.
+        return PRIORITY_LOW
+    # Mirrors get_current_principal: the dev fallback defaults to SURGEON.
+    return role_priority(headers.get("x-dev-role") or "SURGEON")
+
+
+async def token_request_priority(request: Request) -> int:
+    """
+    /auth/token carries no credentials; classify it by the role it asks for.
+    The body is already read (and size-capped) by the time dependencies run.
+    """
+    try:
+        role = json.loads(await request.body()).get("role")
+    except (ValueError, AttributeError):
+        role = None
+    return role_priority(role if isinstance(role, str) else None)
+
+
+async def _header_priority(request: Request) -> int:
+    return request_priority(request)
+
+
+def admit(group: str, classify: Callable[[Request], Awaitable[int]] = _header_priority):
+    """
+    Route dependency that holds an admission slot for the whole request.
+
+    Declare it in the route's `dependencies=[...]` so it is resolved before
+    sync dependencies such as get_current_principal reach the threadpool.
+    `classify` picks the queue priority (default: from the auth headers).
+    """
+
+    async def _dep(request: Request):
+        async with admission.slot(group, await classify(request)):
+            yield
+
+    return _dep
+
+
+class TokenBucket:
+    """Per-connection inbound message rate limiter (not thread-safe)."""
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil((1 - self._tokens) / self.rate))
+
+
+def layout_update_bucket() -> TokenBucket:
+    rate = float(os.environ.get("WS_LAYOUT_UPDATES_PER_SECOND", "10"))
+    burst = float(os.environ.get("WS_LAYOUT_UPDATE_BURST", "20"))
+    return TokenBucket(rate=rate, capacity=burst)
@@ -3,17 +3,20 @@ import hashlib
 import hmac
 import json
 import os
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Callable
+from typing import Awaitable, Callable
 from uuid import uuid4
 
 from fastapi import Depends, Header
 
-from app.core.database import get_conn
 from app.core.errors import AppError
+from app.core.executors import executors
+from app.storage import get_storage
 
 
 class Role(str, Enum):
@@ -22,7 +25,7 @@ class Role(str, Enum):
     ADMIN = "ADMIN"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Principal:
     user_id: str
     role: Role
@@ -38,19 +41,44 @@ def _normalize_role(value: str) -> Role:
         raise AppError("INVALID_ROLE", f"Unsupported role '{value}'", 400) from exc
 
 
-def _upsert_user(user_id: str, role: Role) -> None:
-    now = datetime.now(timezone.utc).isoformat()
-    with get_conn() as conn:
-        conn.execute(
-            """
-            insert into users (id, email, display_name, role, created_at)
-            values (?, null, ?, ?, ?)
-            on conflict(id) do update set
-              role = excluded.role,
-              display_name = excluded.display_name
-            """,
-            (user_id, user_id, role.value, now),
-        )
+# user_id -> role already written by this process, least recently used first.
+# Lets authenticated polling skip the users upsert (a write transaction) on
+# every request. Bounded so a stream of distinct ids cannot grow it forever;
+# an evicted user just costs one more upsert when seen again.
+KNOWN_USERS_MAX = int(os.environ.get("AUTH_KNOWN_USERS_MAX", "10000"))
+_known_users: OrderedDict[str, Role] = OrderedDict()
+_known_users_lock = threading.Lock()
+
+
+def _is_known(user_id: str, role: Role) -> bool:
+    with _known_users_lock:
+        if _known_users.get(user_id) is not role:
+            return False
+        _known_users.move_to_end(user_id)
+        return True
+
+
+def _remember_user(user_id: str, role: Role) -> None:
+    with _known_users_lock:
+        _known_users[user_id] = role
+        _known_users.move_to_end(user_id)
+        while len(_known_users) > KNOWN_USERS_MAX:
+            _known_users.popitem(last=False)
+
+
+def _upsert_user(user_id: str, role: Role, remember: bool = True) -> None:
+    if _is_known(user_id, role):
+        return
+    get_storage().upsert_user(user_id, role.value, datetime.now(timezone.utc).isoformat())
+    if remember:
+        _remember_user(user_id, role)
+
+
+async def _upsert_user_async(user_id: str, role: Role, remember: bool = True) -> None:
+    """_upsert_user for async callers: known users cost no thread hop, new ones use the auth pool."""
+    if _is_known(user_id, role):
+        return
+    await executors.run("auth", _upsert_user, user_id, role, remember)
 
 
 # ─── API token helpers ────────────────────────────────────────────────────────
@@ -95,7 +123,7 @@ def _verify_api_token(token: str) -> dict | None:
 # ─── FastAPI dependencies ─────────────────────────────────────────────────────
 
 
-def get_current_principal(
+async def get_current_principal(
     authorization: str | None = Header(default=None),
     x_dev_user_id: str | None = Header(default=None),
     x_dev_role: str | None = Header(default=None),
@@ -108,21 +136,25 @@ def get_current_principal(
             raise AppError("INVALID_TOKEN", "Bearer token is invalid or expired", 401)
         user_id = claims["userId"]
         role = _normalize_role(claims["role"])
-        _upsert_user(user_id, role)
+        await _upsert_user_async(user_id, role)
         return Principal(user_id=user_id, role=role)
 
     # 2. Dev header fallback — temporary scaffold. Replace with OIDC validation.
     #    See docs/AUTH_MIGRATION.md for the step-by-step migration plan.
-    user_id = (x_dev_user_id or "").strip() or f"dev-user-{uuid4().hex[:8]}"
+    user_id = (x_dev_user_id or "").strip()
+    # A generated id is never presented again, so it is not worth remembering.
+    generated = not user_id
+    if generated:
+        user_id = f"dev-user-{uuid4().hex[:8]}"
     role = _normalize_role(x_dev_role or "SURGEON")
-    _upsert_user(user_id, role)
+    await _upsert_user_async(user_id, role, remember=not generated)
     return Principal(user_id=user_id, role=role)
 
 
-def require_roles(*allowed: Role) -> Callable[[Principal], Principal]:
+def require_roles(*allowed: Role) -> Callable[[Principal], Awaitable[Principal]]:
     allowed_set = {r.value for r in allowed}
 
-    def _dep(principal: Principal = Depends(get_current_principal)) -> Principal:
+    async def _dep(principal: Principal = Depends(get_current_principal)) -> Principal:
         if principal.role.value not in allowed_set:
             raise AppError("FORBIDDEN", "Insufficient role for this operation", 403)
         return principal
@@ -0,0 +1,103 @@
+import json
+import re
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class PayloadTooLarge(HTTPException):
+    """
+    Raised from inside the body stream. Subclasses HTTPException so FastAPI's
+    body reader re-raises it untouched instead of turning it into a 400.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=f"Request body exceeds {limit} bytes")
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject oversized request bodies before they are buffered or parsed.
+
+    A declared Content-Length over the limit is answered with 413 without
+    reading the body; chunked bodies are counted as they stream in and cut
+    off with PayloadTooLarge as soon as they cross the limit. `path_limits`
+    overrides the default for matching paths (first match wins).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_limit: int,
+        path_limits: list[tuple[str, int]] | None = None,
+    ):
+        self.app = app
+        self.default_limit = default_limit
+        self.path_limits = [(re.compile(pattern), limit) for pattern, limit in path_limits or []]
+
+    def _limit_for(self, path: str) -> int:
+        for pattern, limit in self.path_limits:
+            if pattern.fullmatch(path):
+                return limit
+        return self.default_limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in {"POST", "PUT", "PATCH"}:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit_for(scope["path"])
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > limit:
+                    await _send_too_large(scope, send, limit)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise PayloadTooLarge(limit)
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except PayloadTooLarge:
+            if response_started:
+                raise
+            await _send_too_large(scope, send, limit)
+
+
+async def _send_too_large(scope: Scope, send: Send, limit: int) -> None:
+    body = json.dumps(
+        {
+            "error": {
+                "code": "PAYLOAD_TOO_LARGE",
+                "message": f"Request body exceeds {limit} bytes",
+                "requestId": scope.get("state", {}).get("request_id"),
+            }
+        }
+    ).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,135 @@
+import mmap
+import os
+
+import anyio
+from fastapi.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.errors import AppError
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Resolve a `Range: bytes=...` header to an inclusive (start, end) pair.
+
+    Returns None when the whole entity should be sent: no header, a
+    non-bytes unit, a malformed value or a multi-range request (which the
+    RFC lets a server answer with the full body). Raises 416 when the range
+    cannot be satisfied.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            suffix = int(last)
+            if suffix == 0:
+                raise _unsatisfiable(size)
+            start, end = max(0, size - suffix), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise _unsatisfiable(size)
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _unsatisfiable(size: int) -> AppError:
+    return AppError(
+        "RANGE_NOT_SATISFIABLE",
+        "Requested range is outside the file",
+        416,
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+class ByteRangeResponse(Response):
+    """
+    Send bytes [start, end] of a memory map or a file, in fixed-size chunks.
+
+    Memory-mapped sources are sliced on a worker thread (a cold page fault
+    must not stall the event loop); paths are read with async file I/O. The
+    caller sets validators and Content-Range; HEAD requests get headers only.
+
+    A file that no longer holds `end` when it is opened gets a 503 instead of
+    headers promising bytes it does not have; one that shrinks mid-send
+    aborts the response rather than ending it short of Content-Length.
+    """
+
+    chunk_size = 256 * 1024
+    # Mapped slices are copied per thread hop, so fewer, larger ones.
+    mmap_chunk_size = 1024 * 1024
+
+    def __init__(
+        self,
+        source: mmap.mmap | str,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = None,
+    ):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.source = source
+        self.start = start
+        self.end = end
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        head = scope.get("method") == "HEAD"
+        position, stop = self.start, self.end + 1
+        if isinstance(self.source, str):
+            async with await anyio.open_file(self.source, "rb") as f:
+                # Raised before the response starts, so the app's error handler answers it.
+                if await f.seek(0, os.SEEK_END) < stop:
+                    raise AppError(
+                        "VIDEO_CHANGED",
+                        "Video changed while being served, retry",
+                        503,
+                        headers={"Retry-After": "1"},
+                    )
+                await self._send_start(send)
+                if head:
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+                await f.seek(position)
+                while position < stop:
+                    chunk = await f.read(min(self.chunk_size, stop - position))
+                    if not chunk:
+                        raise OSError(f"{self.source} shrank while being sent")
+                    position += len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            await self._send_start(send)
+            if head:
+                await send({"type": "http.response.body", "body": b""})
+                return
+            while position < stop:
+                chunk = await anyio.to_thread.run_sync(
+                    self._slice, position, min(position + self.mmap_chunk_size, stop)
+                )
+                position += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        # Terminate explicitly: also covers empty files.
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _send_start(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+
+    def _slice(self, start: int, stop: int) -> bytes:
+        return self.source[start:stop]
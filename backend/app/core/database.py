@@ -1,5 +1,6 @@
 import os
 import sqlite3
+import zlib
 from contextlib import contextmanager
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
@@ -7,61 +8,148 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 DB_PATH = os.environ.get("LIVESURGERY_DB_PATH", os.path.join(DATA_DIR, "livesurgery.db"))
 
 
-def _ensure_data_dir() -> None:
-    os.makedirs(DATA_DIR, exist_ok=True)
-
-
-def init_db() -> None:
-    _ensure_data_dir()
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute("""
-            create table if not exists users (
-              id text primary key,
-              email text unique,
-              display_name text,
-              role text not null check (role in ('SURGEON','OBSERVER','ADMIN')),
-              created_at text not null
-            )
-            """)
-        conn.execute("""
-            create table if not exists sessions (
-              id text primary key,
-              title text not null,
-              visibility text not null check (visibility in ('PRIVATE','PUBLIC')),
-              status text not null check (status in ('DRAFT','LIVE','ENDED','ARCHIVED')),
-              created_by text not null references users(id),
-              created_at text not null,
-              updated_at text not null
-            )
-            """)
-        conn.execute("""
-            create table if not exists session_participants (
-              session_id text not null references sessions(id),
-              user_id text not null references users(id),
-              role text not null check (role in ('SURGEON','OBSERVER','ADMIN')),
-              joined_at text,
-              left_at text,
-              primary key (session_id, user_id)
-            )
-            """)
-        conn.execute("""
-            create table if not exists session_layouts (
-              session_id text not null references sessions(id),
-              version integer not null,
-              layout_json text not null,
-              updated_by text not null references users(id),
-              updated_at text not null,
-              primary key (session_id, version)
-            )
-            """)
+# Directories already created by this process; connections are opened per
+# request, so the makedirs syscall is paid once per directory, not per query.
+_ensured_dirs: set[str] = set()
+
+
+def _ensure_parent_dir(path: str) -> None:
+    if path == ":memory:":
+        return
+    parent = os.path.dirname(os.path.abspath(path))
+    if parent not in _ensured_dirs:
+        os.makedirs(parent, exist_ok=True)
+        _ensured_dirs.add(parent)
+
+
+SCHEMA: dict[str, str] = {
+    "users": """
+    create table if not exists users (
+      id text primary key,
+      email text unique,
+      display_name text,
+      role text not null check (role in ('SURGEON','OBSERVER','ADMIN')),
+      created_at text not null
+    )
+    """,
+    "sessions": """
+    create table if not exists sessions (
+      id text primary key,
+      title text not null,
+      visibility text not null check (visibility in ('PRIVATE','PUBLIC')),
+      status text not null check (status in ('DRAFT','LIVE','ENDED','ARCHIVED')),
+      created_by text not null references users(id),
+      created_at text not null,
+      updated_at text not null
+    )
+    """,
+    "session_participants": """
+    create table if not exists session_participants (
+      session_id text not null references sessions(id),
+      user_id text not null references users(id),
+      role text not null check (role in ('SURGEON','OBSERVER','ADMIN')),
+      joined_at text,
+      left_at text,
+      primary key (session_id, user_id)
+    )
+    """,
+    "session_layouts": """
+    create table if not exists session_layouts (
+      session_id text not null references sessions(id),
+      version integer not null,
+      layout_json text not null,
+      updated_by text not null references users(id),
+      updated_at text not null,
+      primary key (session_id, version)
+    )
+    """,
+    # Cold tier for ended sessions (see app/storage/archive.py): compressed
+    # rosters and layout chunks, plus an uncompressed membership index so
+    # per-user listing and membership checks stay indexed lookups.
+    "session_archives": """
+    create table if not exists session_archives (
+      session_id text primary key references sessions(id),
+      archived_at text not null,
+      participants_blob blob not null
+    )
+    """,
+    "session_layout_archive": """
+    create table if not exists session_layout_archive (
+      session_id text not null references sessions(id),
+      first_version integer not null,
+      last_version integer not null,
+      first_at text not null,
+      last_at text not null,
+      rows_blob blob not null,
+      primary key (session_id, first_version)
+    )
+    """,
+    "archived_memberships": """
+    create table if not exists archived_memberships (
+      user_id text not null,
+      session_id text not null,
+      primary key (user_id, session_id)
+    ) without rowid
+    """,
+}
+
+# Extra indexes, keyed by the table they belong to.
+INDEXES: dict[str, list[str]] = {
+    "sessions": [
+        "create index if not exists idx_sessions_status_updated on sessions(status, updated_at)",
+    ],
+    "session_participants": [
+        "create index if not exists idx_session_participants_user"
+        " on session_participants(user_id)",
+    ],
+}
+
+
+def schema_version(tables: tuple[str, ...]) -> int:
+    """Fingerprint of the DDL for `tables`; changes whenever SCHEMA or INDEXES do."""
+    ddl = "\n".join(SCHEMA[table] + "\n".join(INDEXES.get(table, ())) for table in tables)
+    # PRAGMA user_version is a signed 32-bit int; 0 means "never initialised".
+    return zlib.crc32(ddl.encode("utf-8")) & 0x7FFFFFFF or 1
+
+
+def init_db(
+    path: str = DB_PATH, tables: tuple[str, ...] | None = None, force: bool | None = None
+) -> bool:
+    """
+    Create `tables` (default: all of SCHEMA) and their indexes if missing.
+
+    The schema fingerprint is stored in `PRAGMA user_version`; when the file
+    already carries the current one the DDL is skipped, so a warm boot costs
+    one pragma read. `force` (default: LIVESURGERY_SCHEMA_MODE=ddl) always
+    runs the DDL. Returns whether the DDL ran.
+    """
+    if force is None:
+        force = os.environ.get("LIVESURGERY_SCHEMA_MODE", "check").strip().lower() == "ddl"
+    tables = tables or tuple(SCHEMA)
+    version = schema_version(tables)
+    _ensure_parent_dir(path)
+    with sqlite3.connect(path) as conn:
+        if not force and conn.execute("pragma user_version").fetchone()[0] == version:
+            return False
+        for table in tables:
+            conn.execute(SCHEMA[table])
+            for ddl in INDEXES.get(table, ()):
+                conn.execute(ddl)
+        conn.execute(f"pragma user_version = {version}")
         conn.commit()
+    return True
 
 
-@contextmanager
-def get_conn():
-    _ensure_data_dir()
-    conn = sqlite3.connect(DB_PATH)
+def open_connection(path: str = DB_PATH, **kwargs) -> sqlite3.Connection:
+    _ensure_parent_dir(path)
+    conn = sqlite3.connect(path, **kwargs)
     conn.row_factory = sqlite3.Row
+    return conn
+
+
+@contextmanager
+def get_conn(path: str = DB_PATH):
+    conn = open_connection(path)
     try:
         yield conn
         conn.commit()
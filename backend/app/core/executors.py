@@ -0,0 +1,132 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+# ─── Executor pools ──────────────────────────────────────────────────────────
+# Blocking work started from async handlers runs on one of three named thread
+# pools instead of Starlette's shared default threadpool, so a burst of one
+# kind of work queues behind itself and cannot starve the others:
+#   auth  — principal resolution that has to touch storage (first-seen users)
+#   read  — storage reads
+#   write — storage writes that do not go through the group-commit writer
+#
+# Sizes: EXECUTOR_<POOL>_THREADS, e.g. EXECUTOR_READ_THREADS=32. Queue depth
+# and wait time per pool are reported by GET /v1/ops/executors.
+
+T = TypeVar("T")
+
+_DEFAULT_THREADS: dict[str, int] = {
+    "auth": 4,
+    "read": 16,
+    "write": 4,
+}
+
+
+@dataclass
+class ExecutorStats:
+    queued: int = 0
+    active: int = 0
+    completed: int = 0
+    max_queued: int = 0
+    queue_wait_seconds: float = 0.0
+
+
+class NamedExecutor:
+    """A ThreadPoolExecutor that counts queued/running calls and time spent waiting."""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.stats = ExecutorStats()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run `fn` on this pool and await it; contextvars are carried over like to_thread."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self.stats.queued += 1
+            self.stats.max_queued = max(self.stats.max_queued, self.stats.queued)
+        call = functools.partial(
+            contextvars.copy_context().run, self._call, submitted, fn, *args, **kwargs
+        )
+        future = self._pool.submit(call)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _call(self, submitted: float, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self.stats.queued -= 1
+            self.stats.active += 1
+            self.stats.queue_wait_seconds += time.perf_counter() - submitted
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.stats.active -= 1
+                self.stats.completed += 1
+
+    def _on_done(self, future: Future) -> None:
+        if future.cancelled():
+            # Cancelled before a thread picked it up (the awaiting request went away).
+            with self._lock:
+                self.stats.queued -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = self.stats
+            return {
+                "threads": self.max_workers,
+                "queued": stats.queued,
+                "active": stats.active,
+                "completed": stats.completed,
+                "maxQueued": stats.max_queued,
+                "meanQueueWaitMs": round(
+                    stats.queue_wait_seconds * 1000 / max(1, stats.completed), 3
+                ),
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class Executors:
+    """Registry of the named pools; each is created from env on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: dict[str, NamedExecutor] = {}
+
+    def get(self, name: str) -> NamedExecutor:
+        pool = self._pools.get(name)
+        if pool is not None:
+            return pool
+        with self._lock:
+            if name not in self._pools:
+                threads = int(
+                    os.environ.get(f"EXECUTOR_{name.upper()}_THREADS", str(_DEFAULT_THREADS[name]))
+                )
+                self._pools[name] = NamedExecutor(name, threads)
+            return self._pools[name]
+
+    async def run(self, name: str, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        return await self.get(name).run(fn, *args, **kwargs)
+
+    def snapshot(self) -> dict[str, dict]:
+        return {name: self.get(name).snapshot() for name in _DEFAULT_THREADS}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown()
+
+
+executors = Executors()
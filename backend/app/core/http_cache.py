@@ -0,0 +1,39 @@
+import hashlib
+
+from fastapi import Request, Response
+
+# Polling clients may keep a copy but must revalidate on every request; the
+# response depends on the caller's identity so shared caches must not store it.
+POLLING_CACHE_CONTROL = "private, no-cache"
+_VARY = "Authorization, X-Dev-User-Id, X-Dev-Role"
+
+
+def layout_etag(version: int) -> str:
+    return f'"layout-{version}"'
+
+
+def session_etag(session_id: str, updated_at: str) -> str:
+    digest = hashlib.blake2s(f"{session_id}|{updated_at}".encode("utf-8"), digest_size=8)
+    return f'"session-{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header covers `etag` (strong comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (candidate.strip() for candidate in header.split(","))
+
+
+def apply_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = POLLING_CACHE_CONTROL
+    response.headers["Vary"] = _VARY
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    apply_cache_headers(response, etag)
+    return response
@@ -1,14 +1,23 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+import asyncio
 import os
 import uuid
 
-from app.core.database import init_db, get_conn
+from app.core.body_limits import BodySizeLimitMiddleware, PayloadTooLarge
 from app.core.errors import AppError
-from app.routes import realtime, sessions, video
+from app.core.executors import executors
+from app.routes import ops, realtime, sessions, video
+from app.services.archival import run_archival
+from app.services.idle_eviction import run_idle_eviction
+from app.services.live_stats import live_stats
+from app.services.prewarm import run_prewarm
+from app.services.video_catalog import run_rescans
+from app.storage import get_storage
 from app.routes import auth as auth_routes
+from app.schemas.layouts import MAX_LAYOUT_BYTES
+from app.schemas.sessions import MAX_BULK_ENROLLMENT_BYTES
 
 app = FastAPI(
     title="Livesurgery PoC API", description="Backend API for Livesurgery PoC", version="0.2.0"
@@ -27,16 +36,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Body caps are enforced on the raw stream, before FastAPI buffers or parses JSON.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    default_limit=int(os.environ.get("MAX_REQUEST_BODY_BYTES", str(1024 * 1024))),
+    path_limits=[
+        (r"/v1/sessions/[^/]+/layout", MAX_LAYOUT_BYTES),
+        (r"/v1/sessions/[^/]+/participants:batchJoin", MAX_BULK_ENROLLMENT_BYTES),
+    ],
+)
+
 # Include routers
 app.include_router(auth_routes.router)
 app.include_router(video.router, prefix="/video", tags=["Video Simulation"])
+app.include_router(video.files_router)
 app.include_router(sessions.router)
 app.include_router(realtime.router)
+app.include_router(ops.router)
 
 
 @app.on_event("startup")
-def on_startup() -> None:
-    init_db()
+async def on_startup() -> None:
+    storage = get_storage()
+    # Checks the stored schema version; DDL only runs on a new or outdated file.
+    storage.init()
+    # One query at boot; from here on the dashboard aggregates are write-through.
+    live_rows = storage.live_sessions()
+    live_stats.load(live_rows)
+    # Connections and caches are warmed in the background; /healthz is up meanwhile.
+    app.state.prewarm = asyncio.create_task(run_prewarm(live_rows))
+    app.state.idle_eviction = asyncio.create_task(run_idle_eviction())
+    app.state.archival = asyncio.create_task(run_archival())
+    app.state.video_rescans = asyncio.create_task(run_rescans())
     # Guard: prevent deploying with the default dev WS secret.
     ws_secret = os.environ.get("WS_JWT_SECRET", "dev-ws-secret")
     app_env = os.environ.get("APP_ENV", "development").lower()
@@ -47,6 +78,16 @@ def on_startup() -> None:
         )
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    app.state.prewarm.cancel()
+    app.state.idle_eviction.cancel()
+    app.state.archival.cancel()
+    app.state.video_rescans.cancel()
+    get_storage().close()
+    executors.shutdown()
+
+
 @app.middleware("http")
 async def request_context(request: Request, call_next):
     request_id = request.headers.get("x-request-id") or f"req_{uuid.uuid4().hex[:12]}"
@@ -60,6 +101,7 @@ async def request_context(request: Request, call_next):
 async def app_error_handler(request: Request, exc: AppError):
     return JSONResponse(
         status_code=exc.status_code,
+        headers=exc.headers,
         content={
             "error": {
                 "code": exc.code,
@@ -70,6 +112,11 @@ async def app_error_handler(request: Request, exc: AppError):
     )
 
 
+@app.exception_handler(PayloadTooLarge)
+async def payload_too_large_handler(request: Request, exc: PayloadTooLarge):
+    return await app_error_handler(request, AppError("PAYLOAD_TOO_LARGE", exc.detail, 413))
+
+
 @app.get("/")
 def root():
     return {"message": "Livesurgery backend is running"}
@@ -77,10 +124,9 @@ def root():
 
 @app.get("/healthz", tags=["Health"])
 def healthz():
-    """Liveness + readiness check. Returns 503 if the database is unreachable."""
+    """Liveness + readiness check. Returns 503 if the storage engine is unreachable."""
     try:
-        with get_conn() as conn:
-            conn.execute("SELECT 1").fetchone()
+        get_storage().ping()
         db_status = "connected"
     except Exception:
         return JSONResponse(
@@ -88,9 +134,3 @@ def healthz():
             content={"status": "error", "version": app.version, "db": "disconnected"},
         )
     return {"status": "ok", "version": app.version, "db": db_status}
-
-
-# Mount static video directory
-videos_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../videos"))
-if os.path.isdir(videos_dir):
-    app.mount("/videos", StaticFiles(directory=videos_dir), name="videos")
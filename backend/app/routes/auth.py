@@ -1,10 +1,11 @@
 import time
 from datetime import datetime, timezone
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel, field_validator
 
-from app.core.auth import _normalize_role, _upsert_user, mint_api_token
+from app.core.admission import admit, token_request_priority
+from app.core.auth import _normalize_role, _upsert_user_async, mint_api_token
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -29,8 +30,12 @@ class TokenResponse(BaseModel):
     expiresAt: str
 
 
-@router.post("/token", response_model=TokenResponse)
-def create_token(body: TokenRequest):
+@router.post(
+    "/token",
+    response_model=TokenResponse,
+    dependencies=[Depends(admit("auth", token_request_priority))],
+)
+async def create_token(body: TokenRequest):
     """
     Dev-mode token endpoint. Accepts userId + role, returns a signed HMAC API token.
 
@@ -41,7 +46,7 @@ def create_token(body: TokenRequest):
     See docs/AUTH_MIGRATION.md for the step-by-step migration plan.
     """
     role = _normalize_role(body.role)
-    _upsert_user(body.userId, role)
+    await _upsert_user_async(body.userId, role)
     token, exp = mint_api_token(body.userId, role.value)
     expires_at = datetime.fromtimestamp(exp, tz=timezone.utc).isoformat()
     return TokenResponse(
@@ -0,0 +1,57 @@
+import asyncio
+import os
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.auth import Principal, Role, require_roles
+from app.core.executors import executors
+from app.core.responses import FastJSONResponse, RawJSONResponse
+from app.services.live_stats import live_stats
+
+router = APIRouter(prefix="/v1/ops", tags=["Operations"])
+
+
+def _stream_interval_seconds() -> float:
+    return float(os.environ.get("OPS_LIVE_STREAM_INTERVAL_SECONDS", "2"))
+
+
+@router.get("/live")
+def live_overview(principal: Principal = Depends(require_roles(Role.ADMIN))):
+    """
+    LIVE sessions with participant counts and layout versions, plus fleet
+    totals (sockets, layout updates and their recent rate, conflicts).
+
+    Served from write-through aggregates (services/live_stats.py): no
+    storage query and no hub walk, whatever the fleet size.
+    """
+    return RawJSONResponse(live_stats.snapshot_json())
+
+
+async def live_events(request: Request, interval_seconds: float) -> AsyncIterator[bytes]:
+    """SSE frames: the snapshot now, then every interval until the client goes away."""
+    yield f"retry: {int(interval_seconds * 1000)}\n\n".encode("ascii")
+    while not await request.is_disconnected():
+        yield b"event: live\ndata: " + live_stats.snapshot_json() + b"\n\n"
+        await asyncio.sleep(interval_seconds)
+
+
+@router.get("/live/stream")
+async def live_stream(
+    request: Request,
+    principal: Principal = Depends(require_roles(Role.ADMIN)),
+):
+    """Server-sent events variant of `/live` for wall displays."""
+    return StreamingResponse(
+        live_events(request, _stream_interval_seconds()),
+        media_type="text/event-stream",
+        # Proxies must not buffer the stream or cache it.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/executors")
+async def executor_stats(principal: Principal = Depends(require_roles(Role.ADMIN))):
+    """Thread count, queue depth, running calls and mean queue wait per executor pool."""
+    return FastJSONResponse({"pools": executors.snapshot()})
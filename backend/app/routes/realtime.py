@@ -1,23 +1,82 @@
+import json
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.core.database import get_conn
+from app.core.admission import admission, layout_update_bucket, role_priority
 from app.core.errors import AppError
-from app.services.layouts import get_latest_layout, publish_layout
+from app.schemas.layouts import MAX_WS_FRAME_BYTES, validate_layout_publish
+from app.services.layouts import get_latest_layout_async, publish_layout_async
 from app.services.realtime_hub import hub
+from app.services.version_cache import version_cache
+from app.storage import get_storage
 
 router = APIRouter(tags=["Realtime"])
 
 
-def _is_session_member(session_id: str, user_id: str) -> bool:
-    with get_conn() as conn:
-        membership = conn.execute(
-            """
-            select 1 from session_participants
-            where session_id = ? and user_id = ?
-            """,
-            (session_id, user_id),
-        ).fetchone()
-    return bool(membership)
+async def _is_session_member(session_id: str, user_id: str) -> bool:
+    if version_cache.is_member(session_id, user_id):
+        return True
+    if not await get_storage().is_participant_async(session_id, user_id):
+        return False
+    version_cache.remember_member(session_id, user_id)
+    return True
+
+
+async def _join_realtime(websocket: WebSocket, session_id: str, user_id: str) -> bool:
+    """Membership check, hub registration and initial snapshot (the admission-gated part)."""
+    if not await _is_session_member(session_id, user_id):
+        await websocket.send_json({"type": "error", "payload": {"code": "SESSION_NOT_FOUND"}})
+        await websocket.close(code=4404)
+        return False
+    row = await get_storage().get_session_async(session_id)
+    if row is None or row["status"] in {"ENDED", "ARCHIVED"}:
+        await websocket.send_json({"type": "error", "payload": {"code": "SESSION_ENDED"}})
+        await websocket.close(code=4410)
+        return False
+
+    await hub.connect(session_id, websocket)
+    # Read after hub.connect, so a publish in between is either in the
+    # snapshot or arrives as a layout.updated broadcast.
+    current_version, current_layout = await get_latest_layout_async(session_id)
+    await websocket.send_json(
+        {
+            "type": "layout.snapshot",
+            "payload": {"version": current_version, "layout": current_layout},
+        }
+    )
+    return True
+
+
+class FrameTooLarge(Exception):
+    pass
+
+
+async def _receive_message(websocket: WebSocket) -> dict | None:
+    """
+    receive_json() with the frame size checked before parsing. Returns None
+    (after telling the client) for frames that are not a JSON object.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    text = message.get("text")
+    if text is not None:
+        size = len(text) if text.isascii() else len(text.encode("utf-8"))
+    else:
+        text = message.get("bytes") or b""
+        size = len(text)
+    if size > MAX_WS_FRAME_BYTES:
+        raise FrameTooLarge()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        await websocket.send_json(
+            {"type": "error", "payload": {"code": "INVALID_MESSAGE", "message": "Expected JSON"}}
+        )
+        return None
+    return data
 
 
 @router.websocket("/ws/sessions/{session_id}")
@@ -29,19 +88,24 @@ async def session_ws(websocket: WebSocket, session_id: str, token: str):
             await websocket.send_json({"type": "error", "payload": {"code": "INVALID_WS_TOKEN"}})
             await websocket.close(code=4401)
             return
-        if not _is_session_member(session_id, claims.user_id):
-            await websocket.send_json({"type": "error", "payload": {"code": "SESSION_NOT_FOUND"}})
-            await websocket.close(code=4404)
+        try:
+            # The storage reads stay inside the slot: it is what sheds a
+            # connect storm before it piles onto the read executor.
+            async with admission.slot("ws", role_priority(claims.role)):
+                joined = await _join_realtime(websocket, session_id, claims.user_id)
+        except AppError as exc:
+            if exc.code != "OVERLOADED":
+                raise
+            retry_after = int((exc.headers or {}).get("Retry-After", "1"))
+            await websocket.send_json(
+                {"type": "error", "payload": {"code": exc.code, "retryAfter": retry_after}}
+            )
+            # 1013 = "Try Again Later"
+            await websocket.close(code=1013)
+            return
+        if not joined:
             return
 
-        await hub.connect(session_id, websocket)
-        current_version, current_layout = get_latest_layout(session_id)
-        await websocket.send_json(
-            {
-                "type": "layout.snapshot",
-                "payload": {"version": current_version, "layout": current_layout},
-            }
-        )
         participants = await hub.count(session_id)
         await hub.broadcast(
             session_id,
@@ -51,8 +115,12 @@ async def session_ws(websocket: WebSocket, session_id: str, token: str):
             },
         )
 
+        # Created on the first layout.update: observers (most sockets) never need one.
+        layout_bucket = None
         while True:
-            message = await websocket.receive_json()
+            message = await _receive_message(websocket)
+            if message is None:
+                continue
             msg_type = message.get("type")
             if msg_type == "layout.update":
                 if claims.role not in {"SURGEON", "ADMIN"}:
@@ -63,13 +131,26 @@ async def session_ws(websocket: WebSocket, session_id: str, token: str):
                         }
                     )
                     continue
-                payload = message.get("payload") or {}
-                base_version = int(payload.get("baseVersion", -1))
-                layout = payload.get("layout") or {}
+                if layout_bucket is None:
+                    layout_bucket = layout_update_bucket()
+                if not layout_bucket.allow():
+                    await websocket.send_json(
+                        {
+                            "type": "error",
+                            "payload": {
+                                "code": "RATE_LIMITED",
+                                "message": "Too many layout updates",
+                                "retryAfter": layout_bucket.retry_after(),
+                            },
+                        }
+                    )
+                    continue
                 try:
-                    new_version = publish_layout(
+                    update = validate_layout_publish(message.get("payload"))
+                    layout = update.layout.model_dump()
+                    new_version = await publish_layout_async(
                         session_id=session_id,
-                        base_version=base_version,
+                        base_version=update.baseVersion,
                         layout=layout,
                         updated_by=claims.user_id,
                     )
@@ -86,7 +167,7 @@ async def session_ws(websocket: WebSocket, session_id: str, token: str):
                     )
                 except AppError as exc:
                     if exc.code == "LAYOUT_VERSION_CONFLICT":
-                        latest_version, latest_layout = get_latest_layout(session_id)
+                        latest_version, latest_layout = await get_latest_layout_async(session_id)
                         await websocket.send_json(
                             {
                                 "type": "layout.conflict",
@@ -103,6 +184,18 @@ async def session_ws(websocket: WebSocket, session_id: str, token: str):
                         )
             elif msg_type == "ping":
                 await websocket.send_json({"type": "pong"})
+    except FrameTooLarge:
+        await websocket.send_json(
+            {
+                "type": "error",
+                "payload": {
+                    "code": "FRAME_TOO_LARGE",
+                    "message": f"Messages are limited to {MAX_WS_FRAME_BYTES} bytes",
+                },
+            }
+        )
+        # 1009 = "Message Too Big"
+        await websocket.close(code=1009)
     except AppError:
         await websocket.close(code=4401)
     except WebSocketDisconnect:
@@ -1,22 +1,42 @@
 import base64
 import json
+import zlib
+from collections.abc import Iterator
 from datetime import datetime, timezone
+from typing import Literal
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
+from app.core.admission import admit
 from app.core.auth import Principal, Role, get_current_principal, require_roles
-from app.core.database import get_conn
 from app.core.errors import AppError
+from app.core.http_cache import (
+    apply_cache_headers,
+    etag_matches,
+    layout_etag,
+    not_modified,
+    session_etag,
+)
+from app.core.responses import FastJSONResponse, RawJSONResponse, dumps, iso_utc
 from app.schemas.sessions import (
+    BulkEnrollRequest,
     CreateSessionRequest,
     ListSessionsResponse,
     SessionItem,
     UpdateParticipantRoleRequest,
 )
 from app.schemas.layouts import LayoutResponse, PublishLayoutRequest
-from app.services.layouts import get_latest_layout, publish_layout
+from app.services.layouts import (
+    current_layout_version_async,
+    get_latest_layout_json_async,
+    publish_layout_async,
+)
+from app.services.live_stats import live_stats
 from app.services.realtime_hub import hub
+from app.services.version_cache import version_cache
+from app.storage import get_storage
 
 router = APIRouter(prefix="/v1/sessions", tags=["Sessions"])
 
@@ -40,32 +60,27 @@ def _decode_cursor(cursor: str | None) -> int:
         raise AppError("INVALID_CURSOR", "Cursor is not valid", 400) from exc
 
 
-def _get_session_or_404(session_id: str) -> dict:
-    with get_conn() as conn:
-        row = conn.execute(
-            """
-            select id, title, visibility, status, created_by, created_at, updated_at
-            from sessions
-            where id = ?
-            """,
-            (session_id,),
-        ).fetchone()
+def _found(session_id: str, row: dict | None) -> dict:
     if not row:
         raise AppError("SESSION_NOT_FOUND", "Session not found", 404)
-    return dict(row)
-
-
-def _ensure_membership(session_id: str, user_id: str) -> None:
-    with get_conn() as conn:
-        membership = conn.execute(
-            """
-            select 1 from session_participants
-            where session_id = ? and user_id = ?
-            """,
-            (session_id, user_id),
-        ).fetchone()
-    if not membership:
+    version_cache.set_session_stamp(session_id, row["updated_at"])
+    return row
+
+
+def _get_session_or_404(session_id: str) -> dict:
+    return _found(session_id, get_storage().get_session(session_id))
+
+
+async def _get_session_or_404_async(session_id: str) -> dict:
+    return _found(session_id, await get_storage().get_session_async(session_id))
+
+
+async def _ensure_membership(session_id: str, user_id: str) -> None:
+    if version_cache.is_member(session_id, user_id):
+        return
+    if not await get_storage().is_participant_async(session_id, user_id):
         raise AppError("SESSION_NOT_FOUND", "Session not found", 404)
+    version_cache.remember_member(session_id, user_id)
 
 
 def _to_item(row: dict) -> SessionItem:
@@ -80,29 +95,42 @@ def _to_item(row: dict) -> SessionItem:
     )
 
 
+def _row_to_payload(row) -> dict:
+    """
+    Fast-path equivalent of `_to_item(row).model_dump(mode="json")`.
+
+    Rows come from our own inserts, which the CHECK constraints and request
+    schemas already validated, so re-validating them per row is pure overhead.
+    """
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "status": row["status"],
+        "createdAt": iso_utc(row["created_at"]),
+        "updatedAt": iso_utc(row["updated_at"]),
+        "createdBy": row["created_by"],
+        "visibility": row["visibility"],
+    }
+
+
 @router.post("", response_model=SessionItem, status_code=status.HTTP_201_CREATED)
-def create_session(
+async def create_session(
     payload: CreateSessionRequest,
     principal: Principal = Depends(require_roles(Role.SURGEON, Role.ADMIN)),
 ):
     session_id = str(uuid4())
     now = _now_iso()
-    with get_conn() as conn:
-        conn.execute(
-            """
-            insert into sessions (id, title, visibility, status, created_by, created_at, updated_at)
-            values (?, ?, ?, 'DRAFT', ?, ?, ?)
-            """,
-            (session_id, payload.title.strip(), payload.visibility, principal.user_id, now, now),
-        )
-        conn.execute(
-            """
-            insert into session_participants (session_id, user_id, role, joined_at, left_at)
-            values (?, ?, ?, ?, null)
-            on conflict(session_id, user_id) do update set role = excluded.role, joined_at = excluded.joined_at
-            """,
-            (session_id, principal.user_id, principal.role.value, now),
-        )
+    await get_storage().create_session_async(
+        session_id=session_id,
+        title=payload.title.strip(),
+        visibility=payload.visibility,
+        created_by=principal.user_id,
+        owner_role=principal.role.value,
+        now=now,
+    )
+    version_cache.set_session_stamp(session_id, now)
+    version_cache.set_layout_version(session_id, 0)
+    version_cache.remember_member(session_id, principal.user_id)
     return SessionItem(
         id=session_id,
         title=payload.title.strip(),
@@ -115,93 +143,110 @@ def create_session(
 
 
 @router.get("", response_model=ListSessionsResponse)
-def list_sessions(
+async def list_sessions(
     limit: int = Query(default=20, ge=1, le=100),
     cursor: str | None = Query(default=None),
     principal: Principal = Depends(get_current_principal),
 ):
     offset = _decode_cursor(cursor)
-    with get_conn() as conn:
-        rows = conn.execute(
-            """
-            select s.id, s.title, s.visibility, s.status, s.created_by, s.created_at, s.updated_at
-            from sessions s
-            join session_participants sp on sp.session_id = s.id and sp.user_id = ?
-            order by s.updated_at desc
-            limit ? offset ?
-            """,
-            (principal.user_id, limit + 1, offset),
-        ).fetchall()
+    rows = await get_storage().list_sessions_for_user_async(principal.user_id, limit + 1, offset)
     has_more = len(rows) > limit
-    page_rows = rows[:limit]
-    items = [_to_item(dict(r)) for r in page_rows]
+    items = [_row_to_payload(r) for r in rows[:limit]]
     next_cursor = _encode_cursor(offset + limit) if has_more else None
-    return ListSessionsResponse(items=items, nextCursor=next_cursor)
+    return FastJSONResponse({"items": items, "nextCursor": next_cursor})
 
 
 @router.get("/{session_id}", response_model=SessionItem)
-def get_session(
+async def get_session(
     session_id: str,
+    request: Request,
+    response: Response,
     principal: Principal = Depends(get_current_principal),
 ):
-    _ensure_membership(session_id, principal.user_id)
-    return _to_item(_get_session_or_404(session_id))
+    await _ensure_membership(session_id, principal.user_id)
+    stamp = version_cache.session_stamp(session_id)
+    if stamp is not None:
+        etag = session_etag(session_id, stamp)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    row = await _get_session_or_404_async(session_id)
+    etag = session_etag(session_id, row["updated_at"])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    apply_cache_headers(response, etag)
+    return _to_item(row)
 
 
-def _set_status(session_id: str, new_status: str, principal: Principal) -> SessionItem:
-    row = _get_session_or_404(session_id)
+def _ensure_can_manage(row: dict, principal: Principal, action: str) -> None:
     if principal.role not in {Role.ADMIN, Role.SURGEON}:
         raise AppError("FORBIDDEN", "Insufficient role for this operation", 403)
     if principal.role == Role.SURGEON and row["created_by"] != principal.user_id:
-        raise AppError("FORBIDDEN", "Only the owner surgeon can change status", 403)
+        raise AppError("FORBIDDEN", f"Only the owner surgeon can {action}", 403)
+
+
+def _ensure_not_archived(row: dict) -> None:
+    if row["status"] == "ARCHIVED":
+        raise AppError("SESSION_ARCHIVED", "Session is archived and read-only", 409)
+
+
+async def _set_status(session_id: str, new_status: str, principal: Principal) -> SessionItem:
+    row = await _get_session_or_404_async(session_id)
+    _ensure_can_manage(row, principal, "change status")
+    _ensure_not_archived(row)
 
     now = _now_iso()
-    with get_conn() as conn:
-        conn.execute(
-            "update sessions set status = ?, updated_at = ? where id = ?",
-            (new_status, now, session_id),
+    await get_storage().set_session_status_async(session_id, new_status, now)
+    version_cache.set_session_stamp(session_id, now)
+    if new_status == "LIVE":
+        live_stats.session_started(
+            session_id, row["title"], now, await current_layout_version_async(session_id)
         )
+    else:
+        live_stats.session_stopped(session_id)
     row["status"] = new_status
     row["updated_at"] = now
     return _to_item(row)
 
 
 @router.post("/{session_id}/start", response_model=SessionItem)
-def start_session(
+async def start_session(
     session_id: str,
     principal: Principal = Depends(get_current_principal),
 ):
-    return _set_status(session_id, "LIVE", principal)
+    return await _set_status(session_id, "LIVE", principal)
 
 
 @router.post("/{session_id}/end", response_model=SessionItem)
-def end_session(
+async def end_session(
     session_id: str,
     principal: Principal = Depends(get_current_principal),
 ):
-    return _set_status(session_id, "ENDED", principal)
+    """
+    End the session: close its sockets and free its hub entry and cached
+    state. Its history moves to the cold tier later (services/archival.py).
+    """
+    item = await _set_status(session_id, "ENDED", principal)
+    # 4410: session gone; clients should not reconnect.
+    await hub.close_session(
+        session_id, {"type": "session.ended", "payload": {"sessionId": session_id}}, code=4410
+    )
+    version_cache.forget(session_id)
+    return item
 
 
-@router.post("/{session_id}/participants:join")
-def join_session(
+@router.post("/{session_id}/participants:join", dependencies=[Depends(admit("join"))])
+async def join_session(
     session_id: str,
     request: Request,
     principal: Principal = Depends(get_current_principal),
 ):
-    _get_session_or_404(session_id)
+    _ensure_not_archived(await _get_session_or_404_async(session_id))
     now = _now_iso()
-    with get_conn() as conn:
-        conn.execute(
-            """
-            insert into session_participants (session_id, user_id, role, joined_at, left_at)
-            values (?, ?, ?, ?, null)
-            on conflict(session_id, user_id) do update set
-              role = excluded.role,
-              joined_at = excluded.joined_at,
-              left_at = null
-            """,
-            (session_id, principal.user_id, principal.role.value, now),
-        )
+
+    await get_storage().upsert_participant_async(
+        session_id, principal.user_id, principal.role.value, now
+    )
+    version_cache.remember_member(session_id, principal.user_id)
 
     ws_token = hub.mint_token(
         session_id=session_id, user_id=principal.user_id, role=principal.role.value
@@ -215,6 +260,66 @@ def join_session(
     }
 
 
+_ENROLL_CHUNK_SIZE = 500
+
+
+@router.post("/{session_id}/participants:batchJoin", dependencies=[Depends(admit("join"))])
+def batch_join_session(
+    session_id: str,
+    payload: BulkEnrollRequest,
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+):
+    """
+    Pre-register many participants in one transaction.
+
+    Users are created if missing (existing user rows are left untouched) and
+    participant rows are upserted with executemany. Only an ADMIN may enroll
+    SURGEON or ADMIN participants, as with PATCH .../participants/{userId};
+    the owning surgeon can enroll observers.
+
+    The response is NDJSON, one line per participant with its realtime token,
+    sent in chunks rather than as a single JSON document. Tokens are minted
+    here, not in the stream: the join admission slot is released when the
+    handler returns, before a streamed body runs.
+    """
+    row = get_storage().get_session(session_id)
+    if not row:
+        raise AppError("SESSION_NOT_FOUND", "Session not found", 404)
+    _ensure_can_manage(row, principal, "enroll participants")
+    _ensure_not_archived(row)
+
+    # Last entry wins when a userId is listed more than once.
+    roster = {p.userId.strip(): p.role for p in payload.participants if p.userId.strip()}
+    if principal.role != Role.ADMIN and any(role != "OBSERVER" for role in roster.values()):
+        raise AppError("FORBIDDEN", "Only an admin can enroll SURGEON or ADMIN participants", 403)
+    get_storage().enroll_participants(session_id, roster, _now_iso())
+    for user_id in roster:
+        version_cache.remember_member(session_id, user_id)
+
+    ws_url = str(request.base_url).rstrip("/") + f"/ws/sessions/{session_id}"
+    chunks: list[str] = []
+    lines: list[str] = []
+    for user_id, role in roster.items():
+        token = hub.mint_token(session_id=session_id, user_id=user_id, role=role)
+        line = {
+            "participant": {"userId": user_id, "role": role},
+            "realtime": {"wsUrl": ws_url, "token": token},
+        }
+        lines.append(json.dumps(line, separators=(",", ":")))
+        if len(lines) >= _ENROLL_CHUNK_SIZE:
+            chunks.append("\n".join(lines) + "\n")
+            lines = []
+    if lines:
+        chunks.append("\n".join(lines) + "\n")
+
+    return StreamingResponse(
+        iter(chunks),
+        media_type="application/x-ndjson",
+        headers={"X-Enrolled-Count": str(len(roster))},
+    )
+
+
 @router.patch("/{session_id}/participants/{user_id}")
 def update_participant_role(
     session_id: str,
@@ -222,35 +327,100 @@ def update_participant_role(
     payload: UpdateParticipantRoleRequest,
     principal: Principal = Depends(require_roles(Role.ADMIN)),
 ):
-    _get_session_or_404(session_id)
-    with get_conn() as conn:
-        existing = conn.execute(
-            """
-            select 1 from session_participants
-            where session_id = ? and user_id = ?
-            """,
-            (session_id, user_id),
-        ).fetchone()
-        if not existing:
-            raise AppError("PARTICIPANT_NOT_FOUND", "Participant not found", 404)
-        conn.execute(
-            """
-            update session_participants set role = ?
-            where session_id = ? and user_id = ?
-            """,
-            (payload.role, session_id, user_id),
-        )
+    _ensure_not_archived(_get_session_or_404(session_id))
+    if not get_storage().set_participant_role(session_id, user_id, payload.role):
+        raise AppError("PARTICIPANT_NOT_FOUND", "Participant not found", 404)
     return {"participant": {"userId": user_id, "role": payload.role}}
 
 
 @router.get("/{session_id}/layout", response_model=LayoutResponse)
-def get_layout(
+async def get_layout(
     session_id: str,
+    request: Request,
     principal: Principal = Depends(get_current_principal),
 ):
-    _ensure_membership(session_id, principal.user_id)
-    version, layout = get_latest_layout(session_id)
-    return LayoutResponse(version=version, layout=layout)
+    await _ensure_membership(session_id, principal.user_id)
+    cached_version = version_cache.layout_version(session_id)
+    if cached_version is not None and etag_matches(request, layout_etag(cached_version)):
+        return not_modified(layout_etag(cached_version))
+    version, layout_json = await get_latest_layout_json_async(session_id)
+    # Splice the stored JSON text in as-is instead of a loads/dumps round trip.
+    response = RawJSONResponse(f'{{"version":{version},"layout":{layout_json}}}')
+    apply_cache_headers(response, layout_etag(version))
+    return response
+
+
+_HISTORY_CHUNK_SIZE = 500
+
+
+def _history_bound(value: datetime | None) -> str | None:
+    """Render a time-window bound in the stored updated_at format (UTC isoformat)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+@router.get("/{session_id}/layout/history")
+async def get_layout_history(
+    session_id: str,
+    fromVersion: int = Query(default=1, ge=1),
+    toVersion: int | None = Query(default=None, ge=1),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    compress: Literal["gzip"] | None = Query(default=None),
+    principal: Principal = Depends(get_current_principal),
+):
+    """
+    Export a session's layout versions as NDJSON, oldest first.
+
+    Rows are read in pages of _HISTORY_CHUNK_SIZE and each page is written out
+    as one chunk, so memory stays constant however long the session ran.
+    `since`/`until` filter on the publish time ([since, until)).
+    `compress=gzip` gzips the stream on the fly and serves it as a
+    `.ndjson.gz` attachment for archiving.
+    """
+    await _ensure_membership(session_id, principal.user_id)
+    if toVersion is not None and toVersion < fromVersion:
+        raise AppError("INVALID_RANGE", "toVersion must be >= fromVersion", 400)
+    pages = get_storage().iter_layout_history(
+        session_id,
+        from_version=fromVersion,
+        to_version=toVersion,
+        since=_history_bound(since),
+        until=_history_bound(until),
+        chunk_size=_HISTORY_CHUNK_SIZE,
+    )
+
+    def _chunks() -> Iterator[bytes]:
+        for page in pages:
+            # layout_json is spliced in as stored, like GET .../layout.
+            yield "".join(
+                f'{{"version":{row["version"]},"layout":{row["layout_json"]},'
+                f'"updatedBy":{dumps(row["updated_by"]).decode()},'
+                f'"updatedAt":"{iso_utc(row["updated_at"])}"}}\n'
+                for row in page
+            ).encode("utf-8")
+
+    if compress != "gzip":
+        return StreamingResponse(_chunks(), media_type="application/x-ndjson")
+
+    def _gzipped() -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+        for chunk in _chunks():
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    return StreamingResponse(
+        _gzipped(),
+        media_type="application/gzip",
+        headers={
+            "Content-Disposition": (f'attachment; filename="layout-history-{session_id}.ndjson.gz"')
+        },
+    )
 
 
 @router.post("/{session_id}/layout", response_model=dict)
@@ -259,11 +429,12 @@ async def publish_layout_version(
     payload: PublishLayoutRequest,
     principal: Principal = Depends(require_roles(Role.SURGEON, Role.ADMIN)),
 ):
-    _ensure_membership(session_id, principal.user_id)
-    new_version = publish_layout(
+    await _ensure_membership(session_id, principal.user_id)
+    layout = payload.layout.model_dump()
+    new_version = await publish_layout_async(
         session_id=session_id,
         base_version=payload.baseVersion,
-        layout=payload.layout,
+        layout=layout,
         updated_by=principal.user_id,
     )
     await hub.broadcast(
@@ -272,7 +443,7 @@ async def publish_layout_version(
             "type": "layout.updated",
             "payload": {
                 "version": new_version,
-                "layout": payload.layout,
+                "layout": layout,
                 "updatedBy": principal.user_id,
             },
         },
@@ -1,12 +1,97 @@
-from fastapi import APIRouter
-from app.services.video_stream import get_simulated_stream
-
-router = APIRouter()
-
-
-@router.get("/simulate")
-def simulate_stream():
-    """
-    Return a simulated video stream URL (e.g. from OBS or a test feed).
-    """
-    return {"stream_url": get_simulated_stream()}
+from email.utils import formatdate
+
+from fastapi import APIRouter, Request, Response
+
+from app.core.byte_ranges import ByteRangeResponse, parse_byte_range
+from app.core.errors import AppError
+from app.core.http_cache import etag_matches
+from app.core.responses import FastJSONResponse
+from app.services.video_catalog import VideoEntry, video_catalog
+from app.services.video_stream import get_simulated_stream
+
+router = APIRouter()
+# Serves /videos/{name} (previously a StaticFiles mount) from the catalog.
+files_router = APIRouter(prefix="/videos", tags=["Video Files"])
+
+
+@router.get("/simulate")
+def simulate_stream():
+    """
+    Return a simulated video stream URL (e.g. from OBS or a test feed).
+    """
+    return {"stream_url": get_simulated_stream()}
+
+
+def _entry_payload(entry: VideoEntry) -> dict:
+    return {
+        "name": entry.name,
+        "url": f"/videos/{entry.name}",
+        "size": entry.size,
+        "modifiedAt": formatdate(entry.mtime_ns / 1e9, usegmt=True),
+        "etag": entry.etag,
+        "contentType": entry.content_type,
+        "durationSeconds": entry.duration_seconds,
+        "codec": entry.codec,
+        "width": entry.width,
+        "height": entry.height,
+    }
+
+
+def _get_entry_or_404(name: str, current: bool = False) -> VideoEntry:
+    entry = video_catalog.get_current(name) if current else video_catalog.get(name)
+    if entry is None:
+        raise AppError("VIDEO_NOT_FOUND", "Video not found", 404)
+    return entry
+
+
+@router.get("/catalog")
+def list_videos(request: Request):
+    """Indexed recordings with size, ETag and MP4 duration/codec, sorted by name."""
+    etag = f'"catalog-{video_catalog.generation:x}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    items = [_entry_payload(entry) for entry in video_catalog.list()]
+    return FastJSONResponse({"items": items}, headers={"ETag": etag})
+
+
+@router.get("/catalog/{name:path}")
+def get_video_metadata(name: str):
+    return FastJSONResponse(_entry_payload(_get_entry_or_404(name)))
+
+
+@files_router.api_route("/{name:path}", methods=["GET", "HEAD"])
+def get_video_file(name: str, request: Request):
+    """
+    Serve a recording with ETag/304 and single byte-range support.
+
+    Popular files come out of the catalog's memory-mapped hot cache; the
+    rest are streamed from disk in chunks. A plain def: indexing a file not
+    seen yet (stat + moov parse) and admitting one to the cache (open +
+    mmap) block, so the handler runs in the threadpool.
+
+    The entry is re-checked against the file first, so the validators and
+    Content-Length describe what is on disk now, not at the last scan.
+    """
+    entry = _get_entry_or_404(name, current=True)
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.mtime_ns / 1e9, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == entry.etag:
+        byte_range = parse_byte_range(request.headers.get("range"), entry.size)
+    if byte_range is None:
+        start, end, status_code = 0, entry.size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{entry.size}"
+
+    source = video_catalog.cache.get(entry) or entry.path
+    return ByteRangeResponse(
+        source, start, end, status_code, headers=headers, media_type=entry.content_type
+    )
@@ -1,6 +1,39 @@
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+
+from app.core.errors import AppError
+
+# Hard caps for a published layout. Size is checked on the raw bytes before any
+# JSON parsing (see core/body_limits.py and the WS receive loop); panel count
+# and field lengths are enforced by the schema below.
+MAX_LAYOUT_PANELS = 16
+MAX_LAYOUT_BYTES = 16 * 1024
+# A WS layout.update frame is the publish body plus a small envelope. The
+# server is started with --ws-max-size set to this (see the Dockerfile) so an
+# oversized frame is refused before it is buffered; the receive loop checks
+# it again for servers started without the flag.
+MAX_WS_FRAME_BYTES = MAX_LAYOUT_BYTES + 1024
+
+
+class LayoutPanel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: str = Field(min_length=1, max_length=64)
+    streamId: str | None = Field(default=None, max_length=256)
+
+
+class Layout(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    panels: list[LayoutPanel] = Field(max_length=MAX_LAYOUT_PANELS)
+
+    @model_validator(mode="after")
+    def panel_ids_unique(self) -> "Layout":
+        ids = [panel.id for panel in self.panels]
+        if len(ids) != len(set(ids)):
+            raise ValueError("panel ids must be unique")
+        return self
 
 
 class LayoutResponse(BaseModel):
@@ -10,4 +43,17 @@ class LayoutResponse(BaseModel):
 
 class PublishLayoutRequest(BaseModel):
     baseVersion: int
-    layout: dict[str, Any]
+    layout: Layout
+
+
+def validate_layout_publish(payload: Any) -> PublishLayoutRequest:
+    """
+    Shared validator for WS `layout.update` payloads (the REST route gets the
+    same PublishLayoutRequest model through FastAPI). Raises INVALID_LAYOUT.
+    """
+    try:
+        return PublishLayoutRequest.model_validate(payload)
+    except ValidationError as exc:
+        first = exc.errors()[0]
+        where = ".".join(str(part) for part in first["loc"]) or "payload"
+        raise AppError("INVALID_LAYOUT", f"{where}: {first['msg']}", 422) from exc
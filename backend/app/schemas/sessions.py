@@ -27,5 +27,23 @@ class ListSessionsResponse(BaseModel):
     nextCursor: str | None = None
 
 
+ParticipantRole = Literal["SURGEON", "OBSERVER", "ADMIN"]
+
+MAX_BULK_ENROLLMENT = 10_000
+# Body cap for participants:batchJoin (see core/body_limits.py), sized so a
+# full roster fits: an entry with a 200-character ASCII userId is ~240 bytes
+# compact, leaving about as much again for indentation.
+MAX_BULK_ENROLLMENT_BYTES = MAX_BULK_ENROLLMENT * 512
+
+
 class UpdateParticipantRoleRequest(BaseModel):
-    role: Literal["SURGEON", "OBSERVER", "ADMIN"]
+    role: ParticipantRole
+
+
+class EnrollParticipant(BaseModel):
+    userId: str = Field(min_length=1, max_length=200)
+    role: ParticipantRole = "OBSERVER"
+
+
+class BulkEnrollRequest(BaseModel):
+    participants: list[EnrollParticipant] = Field(min_length=1, max_length=MAX_BULK_ENROLLMENT)
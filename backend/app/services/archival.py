@@ -0,0 +1,48 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.services.layouts import now_iso
+from app.services.version_cache import version_cache
+from app.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def archive_grace_seconds() -> float:
+    return float(os.environ.get("ARCHIVE_GRACE_SECONDS", "3600"))
+
+
+def archive_ended_sessions(grace_seconds: float | None = None, batch_size: int = 100) -> list[str]:
+    """
+    Move sessions that have been ENDED for longer than the grace period to the
+    cold tier and mark them ARCHIVED. Returns the ids archived in this pass.
+
+    The storage engine re-checks the status when it archives, so a session
+    restarted after it was listed here is skipped, not archived while LIVE.
+    """
+    if grace_seconds is None:
+        grace_seconds = archive_grace_seconds()
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)).isoformat()
+    storage = get_storage()
+    archived: list[str] = []
+    for session_id in storage.ended_sessions(cutoff, batch_size):
+        if not storage.archive_session(session_id, now_iso()):
+            continue
+        version_cache.forget(session_id)
+        archived.append(session_id)
+    return archived
+
+
+async def run_archival(interval_seconds: float | None = None) -> None:
+    """Background loop started by the app; cancel the task to stop it."""
+    if interval_seconds is None:
+        interval_seconds = float(os.environ.get("ARCHIVE_INTERVAL_SECONDS", "300"))
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(archive_ended_sessions)
+        except Exception:
+            # Keep the loop alive; the next pass retries whatever was left ENDED.
+            logger.exception("Archival pass failed")
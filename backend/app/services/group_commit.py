@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app.core.database import get_conn, open_connection
+
+logger = logging.getLogger(__name__)
+
+WriteOp = Callable[[sqlite3.Connection], Any]
+
+
+@dataclass
+class GroupCommitStats:
+    batches: int = 0
+    writes: int = 0
+    max_batch: int = 0
+
+
+class GroupCommitWriter:
+    """
+    Single background writer that batches many callers' writes into one
+    SQLite transaction (group commit), so N concurrent writes cost one fsync.
+
+    A write is a callable taking the writer's connection. Each runs inside its
+    own SAVEPOINT: if it raises (e.g. a layout version conflict) only that
+    write is rolled back and its caller gets the exception, the rest of the
+    batch still commits. Callers only see a result after the batch COMMIT has
+    succeeded. Writes run in submission order, so read-check-insert sequences
+    such as layout version bumps are serialized without extra locking.
+
+    GROUP_COMMIT_WINDOW_MS: how long to keep collecting after the first write
+    arrives. The default of 0 takes whatever queued up while the previous
+    commit was running, which batched best in bench_group_commit.py; a longer
+    window only adds latency once every writer is already in the batch.
+    GROUP_COMMIT_ENABLED=0 runs every write inline on its
+    own connection, which is the pre-batching behaviour.
+    """
+
+    def __init__(self, path: str, window_ms: float, max_batch: int, enabled: bool):
+        self.path = path
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.enabled = enabled
+        self.stats = GroupCommitStats()
+        self._queue: queue.SimpleQueue[tuple[WriteOp, Future] | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, path: str) -> "GroupCommitWriter":
+        return cls(
+            path=path,
+            window_ms=float(os.environ.get("GROUP_COMMIT_WINDOW_MS", "0")),
+            max_batch=int(os.environ.get("GROUP_COMMIT_MAX_BATCH", "256")),
+            enabled=os.environ.get("GROUP_COMMIT_ENABLED", "1") != "0",
+        )
+
+    def configure(self, *, window_ms: float | None = None, enabled: bool | None = None) -> None:
+        if window_ms is not None:
+            self.window = window_ms / 1000
+        if enabled is not None:
+            self.enabled = enabled
+
+    def submit(self, op: WriteOp) -> Future:
+        future: Future = Future()
+        if not self.enabled:
+            try:
+                with get_conn(self.path) as conn:
+                    future.set_result(op(conn))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+        self.start()
+        self._queue.put((op, future))
+        return future
+
+    def run(self, op: WriteOp) -> Any:
+        """Submit and block until committed (for sync handlers running in the threadpool)."""
+        return self.submit(op).result()
+
+    async def run_async(self, op: WriteOp) -> Any:
+        """Submit and await the commit without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(op))
+
+    def stop(self) -> None:
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(None)
+            thread.join()
+            self._thread = None
+
+    def start(self) -> None:
+        """Start the writer thread (otherwise started by the first write)."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="group-commit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self, first: tuple[WriteOp, Future]) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _loop(self) -> None:
+        conn = open_connection(self.path, isolation_level=None, check_same_thread=False)
+        try:
+            stopping = False
+            while not stopping:
+                first = self._queue.get()
+                if first is None:
+                    break
+                batch, stopping = self._collect(first)
+                try:
+                    self._commit(conn, batch)
+                except Exception:
+                    # The writer must outlive any one batch: a dead thread
+                    # would leave every later write waiting forever.
+                    logger.exception("Group commit batch failed")
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: list[tuple[WriteOp, Future]]) -> None:
+        outcomes: list[tuple[Future, bool, Any]] = []
+        try:
+            conn.execute("begin immediate")
+            for op, future in batch:
+                # Skip writes whose caller went away (a cancelled run_async
+                # cancels its future); running them would also leave no way
+                # to report the result.
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("savepoint write_op")
+                try:
+                    result = op(conn)
+                except BaseException as exc:
+                    conn.execute("rollback to write_op")
+                    outcomes.append((future, False, exc))
+                else:
+                    outcomes.append((future, True, result))
+                conn.execute("release write_op")
+            conn.execute("commit")
+        except BaseException as exc:
+            if conn.in_transaction:
+                conn.execute("rollback")
+            for _, future in batch:
+                # Pending ones may have been cancelled meanwhile; claim them first.
+                if not future.done() and (
+                    future.running() or future.set_running_or_notify_cancel()
+                ):
+                    future.set_exception(exc)
+            return
+
+        self.stats.batches += 1
+        self.stats.writes += len(outcomes)
+        self.stats.max_batch = max(self.stats.max_batch, len(outcomes))
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
@@ -0,0 +1,36 @@
+import asyncio
+import logging
+import os
+
+from app.services.realtime_hub import hub
+from app.services.version_cache import version_cache
+
+logger = logging.getLogger(__name__)
+
+
+def idle_session_ttl() -> float:
+    return float(os.environ.get("IDLE_SESSION_TTL_SECONDS", "600"))
+
+
+def evict_idle_sessions(max_idle_seconds: float | None = None) -> int:
+    """
+    Free cached state for sessions with no open sockets that nobody has
+    polled for `max_idle_seconds`. Hub entries need no sweep: the hub drops a
+    room as soon as its last socket leaves.
+    """
+    if max_idle_seconds is None:
+        max_idle_seconds = idle_session_ttl()
+    return version_cache.evict_idle(max_idle_seconds, keep=hub.active_sessions())
+
+
+async def run_idle_eviction(interval_seconds: float | None = None) -> None:
+    """Background loop started by the app; cancel the task to stop it."""
+    if interval_seconds is None:
+        interval_seconds = float(os.environ.get("IDLE_SWEEP_INTERVAL_SECONDS", "60"))
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            evict_idle_sessions()
+        except Exception:
+            # Keep the loop alive; anything missed is swept on the next pass.
+            logger.exception("Idle eviction pass failed")
@@ -1,8 +1,10 @@
 import json
 from datetime import datetime, timezone
 
-from app.core.database import get_conn
 from app.core.errors import AppError
+from app.services.live_stats import live_stats
+from app.services.version_cache import version_cache
+from app.storage import get_storage
 
 
 def now_iso() -> str:
@@ -20,34 +22,79 @@ def default_layout() -> dict:
     }
 
 
+_DEFAULT_LAYOUT_JSON = json.dumps(default_layout(), separators=(",", ":"))
+
+
+def _remember_latest(session_id: str, latest: tuple[int, str] | None) -> tuple[int, str]:
+    if latest is None:
+        version_cache.set_layout_version(session_id, 0)
+        return 0, _DEFAULT_LAYOUT_JSON
+    version_cache.set_layout_version(session_id, latest[0])
+    return latest
+
+
+def get_latest_layout_json(session_id: str) -> tuple[int, str]:
+    """Like get_latest_layout, but returns the stored layout_json text unparsed."""
+    return _remember_latest(session_id, get_storage().latest_layout(session_id))
+
+
+async def get_latest_layout_json_async(session_id: str) -> tuple[int, str]:
+    return _remember_latest(session_id, await get_storage().latest_layout_async(session_id))
+
+
 def get_latest_layout(session_id: str) -> tuple[int, dict]:
-    with get_conn() as conn:
-        row = conn.execute(
-            """
-            select version, layout_json
-            from session_layouts
-            where session_id = ?
-            order by version desc
-            limit 1
-            """,
-            (session_id,),
-        ).fetchone()
-    if not row:
-        return 0, default_layout()
-    return int(row["version"]), json.loads(row["layout_json"])
+    version, layout_json = get_latest_layout_json(session_id)
+    return version, json.loads(layout_json)
+
+
+async def get_latest_layout_async(session_id: str) -> tuple[int, dict]:
+    version, layout_json = await get_latest_layout_json_async(session_id)
+    return version, json.loads(layout_json)
+
+
+def current_layout_version(session_id: str) -> int:
+    """Latest layout version, from the version cache when it is warm."""
+    version = version_cache.layout_version(session_id)
+    if version is None:
+        version, _ = get_latest_layout_json(session_id)
+    return version
+
+
+async def current_layout_version_async(session_id: str) -> int:
+    version = version_cache.layout_version(session_id)
+    if version is None:
+        version, _ = await get_latest_layout_json_async(session_id)
+    return version
+
+
+def _count_conflict(session_id: str, exc: AppError) -> None:
+    if exc.code == "LAYOUT_VERSION_CONFLICT":
+        live_stats.layout_conflict(session_id)
 
 
 def publish_layout(session_id: str, base_version: int, layout: dict, updated_by: str) -> int:
-    latest_version, latest_layout = get_latest_layout(session_id)
-    if base_version != latest_version:
-        raise AppError("LAYOUT_VERSION_CONFLICT", "Layout baseVersion is stale", 409)
-    new_version = latest_version + 1
-    with get_conn() as conn:
-        conn.execute(
-            """
-            insert into session_layouts (session_id, version, layout_json, updated_by, updated_at)
-            values (?, ?, ?, ?, ?)
-            """,
-            (session_id, new_version, json.dumps(layout), updated_by, now_iso()),
+    try:
+        new_version = get_storage().append_layout(
+            session_id, base_version, json.dumps(layout), updated_by, now_iso()
+        )
+    except AppError as exc:
+        _count_conflict(session_id, exc)
+        raise
+    version_cache.set_layout_version(session_id, new_version)
+    live_stats.layout_published(session_id, new_version)
+    return new_version
+
+
+async def publish_layout_async(
+    session_id: str, base_version: int, layout: dict, updated_by: str
+) -> int:
+    try:
+        new_version = await get_storage().append_layout_async(
+            session_id, base_version, json.dumps(layout), updated_by, now_iso()
         )
+    except AppError as exc:
+        _count_conflict(session_id, exc)
+        raise
+    version_cache.set_layout_version(session_id, new_version)
+    live_stats.layout_published(session_id, new_version)
     return new_version
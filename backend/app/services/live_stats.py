@@ -0,0 +1,155 @@
+import threading
+import time
+
+from app.core.responses import dumps, iso_utc
+
+# Layout update rate is reported over a sliding window of one-second buckets.
+RATE_WINDOW_SECONDS = 60
+
+
+class LiveStats:
+    """
+    Fleet-wide aggregates for the ops dashboard, maintained incrementally.
+
+    The code paths that change the facts write them through as they happen:
+    the hub on connect/disconnect, `_set_status` on start/end, and the
+    layout publish path on every version or conflict. Reading the dashboard
+    therefore never scans `sessions` or asks the hub for per-room counts.
+
+    The rendered snapshot is cached per (change generation, second), so any
+    number of dashboards polling or streaming share one encode; it is rebuilt
+    only after something changed.
+    """
+
+    def __init__(self, window_seconds: int = RATE_WINDOW_SECONDS):
+        self._lock = threading.Lock()
+        # LIVE sessions only: id -> {"title", "startedAt", "layoutVersion", "conflicts"}
+        self._live: dict[str, dict] = {}
+        # Open sockets per session, for any status (rooms of DRAFT sessions count too).
+        self._sockets: dict[str, int] = {}
+        self.sockets = 0
+        self.layout_updates = 0
+        self.layout_conflicts = 0
+        self._window = window_seconds
+        self._bucket_counts = [0] * window_seconds
+        self._bucket_seconds = [0] * window_seconds
+        self.generation = 0
+        self._snapshot: tuple[tuple[int, int], bytes] | None = None
+
+    def load(self, live_rows: list[dict]) -> None:
+        """
+        Reset the LIVE set from storage (startup); socket counts are process
+        state and kept. Layout versions start at 0 and are filled in by the
+        pre-warm pass (services/prewarm.py) via `observe_layout_version`.
+        """
+        with self._lock:
+            self._live = {
+                row["id"]: {
+                    "title": row["title"],
+                    "startedAt": iso_utc(row["updated_at"]),
+                    "layoutVersion": 0,
+                    "conflicts": 0,
+                }
+                for row in live_rows
+            }
+            self.generation += 1
+
+    def session_started(
+        self, session_id: str, title: str, started_at: str, layout_version: int
+    ) -> None:
+        with self._lock:
+            self._live[session_id] = {
+                "title": title,
+                "startedAt": iso_utc(started_at),
+                "layoutVersion": layout_version,
+                "conflicts": 0,
+            }
+            self.generation += 1
+
+    def session_stopped(self, session_id: str) -> None:
+        with self._lock:
+            if self._live.pop(session_id, None) is not None:
+                self.generation += 1
+
+    def sockets_changed(self, session_id: str, delta: int) -> None:
+        with self._lock:
+            count = self._sockets.get(session_id, 0) + delta
+            if count > 0:
+                self._sockets[session_id] = count
+            else:
+                self._sockets.pop(session_id, None)
+            self.sockets += delta
+            self.generation += 1
+
+    def _raise_layout_version(self, session_id: str, version: int) -> None:
+        # Never move backwards: a slow reader must not clobber a newer publish.
+        entry = self._live.get(session_id)
+        if entry is not None and version > entry["layoutVersion"]:
+            entry["layoutVersion"] = version
+            self.generation += 1
+
+    def observe_layout_version(self, session_id: str, version: int) -> None:
+        """Record a version read from storage (not a new publish)."""
+        with self._lock:
+            self._raise_layout_version(session_id, version)
+
+    def layout_published(self, session_id: str, version: int) -> None:
+        second = int(time.monotonic())
+        with self._lock:
+            self.layout_updates += 1
+            slot = second % self._window
+            if self._bucket_seconds[slot] != second:
+                self._bucket_seconds[slot] = second
+                self._bucket_counts[slot] = 0
+            self._bucket_counts[slot] += 1
+            self._raise_layout_version(session_id, version)
+            self.generation += 1
+
+    def layout_conflict(self, session_id: str) -> None:
+        with self._lock:
+            self.layout_conflicts += 1
+            entry = self._live.get(session_id)
+            if entry is not None:
+                entry["conflicts"] += 1
+            self.generation += 1
+
+    def _updates_per_second(self, second: int) -> float:
+        oldest = second - self._window
+        total = sum(
+            count
+            for count, at in zip(self._bucket_counts, self._bucket_seconds)
+            if oldest < at <= second
+        )
+        return round(total / self._window, 3)
+
+    def snapshot_json(self) -> bytes:
+        """The dashboard document, encoded; cached until the next change or second."""
+        second = int(time.monotonic())
+        key = (self.generation, second)
+        cached = self._snapshot
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with self._lock:
+            key = (self.generation, second)
+            sessions = [
+                {"id": session_id, "participants": self._sockets.get(session_id, 0), **entry}
+                for session_id, entry in self._live.items()
+            ]
+            body = dumps(
+                {
+                    "totals": {
+                        "liveSessions": len(self._live),
+                        "sockets": self.sockets,
+                        "layoutUpdates": self.layout_updates,
+                        "layoutConflicts": self.layout_conflicts,
+                        "layoutUpdatesPerSecond": self._updates_per_second(second),
+                        "rateWindowSeconds": self._window,
+                    },
+                    "sessions": sessions,
+                }
+            )
+            self._snapshot = (key, body)
+        return body
+
+
+live_stats = LiveStats()
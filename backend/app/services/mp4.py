@@ -0,0 +1,134 @@
+"""
+Minimal ISO-BMFF (MP4/MOV) reader for catalog metadata.
+
+Only the `moov` box is read: top-level boxes are walked by seeking over
+their headers, so a multi-GB `mdat` costs one seek, not a read.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+# Bound on the moov box we are willing to load (sample tables of long
+# recordings can reach a few MiB).
+MAX_MOOV_BYTES = 64 * 1024 * 1024
+
+
+@dataclass(slots=True, frozen=True)
+class Mp4Metadata:
+    duration_seconds: float | None
+    codec: str | None
+    width: int | None
+    height: int | None
+
+
+def _read_header(f: BinaryIO) -> tuple[bytes, int, int] | None:
+    """(type, header_size, box_size) at the current offset; box_size -1 means "to EOF"."""
+    header = f.read(8)
+    if len(header) < 8:
+        return None
+    size, box_type = struct.unpack(">I4s", header)
+    if size == 1:
+        large = f.read(8)
+        if len(large) < 8:
+            return None
+        return box_type, 16, struct.unpack(">Q", large)[0]
+    return box_type, 8, (-1 if size == 0 else size)
+
+
+def _children(data: bytes, start: int = 0, end: int | None = None):
+    """Yield (type, payload_start, payload_end) for boxes inside `data[start:end]`."""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                return
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def _find(data: bytes, start: int, end: int, box_type: bytes) -> tuple[int, int] | None:
+    for child_type, child_start, child_end in _children(data, start, end):
+        if child_type == box_type:
+            return child_start, child_end
+    return None
+
+
+def _duration(data: bytes, start: int) -> float | None:
+    version = data[start]
+    if version == 1:
+        timescale, duration = struct.unpack_from(">IQ", data, start + 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, start + 12)
+    if not timescale:
+        return None
+    return duration / timescale
+
+
+def _video_track(data: bytes, trak: tuple[int, int]) -> tuple[str, int, int] | None:
+    """(codec fourcc, width, height) if `trak` is a video track."""
+    mdia = _find(data, *trak, b"mdia")
+    if mdia is None:
+        return None
+    hdlr = _find(data, *mdia, b"hdlr")
+    if hdlr is None or data[hdlr[0] + 8 : hdlr[0] + 12] != b"vide":
+        return None
+    stbl = None
+    minf = _find(data, *mdia, b"minf")
+    if minf is not None:
+        stbl = _find(data, *minf, b"stbl")
+    stsd = _find(data, *stbl, b"stsd") if stbl is not None else None
+    if stsd is None:
+        return None
+    # stsd: version/flags(4) entry_count(4), then the first sample entry.
+    entry = stsd[0] + 8
+    if entry + 36 > stsd[1]:
+        return None
+    codec = data[entry + 4 : entry + 8].decode("latin-1")
+    width, height = struct.unpack_from(">HH", data, entry + 32)
+    return codec, width, height
+
+
+def read_mp4_metadata(f: BinaryIO) -> Mp4Metadata | None:
+    """Parse duration and the first video track's codec/size; None if there is no moov."""
+    f.seek(0, 2)
+    file_size = f.tell()
+    offset = 0
+    while offset < file_size:
+        f.seek(offset)
+        header = _read_header(f)
+        if header is None:
+            return None
+        box_type, header_size, box_size = header
+        if box_size == -1:
+            box_size = file_size - offset
+        if box_size < header_size:
+            return None
+        if box_type == b"moov":
+            if box_size > MAX_MOOV_BYTES:
+                return None
+            data = f.read(box_size - header_size)
+            return _parse_moov(data)
+        offset += box_size
+    return None
+
+
+def _parse_moov(data: bytes) -> Mp4Metadata:
+    duration = None
+    video = None
+    for box_type, start, end in _children(data):
+        if box_type == b"mvhd" and end - start >= 32:
+            duration = _duration(data, start)
+        elif box_type == b"trak" and video is None:
+            video = _video_track(data, (start, end))
+    codec, width, height = video or (None, None, None)
+    return Mp4Metadata(duration, codec, width, height)
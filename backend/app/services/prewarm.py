@@ -0,0 +1,29 @@
+import asyncio
+import logging
+
+from app.services.layouts import get_latest_layout_json
+from app.services.live_stats import live_stats
+from app.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def prewarm(live_rows: list[dict]) -> None:
+    """
+    Pay the first-request costs up front: open the storage engine's
+    connections and load the latest layout version of every LIVE session
+    into the version cache and the ops aggregates.
+    """
+    get_storage().warm()
+    for row in live_rows:
+        version, _ = get_latest_layout_json(row["id"])
+        live_stats.observe_layout_version(row["id"], version)
+
+
+async def run_prewarm(live_rows: list[dict]) -> None:
+    """Started by the app after startup; the app serves requests while this runs."""
+    try:
+        await asyncio.to_thread(prewarm, live_rows)
+    except Exception:
+        # Only a cache warm-up: requests still fill these in on demand.
+        logger.exception("Pre-warm failed")
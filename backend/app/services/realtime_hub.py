@@ -4,26 +4,30 @@ import hashlib
 import hmac
 import json
 import os
+import sys
 import time
-from collections import defaultdict
 from dataclasses import dataclass
 
 from fastapi import WebSocket
 
 from app.core.errors import AppError
+from app.services.live_stats import live_stats
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RealtimeClaims:
+    # Held for the lifetime of every socket, so kept to the three fields the
+    # handler reads (expiry is checked once, in verify_token). session_id and
+    # role are interned so every socket in a room shares one copy; user ids are
+    # mostly unique per socket, where interning would only grow the intern table.
     session_id: str
     user_id: str
     role: str
-    exp: int
 
 
 class RealtimeHub:
     def __init__(self):
-        self._connections: dict[str, set[WebSocket]] = defaultdict(set)
+        self._connections: dict[str, set[WebSocket]] = {}
         self._lock = asyncio.Lock()
         self._secret = os.environ.get("WS_JWT_SECRET", "dev-ws-secret")
         self._token_ttl_seconds = int(os.environ.get("WS_TOKEN_TTL_SECONDS", "900"))
@@ -51,10 +55,9 @@ class RealtimeHub:
             if exp < int(time.time()):
                 raise AppError("EXPIRED_WS_TOKEN", "WebSocket token expired", 401)
             return RealtimeClaims(
-                session_id=claims_raw["sessionId"],
+                session_id=sys.intern(claims_raw["sessionId"]),
                 user_id=claims_raw["userId"],
-                role=claims_raw["role"],
-                exp=exp,
+                role=sys.intern(claims_raw["role"]),
             )
         except AppError:
             raise
@@ -63,18 +66,29 @@ class RealtimeHub:
 
     async def connect(self, session_id: str, websocket: WebSocket) -> None:
         async with self._lock:
-            self._connections[session_id].add(websocket)
+            sockets = self._connections.get(session_id)
+            if sockets is None:
+                sockets = self._connections[sys.intern(session_id)] = set()
+            if websocket not in sockets:
+                sockets.add(websocket)
+                live_stats.sockets_changed(session_id, 1)
+
+    def _discard(self, session_id: str, websocket: WebSocket) -> None:
+        # Empty rooms are dropped immediately so the hub only holds live sessions.
+        sockets = self._connections.get(session_id)
+        if sockets is not None and websocket in sockets:
+            sockets.remove(websocket)
+            live_stats.sockets_changed(session_id, -1)
+            if not sockets:
+                del self._connections[session_id]
 
     async def disconnect(self, session_id: str, websocket: WebSocket) -> None:
         async with self._lock:
-            if session_id in self._connections:
-                self._connections[session_id].discard(websocket)
-                if not self._connections[session_id]:
-                    self._connections.pop(session_id, None)
+            self._discard(session_id, websocket)
 
     async def broadcast(self, session_id: str, payload: dict) -> None:
         async with self._lock:
-            sockets = list(self._connections.get(session_id, set()))
+            sockets = list(self._connections.get(session_id, ()))
         if not sockets:
             return
         dead: list[WebSocket] = []
@@ -86,11 +100,28 @@ class RealtimeHub:
         if dead:
             async with self._lock:
                 for ws in dead:
-                    self._connections.get(session_id, set()).discard(ws)
+                    self._discard(session_id, ws)
+
+    async def close_session(self, session_id: str, payload: dict, code: int) -> int:
+        """Send `payload` to every socket in the room, close them and drop the room."""
+        async with self._lock:
+            sockets = self._connections.pop(session_id, set())
+            if sockets:
+                live_stats.sockets_changed(session_id, -len(sockets))
+        for ws in sockets:
+            try:
+                await ws.send_json(payload)
+                await ws.close(code=code)
+            except Exception:
+                pass
+        return len(sockets)
 
     async def count(self, session_id: str) -> int:
         async with self._lock:
-            return len(self._connections.get(session_id, set()))
+            return len(self._connections.get(session_id, ()))
+
+    def active_sessions(self) -> set[str]:
+        return set(self._connections)
 
 
 hub = RealtimeHub()
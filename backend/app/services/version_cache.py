@@ -0,0 +1,114 @@
+import sys
+import threading
+import time
+from collections.abc import Collection
+
+
+class VersionCache:
+    """
+    In-process cache of the cheap "freshness" facts used for conditional GETs.
+
+    Holds the latest layout version and the session `updated_at` stamp per
+    session, plus positive membership lookups. Entries are written through by
+    the code paths that change them (publish_layout, _set_status, joins), so a
+    poll whose If-None-Match still matches can be answered without a query.
+
+    Membership is only ever cached positively: there is no "leave" path that
+    deletes a participant row, so a cached hit can never go stale.
+
+    Everything is keyed by session, and each session remembers when it was
+    last used, so `evict_idle` can drop rooms nobody is polling or connected
+    to; a later request simply repopulates them from storage.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._layout_versions: dict[str, int] = {}
+        self._session_stamps: dict[str, str] = {}
+        self._members: dict[str, set[str]] = {}
+        self._last_used: dict[str, float] = {}
+
+    def _touch(self, session_id: str) -> None:
+        # Readers call this without the lock held. Only refresh a session that
+        # is still cached, so a read racing an eviction cannot resurrect it.
+        with self._lock:
+            if session_id in self._last_used:
+                self._last_used[session_id] = time.monotonic()
+
+    def _touch_locked(self, session_id: str) -> None:
+        self._last_used[session_id] = time.monotonic()
+
+    def layout_version(self, session_id: str) -> int | None:
+        version = self._layout_versions.get(session_id)
+        if version is not None:
+            self._touch(session_id)
+        return version
+
+    def set_layout_version(self, session_id: str, version: int) -> None:
+        with self._lock:
+            # Never move backwards: a slow reader must not clobber a newer publish.
+            if version >= self._layout_versions.get(session_id, -1):
+                self._layout_versions[session_id] = version
+            self._touch_locked(session_id)
+
+    def session_stamp(self, session_id: str) -> str | None:
+        stamp = self._session_stamps.get(session_id)
+        if stamp is not None:
+            self._touch(session_id)
+        return stamp
+
+    def set_session_stamp(self, session_id: str, updated_at: str) -> None:
+        with self._lock:
+            self._session_stamps[session_id] = updated_at
+            self._touch_locked(session_id)
+
+    def is_member(self, session_id: str, user_id: str) -> bool:
+        members = self._members.get(session_id)
+        if members is None or user_id not in members:
+            return False
+        self._touch(session_id)
+        return True
+
+    def remember_member(self, session_id: str, user_id: str) -> None:
+        with self._lock:
+            members = self._members.get(session_id)
+            if members is None:
+                members = self._members[sys.intern(session_id)] = set()
+            members.add(user_id)
+            self._touch_locked(session_id)
+
+    def evict_idle(self, max_idle_seconds: float, keep: Collection[str] = ()) -> int:
+        """Drop sessions unused for `max_idle_seconds`, except those in `keep`."""
+        cutoff = time.monotonic() - max_idle_seconds
+        with self._lock:
+            stale = [
+                session_id
+                for session_id, last_used in self._last_used.items()
+                if last_used < cutoff and session_id not in keep
+            ]
+            for session_id in stale:
+                self._drop(session_id)
+        return len(stale)
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._drop(session_id)
+
+    def _drop(self, session_id: str) -> None:
+        self._layout_versions.pop(session_id, None)
+        self._session_stamps.pop(session_id, None)
+        self._members.pop(session_id, None)
+        self._last_used.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._last_used)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layout_versions.clear()
+            self._session_stamps.clear()
+            self._members.clear()
+            self._last_used.clear()
+
+
+version_cache = VersionCache()
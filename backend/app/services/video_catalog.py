@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import mimetypes
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+VIDEOS_DIR = os.environ.get(
+    "VIDEOS_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../videos")),
+)
+VIDEO_EXTENSIONS = {".mp4", ".m4v", ".mov", ".webm", ".mkv"}
+_BMFF_EXTENSIONS = {".mp4", ".m4v", ".mov"}
+
+
+@dataclass(slots=True, frozen=True)
+class VideoEntry:
+    name: str  # path relative to the catalog root, "/"-separated
+    path: str
+    size: int
+    mtime_ns: int
+    etag: str
+    content_type: str
+    duration_seconds: float | None
+    codec: str | None
+    width: int | None
+    height: int | None
+
+
+def video_etag(size: int, mtime_ns: int) -> str:
+    return f'"video-{size:x}-{mtime_ns:x}"'
+
+
+def _index_file(name: str, path: str, stat: os.stat_result) -> VideoEntry:
+    metadata = None
+    if os.path.splitext(name)[1].lower() in _BMFF_EXTENSIONS:
+        # Imported on the first scan that finds an MP4, not at app import.
+        from app.services.mp4 import read_mp4_metadata
+
+        try:
+            with open(path, "rb") as f:
+                metadata = read_mp4_metadata(f)
+        except (OSError, struct.error, IndexError):
+            metadata = None
+    return VideoEntry(
+        name=name,
+        path=path,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        etag=video_etag(stat.st_size, stat.st_mtime_ns),
+        content_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        duration_seconds=metadata.duration_seconds if metadata else None,
+        codec=metadata.codec if metadata else None,
+        width=metadata.width if metadata else None,
+        height=metadata.height if metadata else None,
+    )
+
+
+class HotFileCache:
+    """
+    Bounded LRU of memory-mapped video files.
+
+    A file is mapped on its `admit_after`-th request (one-off fetches never
+    displace popular clips) if it fits `max_file_bytes`; least recently used
+    maps are dropped to stay within `max_bytes`. Readers slice the map, so a
+    room full of observers on one recording share one set of page-cache
+    pages and no per-request open/seek/read. Evicted maps are closed by GC
+    once in-flight responses drop their reference.
+    """
+
+    def __init__(self, max_bytes: int, max_file_bytes: int, admit_after: int = 2):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.admit_after = admit_after
+        self._lock = threading.Lock()
+        self._maps: OrderedDict[str, tuple[str, mmap.mmap]] = OrderedDict()
+        self._requests: dict[str, int] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "HotFileCache":
+        return cls(
+            max_bytes=int(os.environ.get("VIDEO_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+            max_file_bytes=int(os.environ.get("VIDEO_CACHE_MAX_FILE_BYTES", str(64 * 1024 * 1024))),
+            admit_after=int(os.environ.get("VIDEO_CACHE_ADMIT_AFTER", "2")),
+        )
+
+    def get(self, entry: VideoEntry) -> mmap.mmap | None:
+        with self._lock:
+            cached = self._maps.get(entry.name)
+            if cached is not None and cached[0] == entry.etag:
+                self._maps.move_to_end(entry.name)
+                self.hits += 1
+                return cached[1]
+            if cached is not None:
+                self._drop(entry.name)
+            self.misses += 1
+            seen = self._requests.get(entry.name, 0) + 1
+            self._requests[entry.name] = seen
+            if seen < self.admit_after or not 0 < entry.size <= self.max_file_bytes:
+                return None
+            if entry.size > self.max_bytes:
+                return None
+            try:
+                with open(entry.path, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return None
+            if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+                mapped.madvise(mmap.MADV_WILLNEED)
+            self._maps[entry.name] = (entry.etag, mapped)
+            self.bytes += len(mapped)
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._maps)))
+            return mapped
+
+    def discard(self, name: str) -> None:
+        with self._lock:
+            self._requests.pop(name, None)
+            if name in self._maps:
+                self._drop(name)
+
+    def _drop(self, name: str) -> None:
+        _, mapped = self._maps.pop(name)
+        self.bytes -= len(mapped)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._maps
+
+    def clear(self) -> None:
+        with self._lock:
+            self._maps.clear()
+            self._requests.clear()
+            self.bytes = 0
+
+
+class VideoCatalog:
+    """
+    Index of the videos directory: size, mtime, ETag and MP4 metadata.
+
+    `scan()` is incremental: files whose size and mtime are unchanged keep
+    their entry, so only new or modified files are opened and parsed.
+    Lookups of a name that is not indexed yet (a file dropped in between
+    scans) index that single file on demand.
+    """
+
+    def __init__(self, root: str, cache: HotFileCache | None = None):
+        self.root = os.path.abspath(root)
+        self.cache = cache or HotFileCache.from_env()
+        self._lock = threading.Lock()
+        self._entries: dict[str, VideoEntry] = {}
+        # Bumped on every index change; seeded from the clock so listing ETags
+        # from a previous process never match.
+        self.generation = time.time_ns()
+
+    def set_root(self, root: str) -> None:
+        with self._lock:
+            self.root = os.path.abspath(root)
+            self._entries = {}
+            self.generation += 1
+        self.cache.clear()
+
+    def scan(self) -> dict[str, int]:
+        """Re-sync the index with the directory; returns added/updated/removed counts."""
+        root = self.root
+        found: dict[str, tuple[str, os.stat_result]] = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() not in VIDEO_EXTENSIONS:
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                found[name] = (path, stat)
+
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        current = self._entries
+        entries: dict[str, VideoEntry] = {}
+        for name, (path, stat) in found.items():
+            old = current.get(name)
+            if old is not None and old.size == stat.st_size and old.mtime_ns == stat.st_mtime_ns:
+                entries[name] = old
+                continue
+            entries[name] = _index_file(name, path, stat)
+            counts["updated" if old is not None else "added"] += 1
+            if old is not None:
+                self.cache.discard(name)
+        for name in current.keys() - entries.keys():
+            self.cache.discard(name)
+            counts["removed"] += 1
+
+        with self._lock:
+            if self.root != root:
+                return counts  # set_root() ran while we were scanning
+            self._entries = entries
+            if any(counts.values()):
+                self.generation += 1
+        return counts
+
+    def list(self) -> list[VideoEntry]:
+        return sorted(self._entries.values(), key=lambda entry: entry.name)
+
+    def get(self, name: str) -> VideoEntry | None:
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+        return self._index_one(name)
+
+    def get_current(self, name: str) -> VideoEntry | None:
+        """
+        get(), checked against the file itself: an entry whose size or mtime
+        changed since it was indexed is re-indexed (and unmapped), and one
+        whose file is gone is dropped. Costs one stat.
+        """
+        entry = self.get(name)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            stat = None
+        if stat is not None and (stat.st_size, stat.st_mtime_ns) == (entry.size, entry.mtime_ns):
+            return entry
+        self.cache.discard(name)
+        with self._lock:
+            if self._entries.get(name) is entry:
+                self._entries = {k: v for k, v in self._entries.items() if k != name}
+                self.generation += 1
+        return self._index_one(name)
+
+    def _index_one(self, name: str) -> VideoEntry | None:
+        if os.path.splitext(name)[1].lower() not in VIDEO_EXTENSIONS:
+            return None
+        path = os.path.abspath(os.path.join(self.root, name))
+        if os.path.commonpath([path, self.root]) != self.root:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        entry = _index_file(name, path, stat)
+        with self._lock:
+            self._entries = {**self._entries, name: entry}
+            self.generation += 1
+        return entry
+
+
+video_catalog = VideoCatalog(VIDEOS_DIR)
+
+
+async def run_rescans(interval_seconds: float | None = None) -> None:
+    """Background loop started by the app: scan once, then every interval."""
+    if interval_seconds is None:
+        interval_seconds = float(os.environ.get("VIDEO_RESCAN_INTERVAL_SECONDS", "30"))
+    while True:
+        try:
+            await asyncio.to_thread(video_catalog.scan)
+        except Exception:
+            logger.exception("Video catalog scan failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,57 @@
+import importlib
+import os
+
+from app.core.database import DB_PATH
+from app.storage.base import StorageEngine
+
+__all__ = [
+    "StorageEngine",
+    "MemoryStorage",
+    "SQLiteStorage",
+    "ShardedSQLiteStorage",
+    "create_storage",
+    "get_storage",
+]
+
+# Engines are imported on first use, so a process only loads the one it runs.
+_ENGINE_MODULES = {
+    "MemoryStorage": "app.storage.memory",
+    "SQLiteStorage": "app.storage.sqlite",
+    "ShardedSQLiteStorage": "app.storage.sharded",
+}
+
+_storage: StorageEngine | None = None
+
+
+def __getattr__(name: str):
+    module = _ENGINE_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def create_storage(kind: str | None = None) -> StorageEngine:
+    """Build the engine named by `kind` or LIVESURGERY_STORAGE (sqlite | sharded | memory)."""
+    kind = (kind or os.environ.get("LIVESURGERY_STORAGE", "sqlite")).strip().lower()
+    if kind == "sqlite":
+        from app.storage.sqlite import SQLiteStorage
+
+        return SQLiteStorage(DB_PATH)
+    if kind == "sharded":
+        from app.storage.sharded import ShardedSQLiteStorage
+
+        return ShardedSQLiteStorage(DB_PATH, int(os.environ.get("LIVESURGERY_SHARDS", "4")))
+    if kind == "memory":
+        from app.storage.memory import MemoryStorage
+
+        return MemoryStorage()
+    raise RuntimeError(
+        f"Unknown LIVESURGERY_STORAGE engine '{kind}' (expected sqlite, sharded or memory)"
+    )
+
+
+def get_storage() -> StorageEngine:
+    global _storage
+    if _storage is None:
+        _storage = create_storage()
+    return _storage
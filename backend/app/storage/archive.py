@@ -0,0 +1,67 @@
+"""
+Cold-tier encoding shared by the storage engines.
+
+Archived layouts are stored in chunks of ARCHIVE_CHUNK_ROWS versions, each a
+zlib-compressed NDJSON blob of `[version, layout_json, updated_by, updated_at]`
+rows, tagged with its version and time range so history reads only inflate
+the chunks they need. An archived roster is one blob of
+`[user_id, role, joined_at, left_at]` rows.
+"""
+
+import json
+import zlib
+from collections.abc import Iterable
+
+from app.core.errors import AppError
+
+ARCHIVE_CHUNK_ROWS = 500
+
+
+def session_archived() -> AppError:
+    return AppError("SESSION_ARCHIVED", "Session is archived and read-only", 409)
+
+
+def pack_rows(rows: Iterable[Iterable]) -> bytes:
+    text = "\n".join(json.dumps(list(row), separators=(",", ":")) for row in rows)
+    return zlib.compress(text.encode("utf-8"))
+
+
+def unpack_rows(blob: bytes) -> list[list]:
+    text = zlib.decompress(blob).decode("utf-8")
+    return [json.loads(line) for line in text.split("\n") if line]
+
+
+def layout_chunk(rows: list) -> tuple[int, int, str, str, bytes]:
+    """(first_version, last_version, first_at, last_at, blob) for ascending layout rows."""
+    return rows[0][0], rows[-1][0], rows[0][3], rows[-1][3], pack_rows(rows)
+
+
+def layout_row(row: list) -> dict:
+    version, layout_json, updated_by, updated_at = row
+    return {
+        "version": version,
+        "layout_json": layout_json,
+        "updated_by": updated_by,
+        "updated_at": updated_at,
+    }
+
+
+def filter_layout_rows(
+    rows: list[list],
+    after_version: int,
+    to_version: int | None,
+    since: str | None,
+    until: str | None,
+) -> Iterable[dict]:
+    """Apply the layout_history_page filters to one unpacked chunk."""
+    for row in rows:
+        version, _, _, updated_at = row
+        if version <= after_version:
+            continue
+        if to_version is not None and version > to_version:
+            return
+        if since is not None and updated_at < since:
+            continue
+        if until is not None and updated_at >= until:
+            continue
+        yield layout_row(row)
@@ -0,0 +1,238 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from app.core.errors import AppError
+from app.core.executors import executors
+
+
+def layout_conflict() -> AppError:
+    return AppError("LAYOUT_VERSION_CONFLICT", "Layout baseVersion is stale", 409)
+
+
+class StorageEngine(ABC):
+    """
+    Persistence interface for users, sessions, participants and layouts.
+
+    Session rows are plain dicts with the `sessions` column names (id, title,
+    visibility, status, created_by, created_at, updated_at). Timestamps are
+    ISO-8601 strings supplied by the caller. Layouts are stored and returned
+    as JSON text so read paths can pass them through without re-encoding.
+
+    Ended sessions can be moved to a compressed cold tier (archive_session).
+    Membership checks, listings and layout reads are served from it
+    transparently; appending a layout to an archived session raises
+    SESSION_ARCHIVED.
+    """
+
+    name: str
+
+    def init(self) -> None:
+        """Create schema / open resources. Called once at startup."""
+
+    def close(self) -> None:
+        """Flush pending writes and release resources. Called at shutdown."""
+
+    def warm(self) -> None:
+        """Open whatever the first requests would otherwise pay for. Called off the startup path."""
+        self.ping()
+
+    @abstractmethod
+    def ping(self) -> None:
+        """Raise if the engine cannot serve requests."""
+
+    # ─── Users ───────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def upsert_user(self, user_id: str, role: str, now: str) -> None: ...
+
+    @abstractmethod
+    def get_user(self, user_id: str) -> dict | None: ...
+
+    # ─── Sessions ────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def create_session(
+        self,
+        session_id: str,
+        title: str,
+        visibility: str,
+        created_by: str,
+        owner_role: str,
+        now: str,
+    ) -> dict:
+        """Insert a DRAFT session and enroll its creator as a participant."""
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> dict | None: ...
+
+    @abstractmethod
+    def list_sessions_for_user(self, user_id: str, limit: int, offset: int) -> list[dict]:
+        """Sessions the user participates in, most recently updated first."""
+
+    @abstractmethod
+    def set_session_status(self, session_id: str, status: str, now: str) -> None: ...
+
+    @abstractmethod
+    def ended_sessions(self, ended_before: str, limit: int) -> list[str]:
+        """Ids of ENDED sessions last updated before `ended_before`, oldest first."""
+
+    @abstractmethod
+    def live_sessions(self) -> list[dict]:
+        """All LIVE sessions (`id`, `title`, `updated_at`), oldest first."""
+
+    # ─── Participants ────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def is_participant(self, session_id: str, user_id: str) -> bool: ...
+
+    @abstractmethod
+    def upsert_participant(self, session_id: str, user_id: str, role: str, now: str) -> None:
+        """Join (or re-join) a session; clears left_at."""
+
+    @abstractmethod
+    def enroll_participants(self, session_id: str, roster: dict[str, str], now: str) -> None:
+        """
+        Bulk join `roster` (user_id -> role) atomically. Missing users are
+        created; existing user rows are left untouched.
+        """
+
+    @abstractmethod
+    def set_participant_role(self, session_id: str, user_id: str, role: str) -> bool:
+        """Returns False if the user is not a participant of the session."""
+
+    # ─── Layouts ─────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def latest_layout(self, session_id: str) -> tuple[int, str] | None:
+        """(version, layout_json) of the newest layout, or None if never published."""
+
+    @abstractmethod
+    def append_layout(
+        self,
+        session_id: str,
+        base_version: int,
+        layout_json: str,
+        updated_by: str,
+        now: str,
+    ) -> int:
+        """
+        Store a new layout version if `base_version` is still the latest.
+        Returns the new version; raises LAYOUT_VERSION_CONFLICT otherwise.
+        """
+
+    @abstractmethod
+    def layout_history_page(
+        self,
+        session_id: str,
+        after_version: int,
+        to_version: int | None,
+        since: str | None,
+        until: str | None,
+        limit: int,
+    ) -> list[dict]:
+        """
+        Up to `limit` layout rows (version, layout_json, updated_by, updated_at)
+        with version > `after_version`, oldest first. `to_version` is inclusive;
+        `since`/`until` bound updated_at as a half-open [since, until) window.
+        """
+
+    def iter_layout_history(
+        self,
+        session_id: str,
+        from_version: int = 1,
+        to_version: int | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        chunk_size: int = 500,
+    ) -> Iterator[list[dict]]:
+        """
+        Walk a session's layout history in pages of `chunk_size` rows.
+
+        Keyset pagination on version: each page is a fresh indexed range query
+        that resumes after the last version seen, so memory stays at one page
+        and no read transaction is held open while the caller streams.
+        """
+        after_version = from_version - 1
+        while True:
+            page = self.layout_history_page(
+                session_id, after_version, to_version, since, until, chunk_size
+            )
+            if page:
+                yield page
+            if len(page) < chunk_size:
+                return
+            after_version = page[-1]["version"]
+
+    # ─── Archive ─────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def archive_session(self, session_id: str, now: str) -> bool:
+        """
+        Move the session's participants and layouts to the cold tier and mark
+        it ARCHIVED, in one transaction that first checks it is still ENDED.
+        Returns False, moving nothing, if it is not (restarted or already
+        archived).
+        """
+
+    # ─── Awaitable API ───────────────────────────────────────────────────────
+    # Called by async handlers. By default the sync method runs on the `read`
+    # or `write` executor (app/core/executors.py); engines with nothing to
+    # block on override _offload to call it inline.
+
+    async def _offload(self, pool: str, fn: Callable[..., Any], /, *args: Any) -> Any:
+        return await executors.run(pool, fn, *args)
+
+    async def get_session_async(self, session_id: str) -> dict | None:
+        return await self._offload("read", self.get_session, session_id)
+
+    async def list_sessions_for_user_async(
+        self, user_id: str, limit: int, offset: int
+    ) -> list[dict]:
+        return await self._offload("read", self.list_sessions_for_user, user_id, limit, offset)
+
+    async def is_participant_async(self, session_id: str, user_id: str) -> bool:
+        return await self._offload("read", self.is_participant, session_id, user_id)
+
+    async def latest_layout_async(self, session_id: str) -> tuple[int, str] | None:
+        return await self._offload("read", self.latest_layout, session_id)
+
+    async def create_session_async(
+        self,
+        session_id: str,
+        title: str,
+        visibility: str,
+        created_by: str,
+        owner_role: str,
+        now: str,
+    ) -> dict:
+        return await self._offload(
+            "write",
+            self.create_session,
+            session_id,
+            title,
+            visibility,
+            created_by,
+            owner_role,
+            now,
+        )
+
+    async def set_session_status_async(self, session_id: str, status: str, now: str) -> None:
+        await self._offload("write", self.set_session_status, session_id, status, now)
+
+    async def append_layout_async(
+        self,
+        session_id: str,
+        base_version: int,
+        layout_json: str,
+        updated_by: str,
+        now: str,
+    ) -> int:
+        return await self._offload(
+            "write", self.append_layout, session_id, base_version, layout_json, updated_by, now
+        )
+
+    async def upsert_participant_async(
+        self, session_id: str, user_id: str, role: str, now: str
+    ) -> None:
+        await self._offload("write", self.upsert_participant, session_id, user_id, role, now)
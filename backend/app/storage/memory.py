@@ -0,0 +1,291 @@
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from app.storage.archive import (
+    ARCHIVE_CHUNK_ROWS,
+    filter_layout_rows,
+    layout_chunk,
+    layout_row,
+    pack_rows,
+    session_archived,
+    unpack_rows,
+)
+from app.storage.base import StorageEngine, layout_conflict
+
+
+class MemoryStorage(StorageEngine):
+    """
+    Thread-safe in-process engine with no disk I/O.
+
+    Intended for load tests, profiling and demos (LIVESURGERY_STORAGE=memory):
+    everything is lost on restart. A single lock guards all state, which keeps
+    it trivially consistent and is cheap next to request handling.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users: dict[str, dict] = {}
+        self._sessions: dict[str, dict] = {}
+        # session_id -> user_id -> participant row
+        self._participants: dict[str, dict[str, dict]] = {}
+        self._user_sessions: dict[str, set[str]] = {}
+        # session_id -> [layout rows], ascending version
+        self._layouts: dict[str, list[dict]] = {}
+        # session_id -> {"archived_at", "participants_blob", "layout_chunks"}.
+        # _user_sessions keeps archived memberships, like archived_memberships.
+        self._archives: dict[str, dict] = {}
+
+    def ping(self) -> None:
+        return None
+
+    async def _offload(self, pool: str, fn: Callable[..., Any], /, *args: Any) -> Any:
+        # Dict operations under one lock: cheaper than a thread hop.
+        return fn(*args)
+
+    # ─── Users ───────────────────────────────────────────────────────────────
+
+    def upsert_user(self, user_id: str, role: str, now: str) -> None:
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                self._users[user_id] = {
+                    "id": user_id,
+                    "email": None,
+                    "display_name": user_id,
+                    "role": role,
+                    "created_at": now,
+                }
+            else:
+                user["role"] = role
+                user["display_name"] = user_id
+
+    def get_user(self, user_id: str) -> dict | None:
+        with self._lock:
+            user = self._users.get(user_id)
+            return dict(user) if user else None
+
+    # ─── Sessions ────────────────────────────────────────────────────────────
+
+    def create_session(
+        self,
+        session_id: str,
+        title: str,
+        visibility: str,
+        created_by: str,
+        owner_role: str,
+        now: str,
+    ) -> dict:
+        row = {
+            "id": session_id,
+            "title": title,
+            "visibility": visibility,
+            "status": "DRAFT",
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now,
+        }
+        with self._lock:
+            self._sessions[session_id] = row
+            self._join_locked(session_id, created_by, owner_role, now)
+        return dict(row)
+
+    def get_session(self, session_id: str) -> dict | None:
+        with self._lock:
+            row = self._sessions.get(session_id)
+            return dict(row) if row else None
+
+    def list_sessions_for_user(self, user_id: str, limit: int, offset: int) -> list[dict]:
+        with self._lock:
+            rows = [self._sessions[sid] for sid in self._user_sessions.get(user_id, ())]
+            rows.sort(key=lambda r: r["updated_at"], reverse=True)
+            return [dict(r) for r in rows[offset : offset + limit]]
+
+    def set_session_status(self, session_id: str, status: str, now: str) -> None:
+        with self._lock:
+            row = self._sessions.get(session_id)
+            # ARCHIVED is terminal, as in the SQLite engine.
+            if row is not None and row["status"] != "ARCHIVED":
+                row["status"] = status
+                row["updated_at"] = now
+
+    def ended_sessions(self, ended_before: str, limit: int) -> list[str]:
+        with self._lock:
+            rows = [
+                r
+                for r in self._sessions.values()
+                if r["status"] == "ENDED" and r["updated_at"] < ended_before
+            ]
+        rows.sort(key=lambda r: r["updated_at"])
+        return [r["id"] for r in rows[:limit]]
+
+    def live_sessions(self) -> list[dict]:
+        with self._lock:
+            rows = [
+                {"id": r["id"], "title": r["title"], "updated_at": r["updated_at"]}
+                for r in self._sessions.values()
+                if r["status"] == "LIVE"
+            ]
+        rows.sort(key=lambda r: r["updated_at"])
+        return rows
+
+    # ─── Participants ────────────────────────────────────────────────────────
+
+    def _join_locked(self, session_id: str, user_id: str, role: str, now: str) -> None:
+        self._participants.setdefault(session_id, {})[user_id] = {
+            "role": role,
+            "joined_at": now,
+            "left_at": None,
+        }
+        self._user_sessions.setdefault(user_id, set()).add(session_id)
+
+    def is_participant(self, session_id: str, user_id: str) -> bool:
+        with self._lock:
+            if user_id in self._participants.get(session_id, {}):
+                return True
+            return session_id in self._archives and session_id in self._user_sessions.get(
+                user_id, ()
+            )
+
+    def upsert_participant(self, session_id: str, user_id: str, role: str, now: str) -> None:
+        with self._lock:
+            self._join_locked(session_id, user_id, role, now)
+
+    def enroll_participants(self, session_id: str, roster: dict[str, str], now: str) -> None:
+        with self._lock:
+            for user_id, role in roster.items():
+                self._users.setdefault(
+                    user_id,
+                    {
+                        "id": user_id,
+                        "email": None,
+                        "display_name": user_id,
+                        "role": role,
+                        "created_at": now,
+                    },
+                )
+                self._join_locked(session_id, user_id, role, now)
+
+    def set_participant_role(self, session_id: str, user_id: str, role: str) -> bool:
+        with self._lock:
+            participant = self._participants.get(session_id, {}).get(user_id)
+            if participant is None:
+                return False
+            participant["role"] = role
+            return True
+
+    # ─── Layouts ─────────────────────────────────────────────────────────────
+
+    def latest_layout(self, session_id: str) -> tuple[int, str] | None:
+        with self._lock:
+            history = self._layouts.get(session_id)
+            if history:
+                latest = history[-1]
+            else:
+                chunks = self._archives.get(session_id, {}).get("layout_chunks")
+                if not chunks:
+                    return None
+                latest = layout_row(unpack_rows(chunks[-1][4])[-1])
+            return latest["version"], latest["layout_json"]
+
+    def layout_history_page(
+        self,
+        session_id: str,
+        after_version: int,
+        to_version: int | None,
+        since: str | None,
+        until: str | None,
+        limit: int,
+    ) -> list[dict]:
+        page: list[dict] = []
+        with self._lock:
+            if session_id in self._archives:
+                chunks = self._archives[session_id]["layout_chunks"]
+                for first_version, last_version, first_at, last_at, blob in chunks:
+                    if last_version <= after_version:
+                        continue
+                    if to_version is not None and first_version > to_version:
+                        break
+                    if (since is not None and last_at < since) or (
+                        until is not None and first_at >= until
+                    ):
+                        continue
+                    for row in filter_layout_rows(
+                        unpack_rows(blob), after_version, to_version, since, until
+                    ):
+                        page.append(row)
+                        if len(page) >= limit:
+                            return page
+                return page
+            history = self._layouts.get(session_id, [])
+            # Versions are contiguous from 1, so version N lives at index N - 1.
+            for index in range(max(after_version, 0), len(history)):
+                row = history[index]
+                if to_version is not None and row["version"] > to_version:
+                    break
+                if since is not None and row["updated_at"] < since:
+                    continue
+                if until is not None and row["updated_at"] >= until:
+                    continue
+                page.append(dict(row))
+                if len(page) >= limit:
+                    break
+        return page
+
+    def append_layout(
+        self,
+        session_id: str,
+        base_version: int,
+        layout_json: str,
+        updated_by: str,
+        now: str,
+    ) -> int:
+        with self._lock:
+            if session_id in self._archives:
+                raise session_archived()
+            history = self._layouts.setdefault(session_id, [])
+            latest_version = history[-1]["version"] if history else 0
+            if base_version != latest_version:
+                raise layout_conflict()
+            history.append(
+                {
+                    "version": latest_version + 1,
+                    "layout_json": layout_json,
+                    "updated_by": updated_by,
+                    "updated_at": now,
+                }
+            )
+            return latest_version + 1
+
+    # ─── Archive ─────────────────────────────────────────────────────────────
+
+    def archive_session(self, session_id: str, now: str) -> bool:
+        with self._lock:
+            # Checked under the same lock as the move, so a session restarted
+            # since it was listed is left alone.
+            row = self._sessions.get(session_id)
+            if row is None or row["status"] != "ENDED":
+                return False
+            row["status"] = "ARCHIVED"
+            row["updated_at"] = now
+            participants = self._participants.pop(session_id, {})
+            history = self._layouts.pop(session_id, [])
+            self._archives[session_id] = {
+                "archived_at": now,
+                "participants_blob": pack_rows(
+                    (user_id, p["role"], p["joined_at"], p["left_at"])
+                    for user_id, p in participants.items()
+                ),
+                "layout_chunks": [
+                    layout_chunk(
+                        [
+                            (r["version"], r["layout_json"], r["updated_by"], r["updated_at"])
+                            for r in history[i : i + ARCHIVE_CHUNK_ROWS]
+                        ]
+                    )
+                    for i in range(0, len(history), ARCHIVE_CHUNK_ROWS)
+                ],
+            }
+            return True
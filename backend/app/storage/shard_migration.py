@@ -0,0 +1,89 @@
+"""
+Migrate a single-file database to the sharded layout.
+
+The existing file becomes the primary (users, sessions stay put); rows from
+session_participants, session_layouts and the archive tables are copied into
+their shard files and then removed from the primary. Re-running is safe:
+copies use `insert or ignore`, and rows are only deleted from the primary
+after every shard has committed.
+
+    python -m app.storage.shard_migration --shards 4 [--db path/to/livesurgery.db]
+"""
+
+import argparse
+from contextlib import ExitStack
+
+from app.core.database import DB_PATH, get_conn, init_db
+from app.storage.sharded import ShardedSQLiteStorage, shard_index
+
+_BATCH_SIZE = 1000
+
+_COLUMNS = {
+    "session_participants": ("session_id", "user_id", "role", "joined_at", "left_at"),
+    "session_layouts": ("session_id", "version", "layout_json", "updated_by", "updated_at"),
+    "session_archives": ("session_id", "archived_at", "participants_blob"),
+    "session_layout_archive": (
+        "session_id",
+        "first_version",
+        "last_version",
+        "first_at",
+        "last_at",
+        "rows_blob",
+    ),
+    "archived_memberships": ("user_id", "session_id"),
+}
+
+
+def migrate(primary_path: str, shard_count: int) -> dict[str, int]:
+    """Move per-session rows into shard files. Returns rows moved per table."""
+    # Bring the source up to the full schema first: a file created before
+    # the archive tables existed has none to copy, but the copy still reads
+    # and clears them.
+    init_db(primary_path, force=True)
+    engine = ShardedSQLiteStorage(primary_path, shard_count)
+    engine.init()
+    moved: dict[str, int] = {}
+    try:
+        for table, columns in _COLUMNS.items():
+            moved[table] = _copy_table(engine, table, columns)
+        with get_conn(primary_path) as conn:
+            for table in _COLUMNS:
+                conn.execute(f"delete from {table}")
+    finally:
+        engine.close()
+    return moved
+
+
+def _copy_table(engine: ShardedSQLiteStorage, table: str, columns: tuple[str, ...]) -> int:
+    column_list = ", ".join(columns)
+    placeholders = ", ".join("?" for _ in columns)
+    insert_sql = f"insert or ignore into {table} ({column_list}) values ({placeholders})"
+    copied = 0
+    # Every shard connection commits only if the whole table copied cleanly.
+    with ExitStack() as stack:
+        conns = [stack.enter_context(get_conn(shard.path)) for shard in engine.shards]
+        source = stack.enter_context(get_conn(engine.primary.path))
+        cursor = source.execute(f"select {column_list} from {table}")
+        while rows := cursor.fetchmany(_BATCH_SIZE):
+            buckets: dict[int, list[tuple]] = {}
+            for row in rows:
+                index = shard_index(row["session_id"], len(conns))
+                buckets.setdefault(index, []).append(tuple(row))
+            for index, batch in buckets.items():
+                conns[index].executemany(insert_sql, batch)
+            copied += len(rows)
+    return copied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=DB_PATH, help="single-file database to shard")
+    parser.add_argument("--shards", type=int, required=True)
+    args = parser.parse_args()
+    moved = migrate(args.db, args.shards)
+    for table, count in moved.items():
+        print(f"{table}: moved {count} rows into {args.shards} shards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import json
+import os
+import zlib
+
+from app.core.database import get_conn
+from app.storage.base import StorageEngine
+from app.storage.sqlite import (
+    SQLiteStorage,
+    insert_missing_users,
+    insert_session,
+    upsert_participants,
+)
+
+PRIMARY_TABLES = ("users", "sessions")
+SHARD_TABLES = (
+    "session_participants",
+    "session_layouts",
+    "session_archives",
+    "session_layout_archive",
+    "archived_memberships",
+)
+
+
+def shard_paths(primary_path: str, shard_count: int) -> list[str]:
+    """`livesurgery.db` -> `livesurgery.shard0.db`, `livesurgery.shard1.db`, ..."""
+    stem, ext = os.path.splitext(primary_path)
+    return [f"{stem}.shard{i}{ext or '.db'}" for i in range(shard_count)]
+
+
+def shard_index(session_id: str, shard_count: int) -> int:
+    # crc32 rather than hash(): it must be stable across processes and restarts.
+    return zlib.crc32(session_id.encode("utf-8")) % shard_count
+
+
+class ShardedSQLiteStorage(StorageEngine):
+    """
+    SQLite engine that spreads per-session data over several database files.
+
+    Users and the session catalog stay in the primary file; participants and
+    layouts are routed by session-id hash to one of N shard files, each with
+    its own group-commit writer, so publishes in unrelated rooms no longer
+    queue on a single SQLite writer lock.
+
+    Cross-file writes (session creation, bulk enrollment) are not atomic
+    across files: the primary row is written first, so a crash can at worst
+    leave a session without its owner participant, never an orphaned shard row
+    pointing at a missing session.
+    """
+
+    name = "sharded"
+
+    def __init__(self, primary_path: str, shard_count: int):
+        if shard_count < 1:
+            raise ValueError("shard_count must be >= 1")
+        self.primary = SQLiteStorage(primary_path, tables=PRIMARY_TABLES)
+        self.shards = [
+            SQLiteStorage(path, tables=SHARD_TABLES)
+            for path in shard_paths(primary_path, shard_count)
+        ]
+
+    def shard_for(self, session_id: str) -> SQLiteStorage:
+        return self.shards[shard_index(session_id, len(self.shards))]
+
+    def init(self) -> None:
+        self.primary.init()
+        for shard in self.shards:
+            shard.init()
+
+    def close(self) -> None:
+        self.primary.close()
+        for shard in self.shards:
+            shard.close()
+
+    def ping(self) -> None:
+        self.primary.ping()
+        for shard in self.shards:
+            shard.ping()
+
+    def warm(self) -> None:
+        self.primary.warm()
+        for shard in self.shards:
+            shard.warm()
+
+    # ─── Users ───────────────────────────────────────────────────────────────
+
+    def upsert_user(self, user_id: str, role: str, now: str) -> None:
+        self.primary.upsert_user(user_id, role, now)
+
+    def get_user(self, user_id: str) -> dict | None:
+        return self.primary.get_user(user_id)
+
+    # ─── Sessions ────────────────────────────────────────────────────────────
+
+    def create_session(
+        self,
+        session_id: str,
+        title: str,
+        visibility: str,
+        created_by: str,
+        owner_role: str,
+        now: str,
+    ) -> dict:
+        with get_conn(self.primary.path) as conn:
+            row = insert_session(conn, session_id, title, visibility, created_by, now)
+        with get_conn(self.shard_for(session_id).path) as conn:
+            upsert_participants(conn, session_id, {created_by: owner_role}, now)
+        return row
+
+    def get_session(self, session_id: str) -> dict | None:
+        return self.primary.get_session(session_id)
+
+    def list_sessions_for_user(self, user_id: str, limit: int, offset: int) -> list[dict]:
+        session_ids: list[str] = []
+        for shard in self.shards:
+            with get_conn(shard.path) as conn:
+                rows = conn.execute(
+                    """
+                    select session_id from session_participants where user_id = ?
+                    union all
+                    select session_id from archived_memberships where user_id = ?
+                    """,
+                    (user_id, user_id),
+                ).fetchall()
+            session_ids.extend(r["session_id"] for r in rows)
+        if not session_ids:
+            return []
+        with get_conn(self.primary.path) as conn:
+            rows = conn.execute(
+                """
+                select id, title, visibility, status, created_by, created_at, updated_at
+                from sessions
+                where id in (select value from json_each(?))
+                order by updated_at desc
+                limit ? offset ?
+                """,
+                (json.dumps(session_ids), limit, offset),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def set_session_status(self, session_id: str, status: str, now: str) -> None:
+        self.primary.set_session_status(session_id, status, now)
+
+    def ended_sessions(self, ended_before: str, limit: int) -> list[str]:
+        return self.primary.ended_sessions(ended_before, limit)
+
+    def live_sessions(self) -> list[dict]:
+        return self.primary.live_sessions()
+
+    # ─── Participants ────────────────────────────────────────────────────────
+
+    def is_participant(self, session_id: str, user_id: str) -> bool:
+        return self.shard_for(session_id).is_participant(session_id, user_id)
+
+    def upsert_participant(self, session_id: str, user_id: str, role: str, now: str) -> None:
+        self.shard_for(session_id).upsert_participant(session_id, user_id, role, now)
+
+    async def upsert_participant_async(
+        self, session_id: str, user_id: str, role: str, now: str
+    ) -> None:
+        await self.shard_for(session_id).upsert_participant_async(session_id, user_id, role, now)
+
+    def enroll_participants(self, session_id: str, roster: dict[str, str], now: str) -> None:
+        with get_conn(self.primary.path) as conn:
+            insert_missing_users(conn, roster, now)
+        with get_conn(self.shard_for(session_id).path) as conn:
+            upsert_participants(conn, session_id, roster, now)
+
+    def set_participant_role(self, session_id: str, user_id: str, role: str) -> bool:
+        return self.shard_for(session_id).set_participant_role(session_id, user_id, role)
+
+    # ─── Layouts ─────────────────────────────────────────────────────────────
+
+    def latest_layout(self, session_id: str) -> tuple[int, str] | None:
+        return self.shard_for(session_id).latest_layout(session_id)
+
+    def append_layout(
+        self,
+        session_id: str,
+        base_version: int,
+        layout_json: str,
+        updated_by: str,
+        now: str,
+    ) -> int:
+        return self.shard_for(session_id).append_layout(
+            session_id, base_version, layout_json, updated_by, now
+        )
+
+    def layout_history_page(
+        self,
+        session_id: str,
+        after_version: int,
+        to_version: int | None,
+        since: str | None,
+        until: str | None,
+        limit: int,
+    ) -> list[dict]:
+        return self.shard_for(session_id).layout_history_page(
+            session_id, after_version, to_version, since, until, limit
+        )
+
+    async def append_layout_async(
+        self,
+        session_id: str,
+        base_version: int,
+        layout_json: str,
+        updated_by: str,
+        now: str,
+    ) -> int:
+        return await self.shard_for(session_id).append_layout_async(
+            session_id, base_version, layout_json, updated_by, now
+        )
+
+    # ─── Archive ─────────────────────────────────────────────────────────────
+
+    def archive_session(self, session_id: str, now: str) -> bool:
+        # The status lives in the primary file, so it is flipped from inside
+        # the shard's archive transaction, as its last step: a restarted
+        # session rolls the shard move back. A crash between the primary
+        # commit and the shard commit leaves an ARCHIVED session whose rows
+        # are still hot, which reads handle the same as an archived one.
+        return self.shard_for(session_id).archive_session(
+            session_id, now, mark=lambda _conn, sid, at: self.primary.mark_archived(sid, at)
+        )
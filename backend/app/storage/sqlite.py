@@ -0,0 +1,497 @@
+from typing import Any, Callable
+
+from app.core.database import get_conn, init_db
+from app.services.group_commit import GroupCommitWriter
+from app.storage.archive import (
+    ARCHIVE_CHUNK_ROWS,
+    filter_layout_rows,
+    layout_chunk,
+    layout_row,
+    pack_rows,
+    session_archived,
+    unpack_rows,
+)
+from app.storage.base import StorageEngine, layout_conflict
+
+_SESSION_COLUMNS = "id, title, visibility, status, created_by, created_at, updated_at"
+
+_UPSERT_PARTICIPANT = """
+    insert into session_participants (session_id, user_id, role, joined_at, left_at)
+    values (?, ?, ?, ?, null)
+    on conflict(session_id, user_id) do update set
+      role = excluded.role,
+      joined_at = excluded.joined_at,
+      left_at = null
+"""
+
+
+def insert_session(
+    conn, session_id: str, title: str, visibility: str, created_by: str, now: str
+) -> dict:
+    conn.execute(
+        """
+        insert into sessions (id, title, visibility, status, created_by, created_at, updated_at)
+        values (?, ?, ?, 'DRAFT', ?, ?, ?)
+        """,
+        (session_id, title, visibility, created_by, now, now),
+    )
+    return {
+        "id": session_id,
+        "title": title,
+        "visibility": visibility,
+        "status": "DRAFT",
+        "created_by": created_by,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def mark_session_archived(conn, session_id: str, now: str) -> bool:
+    """Flip an ENDED session to ARCHIVED; False if it is not ENDED (restarted or archived)."""
+    cursor = conn.execute(
+        """
+        update sessions set status = 'ARCHIVED', updated_at = ?
+        where id = ? and status = 'ENDED'
+        """,
+        (now, session_id),
+    )
+    return cursor.rowcount == 1
+
+
+ArchiveMark = Callable[[Any, str, str], bool]
+
+
+def _move_to_archive(conn, session_id: str, now: str) -> None:
+    participants = conn.execute(
+        """
+        select user_id, role, joined_at, left_at from session_participants
+        where session_id = ?
+        """,
+        (session_id,),
+    ).fetchall()
+    conn.execute(
+        """
+        insert into session_archives (session_id, archived_at, participants_blob)
+        values (?, ?, ?)
+        """,
+        (session_id, now, pack_rows(participants)),
+    )
+    conn.executemany(
+        "insert or ignore into archived_memberships (user_id, session_id) values (?, ?)",
+        [(r["user_id"], session_id) for r in participants],
+    )
+    layouts = conn.execute(
+        """
+        select version, layout_json, updated_by, updated_at from session_layouts
+        where session_id = ?
+        order by version
+        """,
+        (session_id,),
+    )
+    while rows := layouts.fetchmany(ARCHIVE_CHUNK_ROWS):
+        conn.execute(
+            """
+            insert into session_layout_archive
+              (session_id, first_version, last_version, first_at, last_at, rows_blob)
+            values (?, ?, ?, ?, ?, ?)
+            """,
+            (session_id, *layout_chunk([tuple(r) for r in rows])),
+        )
+    conn.execute("delete from session_layouts where session_id = ?", (session_id,))
+    conn.execute("delete from session_participants where session_id = ?", (session_id,))
+
+
+class _SessionNotEnded(Exception):
+    """Raised inside an archive write to roll back its savepoint."""
+
+
+def insert_missing_users(conn, roster: dict[str, str], now: str) -> None:
+    conn.executemany(
+        """
+        insert into users (id, email, display_name, role, created_at)
+        values (?, null, ?, ?, ?)
+        on conflict(id) do nothing
+        """,
+        [(user_id, user_id, role, now) for user_id, role in roster.items()],
+    )
+
+
+def upsert_participants(conn, session_id: str, roster: dict[str, str], now: str) -> None:
+    conn.executemany(
+        _UPSERT_PARTICIPANT,
+        [(session_id, user_id, role, now) for user_id, role in roster.items()],
+    )
+
+
+class SQLiteStorage(StorageEngine):
+    """
+    SQLite-backed engine. Reads use a short-lived connection each; layout
+    publishes and participant joins go through the group-commit writer.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, tables: tuple[str, ...] | None = None):
+        self.path = path
+        self.tables = tables
+        self.writer = GroupCommitWriter.from_env(path)
+
+    def init(self) -> None:
+        init_db(self.path, self.tables)
+
+    def close(self) -> None:
+        self.writer.stop()
+
+    def ping(self) -> None:
+        with get_conn(self.path) as conn:
+            conn.execute("select 1").fetchone()
+
+    def warm(self) -> None:
+        # Reading sqlite_master loads the schema and pulls its pages into the
+        # OS cache; starting the writer opens its long-lived connection.
+        with get_conn(self.path) as conn:
+            conn.execute("select count(*) from sqlite_master").fetchone()
+        if self.writer.enabled:
+            self.writer.start()
+
+    # ─── Users ───────────────────────────────────────────────────────────────
+
+    def upsert_user(self, user_id: str, role: str, now: str) -> None:
+        with get_conn(self.path) as conn:
+            conn.execute(
+                """
+                insert into users (id, email, display_name, role, created_at)
+                values (?, null, ?, ?, ?)
+                on conflict(id) do update set
+                  role = excluded.role,
+                  display_name = excluded.display_name
+                """,
+                (user_id, user_id, role, now),
+            )
+
+    def get_user(self, user_id: str) -> dict | None:
+        with get_conn(self.path) as conn:
+            row = conn.execute(
+                "select id, email, display_name, role, created_at from users where id = ?",
+                (user_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    # ─── Sessions ────────────────────────────────────────────────────────────
+
+    def create_session(
+        self,
+        session_id: str,
+        title: str,
+        visibility: str,
+        created_by: str,
+        owner_role: str,
+        now: str,
+    ) -> dict:
+        with get_conn(self.path) as conn:
+            row = insert_session(conn, session_id, title, visibility, created_by, now)
+            conn.execute(_UPSERT_PARTICIPANT, (session_id, created_by, owner_role, now))
+        return row
+
+    def get_session(self, session_id: str) -> dict | None:
+        with get_conn(self.path) as conn:
+            row = conn.execute(
+                f"select {_SESSION_COLUMNS} from sessions where id = ?",
+                (session_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list_sessions_for_user(self, user_id: str, limit: int, offset: int) -> list[dict]:
+        with get_conn(self.path) as conn:
+            rows = conn.execute(
+                """
+                select s.id, s.title, s.visibility, s.status, s.created_by, s.created_at, s.updated_at
+                from sessions s
+                where s.id in (
+                  select session_id from session_participants where user_id = ?
+                  union all
+                  select session_id from archived_memberships where user_id = ?
+                )
+                order by s.updated_at desc
+                limit ? offset ?
+                """,
+                (user_id, user_id, limit, offset),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def set_session_status(self, session_id: str, status: str, now: str) -> None:
+        with get_conn(self.path) as conn:
+            # ARCHIVED is terminal: a start that read ENDED just before the
+            # archival pass flipped it must not bring the session back.
+            conn.execute(
+                """
+                update sessions set status = ?, updated_at = ?
+                where id = ? and status != 'ARCHIVED'
+                """,
+                (status, now, session_id),
+            )
+
+    def mark_archived(self, session_id: str, now: str) -> bool:
+        with get_conn(self.path) as conn:
+            return mark_session_archived(conn, session_id, now)
+
+    def ended_sessions(self, ended_before: str, limit: int) -> list[str]:
+        with get_conn(self.path) as conn:
+            rows = conn.execute(
+                """
+                select id from sessions
+                where status = 'ENDED' and updated_at < ?
+                order by updated_at
+                limit ?
+                """,
+                (ended_before, limit),
+            ).fetchall()
+        return [r["id"] for r in rows]
+
+    def live_sessions(self) -> list[dict]:
+        with get_conn(self.path) as conn:
+            rows = conn.execute("""
+                select id, title, updated_at from sessions
+                where status = 'LIVE'
+                order by updated_at
+                """).fetchall()
+        return [dict(r) for r in rows]
+
+    # ─── Participants ────────────────────────────────────────────────────────
+
+    def is_participant(self, session_id: str, user_id: str) -> bool:
+        with get_conn(self.path) as conn:
+            membership = conn.execute(
+                """
+                select 1 from session_participants
+                where session_id = ? and user_id = ?
+                union all
+                select 1 from archived_memberships
+                where user_id = ? and session_id = ?
+                limit 1
+                """,
+                (session_id, user_id, user_id, session_id),
+            ).fetchone()
+        return bool(membership)
+
+    def upsert_participant(self, session_id: str, user_id: str, role: str, now: str) -> None:
+        def op(conn) -> None:
+            conn.execute(_UPSERT_PARTICIPANT, (session_id, user_id, role, now))
+
+        self.writer.run(op)
+
+    async def upsert_participant_async(
+        self, session_id: str, user_id: str, role: str, now: str
+    ) -> None:
+        def op(conn) -> None:
+            conn.execute(_UPSERT_PARTICIPANT, (session_id, user_id, role, now))
+
+        await self.writer.run_async(op)
+
+    def enroll_participants(self, session_id: str, roster: dict[str, str], now: str) -> None:
+        with get_conn(self.path) as conn:
+            insert_missing_users(conn, roster, now)
+            upsert_participants(conn, session_id, roster, now)
+
+    def set_participant_role(self, session_id: str, user_id: str, role: str) -> bool:
+        with get_conn(self.path) as conn:
+            updated = conn.execute(
+                """
+                update session_participants set role = ?
+                where session_id = ? and user_id = ?
+                """,
+                (role, session_id, user_id),
+            ).rowcount
+        return updated > 0
+
+    # ─── Layouts ─────────────────────────────────────────────────────────────
+
+    def latest_layout(self, session_id: str) -> tuple[int, str] | None:
+        with get_conn(self.path) as conn:
+            row = conn.execute(
+                """
+                select version, layout_json
+                from session_layouts
+                where session_id = ?
+                order by version desc
+                limit 1
+                """,
+                (session_id,),
+            ).fetchone()
+            if not row:
+                row = self._latest_archived_layout(conn, session_id)
+        if not row:
+            return None
+        return int(row["version"]), row["layout_json"]
+
+    @staticmethod
+    def _latest_archived_layout(conn, session_id: str) -> dict | None:
+        chunk = conn.execute(
+            """
+            select rows_blob from session_layout_archive
+            where session_id = ?
+            order by first_version desc
+            limit 1
+            """,
+            (session_id,),
+        ).fetchone()
+        return layout_row(unpack_rows(chunk["rows_blob"])[-1]) if chunk else None
+
+    def layout_history_page(
+        self,
+        session_id: str,
+        after_version: int,
+        to_version: int | None,
+        since: str | None,
+        until: str | None,
+        limit: int,
+    ) -> list[dict]:
+        with get_conn(self.path) as conn:
+            rows = conn.execute(
+                """
+                select version, layout_json, updated_by, updated_at
+                from session_layouts
+                where session_id = ?
+                  and version > ?
+                  and (? is null or version <= ?)
+                  and (? is null or updated_at >= ?)
+                  and (? is null or updated_at < ?)
+                order by version
+                limit ?
+                """,
+                (
+                    session_id,
+                    after_version,
+                    to_version,
+                    to_version,
+                    since,
+                    since,
+                    until,
+                    until,
+                    limit,
+                ),
+            ).fetchall()
+            if rows:
+                return [dict(r) for r in rows]
+            return self._archived_history_page(
+                conn, session_id, after_version, to_version, since, until, limit
+            )
+
+    @staticmethod
+    def _archived_history_page(
+        conn,
+        session_id: str,
+        after_version: int,
+        to_version: int | None,
+        since: str | None,
+        until: str | None,
+        limit: int,
+    ) -> list[dict]:
+        # Chunk version/time ranges prune what gets inflated; rows are then
+        # filtered exactly.
+        chunks = conn.execute(
+            """
+            select rows_blob from session_layout_archive
+            where session_id = ?
+              and last_version > ?
+              and (? is null or first_version <= ?)
+              and (? is null or last_at >= ?)
+              and (? is null or first_at < ?)
+            order by first_version
+            """,
+            (session_id, after_version, to_version, to_version, since, since, until, until),
+        )
+        page: list[dict] = []
+        for chunk in chunks:
+            for row in filter_layout_rows(
+                unpack_rows(chunk["rows_blob"]), after_version, to_version, since, until
+            ):
+                page.append(row)
+                if len(page) >= limit:
+                    return page
+        return page
+
+    @staticmethod
+    def _append_op(session_id: str, base_version: int, layout_json: str, updated_by: str, now: str):
+        def op(conn) -> int:
+            # Runs on the group-commit writer, so the version check and the
+            # insert are serialized with every other layout write.
+            row = conn.execute(
+                "select max(version) from session_layouts where session_id = ?",
+                (session_id,),
+            ).fetchone()
+            latest_version = int(row[0] or 0)
+            if (
+                latest_version == 0
+                and conn.execute(
+                    "select 1 from session_archives where session_id = ?", (session_id,)
+                ).fetchone()
+            ):
+                raise session_archived()
+            if base_version != latest_version:
+                raise layout_conflict()
+            conn.execute(
+                """
+                insert into session_layouts (session_id, version, layout_json, updated_by, updated_at)
+                values (?, ?, ?, ?, ?)
+                """,
+                (session_id, latest_version + 1, layout_json, updated_by, now),
+            )
+            return latest_version + 1
+
+        return op
+
+    def append_layout(
+        self,
+        session_id: str,
+        base_version: int,
+        layout_json: str,
+        updated_by: str,
+        now: str,
+    ) -> int:
+        return self.writer.run(
+            self._append_op(session_id, base_version, layout_json, updated_by, now)
+        )
+
+    async def append_layout_async(
+        self,
+        session_id: str,
+        base_version: int,
+        layout_json: str,
+        updated_by: str,
+        now: str,
+    ) -> int:
+        return await self.writer.run_async(
+            self._append_op(session_id, base_version, layout_json, updated_by, now)
+        )
+
+    # ─── Archive ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _archive_op(session_id: str, now: str, mark: ArchiveMark):
+        def op(conn) -> bool:
+            # On the group-commit writer, so no publish or join for this
+            # session can interleave between the copy and the delete.
+            if not conn.execute(
+                "select 1 from session_archives where session_id = ?", (session_id,)
+            ).fetchone():
+                _move_to_archive(conn, session_id, now)
+            # Last, so a session restarted since it was listed rolls the
+            # move back instead of being archived while LIVE.
+            if not mark(conn, session_id, now):
+                raise _SessionNotEnded(session_id)
+            return True
+
+        return op
+
+    def archive_session(
+        self, session_id: str, now: str, mark: ArchiveMark = mark_session_archived
+    ) -> bool:
+        """
+        `mark` flips the status inside the archive transaction; the sharded
+        engine passes one that updates its primary file instead.
+        """
+        try:
+            return self.writer.run(self._archive_op(session_id, now, mark))
+        except _SessionNotEnded:
+            return False
@@ -0,0 +1,86 @@
+"""Hot/cold archival benchmark.
+
+Seeds `--ended` ended sessions with `--versions` layout versions each plus
+one live session, then runs an archival pass. Reports hot-table row counts,
+stored layout bytes hot vs compressed, the pass duration, and the latency of
+a cold history read and of the live session's layout read before and after.
+
+    python -m benchmarks.bench_archival --ended 200 --versions 500
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.common import summarize_ms, use_temp_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ended", type=int, default=200)
+    parser.add_argument("--versions", type=int, default=500)
+    args = parser.parse_args()
+
+    use_temp_db()
+    from app.core.database import get_conn
+    from app.services.archival import archive_ended_sessions
+    from app.services.layouts import default_layout, now_iso
+    from app.storage import get_storage
+
+    storage = get_storage()
+    storage.init()
+    owner = "archival-bench"
+    storage.upsert_user(owner, "SURGEON", now_iso())
+    layout_json = json.dumps(default_layout(), separators=(",", ":"))
+    session_ids = [f"ended-{i}" for i in range(args.ended)] + ["live"]
+    for session_id in session_ids:
+        storage.create_session(session_id, "bench", "PRIVATE", owner, "SURGEON", now_iso())
+    with get_conn() as conn:
+        conn.executemany(
+            """
+            insert into session_layouts (session_id, version, layout_json, updated_by, updated_at)
+            values (?, ?, ?, ?, ?)
+            """,
+            (
+                (session_id, v, layout_json, owner, now_iso())
+                for session_id in session_ids
+                for v in range(1, args.versions + 1)
+            ),
+        )
+    for session_id in session_ids[:-1]:
+        storage.set_session_status(session_id, "ENDED", now_iso())
+
+    def report(label: str) -> None:
+        with get_conn() as conn:
+            hot_rows, hot_bytes = conn.execute(
+                "select count(*), coalesce(sum(length(layout_json)), 0) from session_layouts"
+            ).fetchone()
+            cold_chunks, cold_bytes = conn.execute(
+                "select count(*), coalesce(sum(length(rows_blob)), 0) from session_layout_archive"
+            ).fetchone()
+        print(
+            f"{label}: hot layouts={hot_rows} rows / {hot_bytes / 1024:.0f} KiB, "
+            f"cold={cold_chunks} chunks / {cold_bytes / 1024:.0f} KiB"
+        )
+        live = []
+        for _ in range(200):
+            started = time.perf_counter()
+            storage.latest_layout("live")
+            live.append(time.perf_counter() - started)
+        print("  " + summarize_ms("live latest_layout", live))
+        history = []
+        for session_id in session_ids[:20]:
+            started = time.perf_counter()
+            rows = sum(len(page) for page in storage.iter_layout_history(session_id))
+            history.append(time.perf_counter() - started)
+        print("  " + summarize_ms(f"ended history ({rows} rows)", history))
+
+    report("before")
+    started = time.perf_counter()
+    archived = len(archive_ended_sessions(grace_seconds=0, batch_size=args.ended))
+    print(f"archived {archived} sessions in {time.perf_counter() - started:.2f}s")
+    report("after")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Bulk enrollment benchmark.
+
+Compares enrolling observers one `participants:join` call at a time with a
+single `participants:batchJoin` request for the whole roster.
+
+    python -m benchmarks.bench_bulk_enroll --participants 5000 --single-sample 500
+"""
+
+import argparse
+import time
+
+from benchmarks.common import dev_headers, use_temp_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--participants", type=int, default=5000)
+    parser.add_argument(
+        "--single-sample",
+        type=int,
+        default=500,
+        help="per-user joins to time; the result is extrapolated to --participants",
+    )
+    args = parser.parse_args()
+
+    use_temp_db()
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        owner = dev_headers("bench-owner")
+
+        single_id = client.post(
+            "/v1/sessions", json={"title": "Single joins"}, headers=owner
+        ).json()["id"]
+        started = time.perf_counter()
+        for i in range(args.single_sample):
+            client.post(
+                f"/v1/sessions/{single_id}/participants:join",
+                headers=dev_headers(f"single-{i}", "OBSERVER"),
+            )
+        single_elapsed = time.perf_counter() - started
+        per_join = single_elapsed / args.single_sample
+
+        bulk_id = client.post("/v1/sessions", json={"title": "Bulk joins"}, headers=owner).json()[
+            "id"
+        ]
+        roster = [{"userId": f"bulk-{i}"} for i in range(args.participants)]
+        started = time.perf_counter()
+        response = client.post(
+            f"/v1/sessions/{bulk_id}/participants:batchJoin",
+            json={"participants": roster},
+            headers=owner,
+        )
+        lines = sum(1 for _ in response.iter_lines())
+        bulk_elapsed = time.perf_counter() - started
+
+    print(
+        f"single joins: {args.single_sample} in {single_elapsed:.2f}s "
+        f"({per_join * 1000:.2f}ms/join, ~{per_join * args.participants:.1f}s for "
+        f"{args.participants})"
+    )
+    print(
+        f"batchJoin:    {lines} in {bulk_elapsed:.2f}s "
+        f"({bulk_elapsed / max(lines, 1) * 1000:.3f}ms/participant)"
+    )
+
+
+if __name__ == "__main__":
+    main()
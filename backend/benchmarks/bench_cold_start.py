@@ -0,0 +1,130 @@
+"""Cold-start benchmark: app import time and time to the first healthy /healthz.
+
+Every measurement is a fresh interpreter. Import time is `import app.main`
+in a subprocess. Boot time spawns uvicorn and polls /healthz until it
+answers 200, for three cases: a brand-new database file, a second boot of
+the same file (stored schema version matches, DDL skipped), and the same
+with LIVESURGERY_SCHEMA_MODE=ddl. `--live` LIVE sessions with layout
+history are seeded first so start-up work proportional to the fleet shows.
+
+    python -m benchmarks.bench_cold_start --runs 5 --live 2000
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.common import summarize_ms
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _env(db_path: str, **extra: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env.pop("LIVESURGERY_SCHEMA_MODE", None)
+    env.update(LIVESURGERY_DB_PATH=db_path, **extra)
+    return env
+
+
+def measure_import(db_path: str) -> float:
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=_BACKEND_DIR,
+        env=_env(db_path),
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def measure_boot(db_path: str, **extra: str) -> float:
+    """Seconds from spawning uvicorn to the first 200 from /healthz."""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=_BACKEND_DIR,
+        env=_env(db_path, **extra),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before /healthz came up")
+            time.sleep(0.005)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def seed(db_path: str, live: int) -> None:
+    code = f"""
+from app.services.layouts import now_iso
+from app.storage import get_storage
+storage = get_storage()
+storage.init()
+storage.upsert_user("boot", "SURGEON", now_iso())
+for i in range({live}):
+    sid = f"live-{{i}}"
+    storage.create_session(sid, "bench", "PRIVATE", "boot", "SURGEON", now_iso())
+    storage.set_session_status(sid, "LIVE", now_iso())
+    for base in range(3):
+        storage.append_layout(sid, base, '{{"panels":[]}}', "boot", now_iso())
+storage.close()
+"""
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=_BACKEND_DIR, env=_env(db_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--live", type=int, default=2000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="livesurgery-bench-")
+    imports = [measure_import(os.path.join(tmp_dir, "import.db")) for _ in range(args.runs)]
+    print(summarize_ms("import app.main", imports))
+
+    fresh = [measure_boot(os.path.join(tmp_dir, f"fresh-{i}.db")) for i in range(args.runs)]
+    print(summarize_ms("boot, new database", fresh))
+
+    db_path = os.path.join(tmp_dir, "seeded.db")
+    seed(db_path, args.live)
+    warm = [measure_boot(db_path) for _ in range(args.runs)]
+    print(summarize_ms(f"boot, existing database ({args.live} LIVE)", warm))
+    forced = [measure_boot(db_path, LIVESURGERY_SCHEMA_MODE="ddl") for _ in range(args.runs)]
+    print(summarize_ms(f"boot, existing database, DDL forced ({args.live} LIVE)", forced))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Group-commit throughput benchmark.
+
+Concurrent writers each publish layouts to their own session and upsert a
+participant row, first with group commit disabled (one transaction per
+write), then with group commit at several batch windows. Reports writes/sec
+and the mean batch size.
+
+    python -m benchmarks.bench_group_commit --writers 32 --writes 100
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import use_temp_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=100, help="writes per writer")
+    parser.add_argument("--windows", default="0,1,2,5,10", help="batch windows in ms")
+    args = parser.parse_args()
+
+    use_temp_db()
+    from app.core.database import get_conn, init_db
+    from app.services.layouts import now_iso, publish_layout
+    from app.storage import get_storage
+
+    init_db()
+    group_writer = get_storage().writer
+
+    def run(label: str) -> None:
+        stamp = f"{label}-{time.monotonic_ns()}"
+        with get_conn() as conn:
+            conn.execute(
+                "insert into users (id, role, created_at) values (?, 'SURGEON', ?)",
+                (stamp, now_iso()),
+            )
+            conn.executemany(
+                """
+                insert into sessions (id, title, visibility, status, created_by,
+                                      created_at, updated_at)
+                values (?, 'bench', 'PRIVATE', 'LIVE', ?, ?, ?)
+                """,
+                [(f"{stamp}-{w}", stamp, now_iso(), now_iso()) for w in range(args.writers)],
+            )
+
+        def writer(w: int) -> None:
+            session_id = f"{stamp}-{w}"
+            for version in range(args.writes // 2):
+                publish_layout(session_id, version, {"panels": [], "v": version}, stamp)
+                group_writer.run(
+                    lambda conn: conn.execute(
+                        """
+                        insert into session_participants (session_id, user_id, role, joined_at)
+                        values (?, ?, 'OBSERVER', ?)
+                        on conflict(session_id, user_id) do update set joined_at = excluded.joined_at
+                        """,
+                        (session_id, stamp, now_iso()),
+                    )
+                )
+
+        before_batches, before_writes = group_writer.stats.batches, group_writer.stats.writes
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.writers) as pool:
+            list(pool.map(writer, range(args.writers)))
+        elapsed = time.perf_counter() - started
+        total = args.writers * (args.writes // 2) * 2
+        batches = group_writer.stats.batches - before_batches
+        writes = group_writer.stats.writes - before_writes
+        batch_info = f" mean batch={writes / batches:.1f}" if batches else ""
+        print(f"{label:>14}: {total / elapsed:8.0f} writes/sec{batch_info}")
+
+    group_writer.configure(enabled=False)
+    run("no batching")
+    for window in (float(w) for w in args.windows.split(",")):
+        group_writer.configure(enabled=True, window_ms=window)
+        run(f"window={window:g}ms")
+    group_writer.stop()
+
+
+if __name__ == "__main__":
+    main()
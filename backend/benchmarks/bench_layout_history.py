@@ -0,0 +1,121 @@
+"""Layout history export benchmark.
+
+Seeds one session with `--versions` layout rows, then exports them two ways
+and reports throughput and peak Python heap (tracemalloc):
+
+- naive: fetch every row, build a list of dicts, json.dumps it in one go
+- streamed: GET /v1/sessions/{id}/layout/history driven through the ASGI app
+  with a sink that discards body chunks, plain and with compress=gzip
+
+    python -m benchmarks.bench_layout_history --versions 100000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import dev_headers, use_temp_db
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:>16}: {elapsed:6.2f}s  {size / 1024 / 1024:7.1f} MiB out  "
+        f"peak heap {peak / 1024 / 1024:7.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--versions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    use_temp_db()
+    from app.core.database import get_conn
+    from app.main import app
+    from app.services.layouts import default_layout, now_iso
+    from app.storage import get_storage
+
+    storage = get_storage()
+    storage.init()
+    owner = "history-bench"
+    storage.upsert_user(owner, "SURGEON", now_iso())
+    session_id = storage.create_session(
+        "history-bench", "bench", "PRIVATE", owner, "SURGEON", now_iso()
+    )["id"]
+    layout_json = json.dumps(default_layout(), separators=(",", ":"))
+    with get_conn() as conn:
+        conn.executemany(
+            """
+            insert into session_layouts (session_id, version, layout_json, updated_by, updated_at)
+            values (?, ?, ?, ?, ?)
+            """,
+            ((session_id, v, layout_json, owner, now_iso()) for v in range(1, args.versions + 1)),
+        )
+
+    def naive() -> int:
+        with get_conn() as conn:
+            rows = conn.execute(
+                "select * from session_layouts where session_id = ? order by version",
+                (session_id,),
+            ).fetchall()
+        body = json.dumps(
+            [
+                {
+                    "version": r["version"],
+                    "layout": json.loads(r["layout_json"]),
+                    "updatedBy": r["updated_by"],
+                    "updatedAt": r["updated_at"],
+                }
+                for r in rows
+            ]
+        )
+        return len(body)
+
+    def streamed(query: str) -> int:
+        headers = [(k.lower().encode(), v.encode()) for k, v in dev_headers(owner).items()]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/v1/sessions/{session_id}/layout/history",
+            "raw_path": f"/v1/sessions/{session_id}/layout/history".encode(),
+            "query_string": query.encode(),
+            "headers": headers,
+            "server": ("bench", 80),
+            "client": ("bench", 1234),
+        }
+        received = [0]
+        requested = [False]
+
+        async def receive() -> dict:
+            if not requested[0]:
+                requested[0] = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Client never disconnects; the response cancels this wait when done.
+            return await asyncio.get_running_loop().create_future()
+
+        async def send(message: dict) -> None:
+            if message["type"] == "http.response.body":
+                received[0] += len(message.get("body", b""))
+
+        asyncio.run(app(scope, receive, send))
+        return received[0]
+
+    print(f"{args.versions} layout versions")
+    _measure("naive", naive)
+    _measure("streamed", lambda: streamed(""))
+    _measure("streamed gzip", lambda: streamed("compress=gzip"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Polling benchmark for conditional layout / session reads.
+
+Simulates observers polling GET /v1/sessions/{id}/layout and /v1/sessions/{id}
+with If-None-Match while the surgeon publishes a new layout every few polls.
+Reports the 304 ratio and latency for 200 vs 304 responses.
+
+    python -m benchmarks.bench_layout_polling --observers 50 --rounds 40
+"""
+
+import argparse
+import time
+
+from benchmarks.common import dev_headers, summarize_ms, use_temp_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--observers", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=40)
+    parser.add_argument("--publish-every", type=int, default=10, help="rounds between publishes")
+    args = parser.parse_args()
+
+    use_temp_db()
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        surgeon = dev_headers("bench-surgeon")
+        session_id = client.post(
+            "/v1/sessions", json={"title": "Polling bench"}, headers=surgeon
+        ).json()["id"]
+        observers = [dev_headers(f"bench-observer-{i}", "OBSERVER") for i in range(args.observers)]
+        for headers in observers:
+            client.post(f"/v1/sessions/{session_id}/participants:join", headers=headers)
+
+        etags: dict[tuple[int, str], str] = {}
+        timings: dict[int, list[float]] = {200: [], 304: []}
+        version = 0
+        for round_no in range(args.rounds):
+            if round_no and round_no % args.publish_every == 0:
+                client.post(
+                    f"/v1/sessions/{session_id}/layout",
+                    json={"baseVersion": version, "layout": {"panels": [], "round": round_no}},
+                    headers=surgeon,
+                )
+                version += 1
+            for idx, headers in enumerate(observers):
+                for path in ("layout", ""):
+                    url = f"/v1/sessions/{session_id}/{path}".rstrip("/")
+                    request_headers = dict(headers)
+                    if (idx, path) in etags:
+                        request_headers["If-None-Match"] = etags[(idx, path)]
+                    started = time.perf_counter()
+                    response = client.get(url, headers=request_headers)
+                    timings.setdefault(response.status_code, []).append(
+                        time.perf_counter() - started
+                    )
+                    etags[(idx, path)] = response.headers.get("etag", "")
+
+    total = sum(len(v) for v in timings.values())
+    print(f"requests={total} publishes={version}")
+    print(f"304 ratio: {len(timings[304]) / total:.1%}")
+    print(summarize_ms("200 OK", timings[200]))
+    print(summarize_ms("304 Not Modified", timings[304]))
+
+
+if __name__ == "__main__":
+    main()
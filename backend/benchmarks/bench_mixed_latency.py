@@ -0,0 +1,88 @@
+"""Mixed-workload tail latency: a join storm alongside layout polling.
+
+Seeds one LIVE session with `--readers` members, then runs two streams at
+once against the app in-process: `--joins` participant joins by first-seen
+users (user upsert + participant upsert, `--join-concurrency` in flight)
+and `--reads` layout GETs by existing members (`--read-concurrency` in
+flight). Reports latency percentiles per stream; the read p99 is the number
+a join burst should not move.
+
+    python -m benchmarks.bench_mixed_latency --joins 2000 --reads 4000
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import dev_headers, summarize_ms, use_temp_db
+
+
+async def _stream(client, count: int, concurrency: int, request) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await request(client, i)
+            samples.append(time.perf_counter() - started)
+        assert response.status_code in (200, 503), response.text
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return samples
+
+
+async def _main(args) -> None:
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await app.router.startup()
+        owner = dev_headers("mixed-owner")
+        session_id = (
+            await client.post("/v1/sessions", json={"title": "Mixed"}, headers=owner)
+        ).json()["id"]
+        await client.post(f"/v1/sessions/{session_id}/start", headers=owner)
+        readers = [dev_headers(f"mixed-reader-{i}", "OBSERVER") for i in range(args.readers)]
+        for headers in readers:
+            await client.post(f"/v1/sessions/{session_id}/participants:join", headers=headers)
+
+        async def join(client, i: int):
+            headers = dev_headers(f"mixed-joiner-{i}", "OBSERVER")
+            return await client.post(
+                f"/v1/sessions/{session_id}/participants:join", headers=headers
+            )
+
+        async def read(client, i: int):
+            headers = readers[i % len(readers)]
+            return await client.get(f"/v1/sessions/{session_id}/layout", headers=headers)
+
+        started = time.perf_counter()
+        joins, reads = await asyncio.gather(
+            _stream(client, args.joins, args.join_concurrency, join),
+            _stream(client, args.reads, args.read_concurrency, read),
+        )
+        elapsed = time.perf_counter() - started
+        await app.router.shutdown()
+    print(summarize_ms("joins", joins))
+    print(summarize_ms("layout reads", reads))
+    print(f"total {elapsed:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--joins", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=4000)
+    parser.add_argument("--readers", type=int, default=50)
+    parser.add_argument("--join-concurrency", type=int, default=200)
+    parser.add_argument("--read-concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    use_temp_db()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
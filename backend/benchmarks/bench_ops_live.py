@@ -0,0 +1,98 @@
+"""Ops dashboard benchmark: per-request scan vs write-through aggregates.
+
+Seeds `--sessions` LIVE sessions (each with a couple of layout versions and
+`--sockets` registered hub sockets), then times building the dashboard the
+naive way — list LIVE sessions, `hub.count` and `latest_layout` per session —
+against `live_stats.snapshot_json()`, both cold (after a change) and warm.
+
+    python -m benchmarks.bench_ops_live --sessions 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import summarize_ms, use_temp_db
+
+
+class _Socket:
+    """Stands in for a WebSocket in the hub's room sets."""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--sockets", type=int, default=5)
+    parser.add_argument("--reads", type=int, default=50)
+    args = parser.parse_args()
+
+    use_temp_db()
+    from app.core.responses import dumps
+    from app.services.layouts import current_layout_version, now_iso, publish_layout
+    from app.services.live_stats import live_stats
+    from app.services.realtime_hub import hub
+    from app.storage import get_storage
+
+    storage = get_storage()
+    storage.init()
+    owner = "ops-bench"
+    storage.upsert_user(owner, "SURGEON", now_iso())
+    session_ids = [f"live-{i}" for i in range(args.sessions)]
+    for session_id in session_ids:
+        storage.create_session(session_id, "bench", "PRIVATE", owner, "SURGEON", now_iso())
+        storage.set_session_status(session_id, "LIVE", now_iso())
+        for base in range(2):
+            publish_layout(session_id, base, {"panels": []}, owner)
+    live_stats.load(storage.live_sessions())
+    for session_id in session_ids:
+        live_stats.observe_layout_version(session_id, current_layout_version(session_id))
+
+    async def connect_all() -> None:
+        for session_id in session_ids:
+            for _ in range(args.sockets):
+                await hub.connect(session_id, _Socket())
+
+    asyncio.run(connect_all())
+
+    def naive() -> bytes:
+        async def counts() -> list[int]:
+            return [await hub.count(row["id"]) for row in rows]
+
+        rows = storage.live_sessions()
+        participants = asyncio.run(counts())
+        sessions = [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "participants": n,
+                "layoutVersion": (storage.latest_layout(row["id"]) or (0, ""))[0],
+            }
+            for row, n in zip(rows, participants)
+        ]
+        return dumps({"liveSessions": len(sessions), "sessions": sessions})
+
+    samples = []
+    for _ in range(args.reads):
+        started = time.perf_counter()
+        naive()
+        samples.append(time.perf_counter() - started)
+    print(summarize_ms(f"scan per request ({args.sessions} live)", samples))
+
+    cold, warm = [], []
+    for i in range(args.reads):
+        live_stats.layout_published(session_ids[i % len(session_ids)], 3)
+        started = time.perf_counter()
+        body = live_stats.snapshot_json()
+        cold.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        live_stats.snapshot_json()
+        warm.append(time.perf_counter() - started)
+    print(summarize_ms("aggregate, rebuilt after a change", cold))
+    print(summarize_ms("aggregate, cached", warm))
+    totals = json.loads(body)["totals"]
+    print(f"totals: {totals}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Overload benchmark for admission control.
+
+Fires a join storm (observers minting tokens and calling participants:join)
+while the surgeon keeps reading and publishing the layout, once with
+admission control disabled and once enabled. Reports surgeon latency,
+observer throughput and how many requests were shed with 503.
+
+    python -m benchmarks.bench_overload --observers 800 --concurrency 400
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import dev_headers, summarize_ms, use_temp_db
+
+
+async def _run(app, observers: int, concurrency: int, label: str) -> None:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        surgeon = dev_headers(f"{label}-surgeon")
+        session_id = (
+            await client.post("/v1/sessions", json={"title": "Overload"}, headers=surgeon)
+        ).json()["id"]
+
+        statuses: dict[int, int] = {}
+        observer_latency: list[float] = []
+        surgeon_latency: list[float] = []
+        gate = asyncio.Semaphore(concurrency)
+        storm_done = asyncio.Event()
+
+        async def observer(i: int) -> None:
+            async with gate:
+                user_id = f"{label}-obs-{i}"
+                started = time.perf_counter()
+                token = await client.post(
+                    "/auth/token", json={"userId": user_id, "role": "OBSERVER"}
+                )
+                statuses[token.status_code] = statuses.get(token.status_code, 0) + 1
+                if token.status_code != 200:
+                    return
+                headers = {"Authorization": f"Bearer {token.json()['token']}"}
+                join = await client.post(
+                    f"/v1/sessions/{session_id}/participants:join", headers=headers
+                )
+                statuses[join.status_code] = statuses.get(join.status_code, 0) + 1
+                observer_latency.append(time.perf_counter() - started)
+
+        async def surgeon_loop() -> None:
+            version = 0
+            while not storm_done.is_set():
+                started = time.perf_counter()
+                await client.get(f"/v1/sessions/{session_id}/layout", headers=surgeon)
+                response = await client.post(
+                    f"/v1/sessions/{session_id}/layout",
+                    json={"baseVersion": version, "layout": {"panels": []}},
+                    headers=surgeon,
+                )
+                if response.status_code == 200:
+                    version = response.json()["version"]
+                surgeon_latency.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        surgeon_task = asyncio.create_task(surgeon_loop())
+        started = time.perf_counter()
+        await asyncio.gather(*(observer(i) for i in range(observers)))
+        elapsed = time.perf_counter() - started
+        storm_done.set()
+        await surgeon_task
+
+    print(f"[{label}] storm of {observers} observers took {elapsed:.2f}s, statuses={statuses}")
+    print(f"[{label}] " + summarize_ms("observer token+join", observer_latency))
+    print(f"[{label}] " + summarize_ms("surgeon read+publish", surgeon_latency))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--observers", type=int, default=800)
+    parser.add_argument("--concurrency", type=int, default=400)
+    args = parser.parse_args()
+
+    use_temp_db()
+    from app.core.admission import admission
+    from app.core.database import init_db
+    from app.main import app
+
+    init_db()
+    for enabled in (False, True):
+        admission.enabled = enabled
+        admission.reset()
+        label = "admission-on" if enabled else "admission-off"
+        asyncio.run(_run(app, args.observers, args.concurrency, label))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Microbenchmark for the session-listing and layout serialization paths.
+
+Compares the per-row cost of the pydantic path (dict(row) -> SessionItem ->
+ListSessionsResponse re-validation -> JSON) with the fast path
+(_row_to_payload -> FastJSONResponse) on 100-item pages, and layout
+parse/dump against passing the stored layout_json through.
+
+    python -m benchmarks.bench_serialization --iterations 2000
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import use_temp_db
+
+PAGE_SIZE = 100
+
+
+def _page_rows() -> list[sqlite3.Row]:
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "create table sessions (id, title, visibility, status, created_by, created_at, updated_at)"
+    )
+    now = datetime.now(timezone.utc).isoformat()
+    conn.executemany(
+        "insert into sessions values (?, ?, 'PRIVATE', 'LIVE', 'surgeon', ?, ?)",
+        [(f"session-{i}", f"Case {i}", now, now) for i in range(PAGE_SIZE)],
+    )
+    return conn.execute("select * from sessions").fetchall()
+
+
+def _time(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_temp_db()
+    from fastapi.encoders import jsonable_encoder
+
+    from app.core.responses import FastJSONResponse, RawJSONResponse
+    from app.routes.sessions import _row_to_payload, _to_item
+    from app.schemas.sessions import ListSessionsResponse
+
+    rows = _page_rows()
+
+    def pydantic_page() -> bytes:
+        items = [_to_item(dict(r)) for r in rows]
+        model = ListSessionsResponse(items=items, nextCursor=None)
+        validated = ListSessionsResponse.model_validate(model.model_dump())
+        return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+    def fast_page() -> bytes:
+        items = [_row_to_payload(r) for r in rows]
+        return FastJSONResponse({"items": items, "nextCursor": None}).body
+
+    layout_json = json.dumps(
+        {"panels": [{"id": f"p{i}", "streamId": f"cam-{i}"} for i in range(16)]}
+    )
+
+    def layout_round_trip() -> bytes:
+        return json.dumps({"version": 7, "layout": json.loads(layout_json)}).encode("utf-8")
+
+    def layout_passthrough() -> bytes:
+        return RawJSONResponse(f'{{"version":7,"layout":{layout_json}}}').body
+
+    per_row = args.iterations * PAGE_SIZE
+    slow = _time(pydantic_page, args.iterations)
+    fast = _time(fast_page, args.iterations)
+    print(f"list page ({PAGE_SIZE} rows, {args.iterations} pages)")
+    print(f"  pydantic path: {slow / per_row * 1e6:.2f}us/row")
+    print(f"  fast path:     {fast / per_row * 1e6:.2f}us/row  ({slow / fast:.1f}x)")
+
+    slow = _time(layout_round_trip, args.iterations)
+    fast = _time(layout_passthrough, args.iterations)
+    print("layout response")
+    print(f"  parse/dump:    {slow / args.iterations * 1e6:.2f}us")
+    print(f"  passthrough:   {fast / args.iterations * 1e6:.2f}us  ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Write throughput with many concurrently active sessions: single file vs shards.
+
+Each of --sessions writer threads publishes layouts to its own session as
+fast as it can, against the single-file SQLite engine and the sharded engine
+at several shard counts.
+
+    python -m benchmarks.bench_sharding --sessions 20 --publishes 100
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import use_temp_db
+
+NOW = "2026-10-19T10:00:00+00:00"
+
+
+def _run(engine, sessions: int, publishes: int) -> float:
+    engine.init()
+    engine.upsert_user("bench", "SURGEON", NOW)
+    for s in range(sessions):
+        engine.create_session(f"room-{s}", "bench", "PRIVATE", "bench", "SURGEON", NOW)
+
+    def writer(s: int) -> None:
+        for version in range(publishes):
+            engine.append_layout(f"room-{s}", version, '{"panels":[]}', "bench", NOW)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(writer, range(sessions)))
+    elapsed = time.perf_counter() - started
+    engine.close()
+    return sessions * publishes / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--publishes", type=int, default=100)
+    parser.add_argument("--shards", default="2,4,8")
+    parser.add_argument(
+        "--no-group-commit", action="store_true", help="one transaction per publish"
+    )
+    args = parser.parse_args()
+
+    use_temp_db()
+    if args.no_group_commit:
+        os.environ["GROUP_COMMIT_ENABLED"] = "0"
+    from app.storage import ShardedSQLiteStorage, SQLiteStorage
+
+    def fresh_path() -> str:
+        return os.path.join(tempfile.mkdtemp(prefix="livesurgery-shards-"), "bench.db")
+
+    rate = _run(SQLiteStorage(fresh_path()), args.sessions, args.publishes)
+    print(f"single file: {rate:8.0f} publishes/sec")
+    for count in (int(n) for n in args.shards.split(",")):
+        rate = _run(ShardedSQLiteStorage(fresh_path(), count), args.sessions, args.publishes)
+        print(f"{count:>2} shards:   {rate:8.0f} publishes/sec")
+
+
+if __name__ == "__main__":
+    main()
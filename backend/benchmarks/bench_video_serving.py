@@ -0,0 +1,97 @@
+"""Video range-serving benchmark: cold file reads vs the mmap hot cache.
+
+Writes one `--size-mib` clip to a temp videos dir, then fires `--requests`
+random `--range-kib` Range requests at `/videos/{name}` with `--concurrency`
+in flight, first with the hot cache disabled (open/seek/read per request)
+and then with the clip mapped. Also times a catalog rescan of
+`--files` unchanged files (stat only, no re-parse).
+
+    python -m benchmarks.bench_video_serving --size-mib 64 --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import summarize_ms, use_temp_db
+
+
+async def _run(client, name: str, size: int, args) -> list[float]:
+    span = args.range_kib * 1024
+    semaphore = asyncio.Semaphore(args.concurrency)
+    samples: list[float] = []
+
+    async def one() -> None:
+        start = random.randrange(0, size - span)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(
+                f"/videos/{name}", headers={"Range": f"bytes={start}-{start + span - 1}"}
+            )
+            samples.append(time.perf_counter() - started)
+        assert response.status_code == 206 and len(response.content) == span
+
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    return samples
+
+
+async def _main(args) -> None:
+    import httpx
+
+    from app.main import app
+    from app.services.video_catalog import video_catalog
+
+    name = "bench.mp4"
+    size = args.size_mib * 1024 * 1024
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        video_catalog.cache.admit_after = args.requests * 10
+        started = time.perf_counter()
+        cold = await _run(client, name, size, args)
+        cold_total = time.perf_counter() - started
+        print(summarize_ms("cold (file reads)", cold) + f" total={cold_total:.2f}s")
+
+        video_catalog.cache.admit_after = 1
+        video_catalog.cache.clear()
+        started = time.perf_counter()
+        hot = await _run(client, name, size, args)
+        hot_total = time.perf_counter() - started
+        print(summarize_ms("hot (mmap cache)", hot) + f" total={hot_total:.2f}s")
+        print(f"cache hits={video_catalog.cache.hits} mapped={video_catalog.cache.bytes} bytes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mib", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--range-kib", type=int, default=512)
+    parser.add_argument("--files", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_temp_db()
+    videos_dir = tempfile.mkdtemp(prefix="livesurgery-videos-")
+    os.environ["VIDEOS_DIR"] = videos_dir
+    with open(os.path.join(videos_dir, "bench.mp4"), "wb") as f:
+        f.write(os.urandom(args.size_mib * 1024 * 1024))
+    for i in range(args.files):
+        with open(os.path.join(videos_dir, f"clip-{i}.webm"), "wb") as f:
+            f.write(b"\0" * 64)
+
+    from app.services.video_catalog import video_catalog
+
+    started = time.perf_counter()
+    video_catalog.scan()
+    print(f"initial scan of {args.files + 1} files: {time.perf_counter() - started:.3f}s")
+    started = time.perf_counter()
+    counts = video_catalog.scan()
+    print(f"rescan (unchanged): {time.perf_counter() - started:.3f}s {counts}")
+
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
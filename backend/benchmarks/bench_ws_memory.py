@@ -0,0 +1,171 @@
+"""Idle WebSocket memory benchmark.
+
+Opens N idle realtime connections in-process (spread over rooms of
+`--per-session` observers), waits until every socket is parked in the
+receive loop, and reports the Python heap retained per connection, measured
+with tracemalloc. The fake ASGI transports, scopes and tokens are built
+before the baseline snapshot, so the figure covers what the app keeps per
+socket: the Starlette WebSocket, the handler coroutine and its locals,
+claims, hub and cache entries. It does not include the server's own
+transport/buffers (uvicorn), which sit outside the app.
+
+tests/test_ws_memory.py runs the same harness at a smaller N and enforces
+BYTES_PER_CONNECTION_BUDGET.
+
+    python -m benchmarks.bench_ws_memory --sockets 10000 --per-session 20
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from benchmarks.common import use_temp_db
+
+# Retained app-side heap per idle socket. Measured ~2.6 KiB on CPython 3.11
+# (~2.9 KiB before claims/bucket/cache were slimmed); about half of it is the
+# asyncio task and coroutine frames, which no app change can remove.
+BYTES_PER_CONNECTION_BUDGET = 3 * 1024
+
+
+class _IdleTransport:
+    """ASGI receive/send pair for a client that connects and then says nothing."""
+
+    __slots__ = ("_connected", "_release", "_parked")
+
+    def __init__(self, release: asyncio.Event, parked: list[int]):
+        self._connected = False
+        self._release = release
+        self._parked = parked
+
+    async def receive(self) -> dict:
+        if not self._connected:
+            self._connected = True
+            return {"type": "websocket.connect"}
+        self._parked[0] += 1
+        await self._release.wait()
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def send(self, message: dict) -> None:
+        return None
+
+
+async def measure_idle_sockets(
+    sockets: int, per_session: int, timeout_seconds: float = 120.0
+) -> dict[str, float]:
+    """
+    Open `sockets` idle connections; returns retained bytes and timing figures.
+
+    Raises RuntimeError if a socket finishes without parking (rejected or
+    shed) and TimeoutError if they are not all parked within `timeout_seconds`.
+    """
+    from starlette.websockets import WebSocket
+
+    from app.core.admission import admission
+    from app.routes.realtime import session_ws
+    from app.services.layouts import now_iso
+    from app.services.realtime_hub import hub
+    from app.storage import get_storage
+
+    storage = get_storage()
+    storage.init()
+    stamp = f"wsmem-{time.monotonic_ns()}"
+    release = asyncio.Event()
+    parked = [0]
+    pending = []
+    for room in range((sockets + per_session - 1) // per_session):
+        session_id = f"{stamp}-room{room}"
+        storage.upsert_user(f"{stamp}-owner", "SURGEON", now_iso())
+        storage.create_session(
+            session_id, "bench", "PRIVATE", f"{stamp}-owner", "SURGEON", now_iso()
+        )
+        size = min(per_session, sockets - room * per_session)
+        roster = {f"{stamp}-r{room}-u{i}": "OBSERVER" for i in range(size)}
+        storage.enroll_participants(session_id, roster, now_iso())
+        for user_id in roster:
+            token = hub.mint_token(session_id, user_id, "OBSERVER")
+            transport = _IdleTransport(release, parked)
+            scope = {
+                "type": "websocket",
+                "path": f"/ws/sessions/{session_id}",
+                "headers": [],
+                "query_string": f"token={token}".encode(),
+                "path_params": {"session_id": session_id},
+            }
+            pending.append((scope, transport, session_id, token))
+
+    # Every handshake starts at once, which the ws admission slot would
+    # (rightly) shed; this measures what an admitted socket costs.
+    admission_enabled, admission.enabled = admission.enabled, False
+    try:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(
+                session_ws(WebSocket(scope, transport.receive, transport.send), session_id, token)
+            )
+            for scope, transport, session_id, token in pending
+        ]
+        deadline = started + timeout_seconds
+        while parked[0] < sockets:
+            # A parked socket only returns after `release`, so any finished task
+            # means that socket never will park.
+            finished = [task for task in tasks if task.done()]
+            if finished or time.perf_counter() > deadline:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                tracemalloc.stop()
+                if finished:
+                    raise RuntimeError(
+                        f"{len(finished)} of {sockets} sockets closed before parking "
+                        f"({parked[0]} parked)"
+                    )
+                raise TimeoutError(
+                    f"only {parked[0]} of {sockets} sockets parked within {timeout_seconds}s"
+                )
+            await asyncio.sleep(0.01)
+        open_seconds = time.perf_counter() - started
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+        release.set()
+        await asyncio.gather(*tasks)
+        return {
+            "sockets": sockets,
+            "retained_bytes": retained,
+            "bytes_per_connection": retained / sockets,
+            "open_seconds": open_seconds,
+        }
+
+    finally:
+        admission.enabled = admission_enabled
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--per-session", type=int, default=20)
+    args = parser.parse_args()
+
+    use_temp_db()
+    result = asyncio.run(measure_idle_sockets(args.sockets, args.per_session))
+    per_conn = result["bytes_per_connection"]
+    verdict = "within" if per_conn <= BYTES_PER_CONNECTION_BUDGET else "OVER"
+    print(
+        f"{result['sockets']} idle sockets opened in {result['open_seconds']:.2f}s; "
+        f"retained {result['retained_bytes'] / 1024 / 1024:.1f} MiB"
+    )
+    print(
+        f"{per_conn:.0f} bytes/connection ({verdict} budget of "
+        f"{BYTES_PER_CONNECTION_BUDGET} bytes)"
+    )
+
+
+if __name__ == "__main__":
+    main()
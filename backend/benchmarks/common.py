@@ -0,0 +1,43 @@
+"""Shared helpers for the backend benchmark scripts.
+
+Every script points the app at a throwaway SQLite file *before* importing it,
+so benchmarks never touch backend/app/data/livesurgery.db.
+
+Run from the backend directory, e.g. `python -m benchmarks.bench_layout_polling`.
+"""
+
+import os
+import statistics
+import tempfile
+
+
+def use_temp_db(prefix: str = "livesurgery-bench-") -> str:
+    tmp_dir = tempfile.mkdtemp(prefix=prefix)
+    path = os.path.join(tmp_dir, "bench.db")
+    os.environ["LIVESURGERY_DB_PATH"] = path
+    return path
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_ms(label: str, samples: list[float]) -> str:
+    """Format a latency summary; `samples` are in seconds."""
+    if not samples:
+        return f"{label}: no samples"
+    return (
+        f"{label}: n={len(samples)} "
+        f"mean={statistics.fmean(samples) * 1000:.2f}ms "
+        f"p50={percentile(samples, 50) * 1000:.2f}ms "
+        f"p95={percentile(samples, 95) * 1000:.2f}ms "
+        f"p99={percentile(samples, 99) * 1000:.2f}ms"
+    )
+
+
+def dev_headers(user_id: str, role: str = "SURGEON") -> dict[str, str]:
+    return {"X-Dev-User-Id": user_id, "X-Dev-Role": role}
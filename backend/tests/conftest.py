@@ -0,0 +1,21 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before anything imports app.core.database.
+_TMP_DIR = tempfile.mkdtemp(prefix="livesurgery-tests-")
+os.environ.setdefault("LIVESURGERY_DB_PATH", os.path.join(_TMP_DIR, "test.db"))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture()
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def dev_headers(user_id: str, role: str = "SURGEON") -> dict[str, str]:
+    return {"X-Dev-User-Id": user_id, "X-Dev-Role": role}
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import PRIORITY_HIGH, PRIORITY_LOW, AdmissionLimiter, TokenBucket
+from app.core.errors import AppError
+from app.storage import get_storage
+
+
+def _limiter(queue_timeout: float = 1.0) -> AdmissionLimiter:
+    return AdmissionLimiter(
+        "test", max_concurrency=1, max_queue=1, queue_timeout=queue_timeout, retry_after=3
+    )
+
+
+def test_limiter_sheds_when_observer_queue_is_full() -> None:
+    async def scenario() -> None:
+        limiter = _limiter()
+        await limiter.acquire(PRIORITY_LOW)
+        queued = asyncio.create_task(limiter.acquire(PRIORITY_LOW))
+        await asyncio.sleep(0)
+        with pytest.raises(AppError) as exc_info:
+            await limiter.acquire(PRIORITY_LOW)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "3"}
+        limiter.release()
+        await queued
+        limiter.release()
+        assert limiter.stats.active == 0
+        assert limiter.stats.shed == 1
+
+    asyncio.run(scenario())
+
+
+def test_limiter_admits_surgeons_ahead_of_observers() -> None:
+    async def scenario() -> list[str]:
+        limiter = _limiter()
+        order: list[str] = []
+        await limiter.acquire(PRIORITY_LOW)
+
+        async def worker(name: str, priority: int) -> None:
+            async with limiter.slot(priority):
+                order.append(name)
+
+        observer = asyncio.create_task(worker("observer", PRIORITY_LOW))
+        await asyncio.sleep(0)
+        surgeon = asyncio.create_task(worker("surgeon", PRIORITY_HIGH))
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(observer, surgeon)
+        return order
+
+    assert asyncio.run(scenario()) == ["surgeon", "observer"]
+
+
+def test_limiter_sheds_after_queue_timeout() -> None:
+    async def scenario() -> None:
+        limiter = _limiter(queue_timeout=0.01)
+        await limiter.acquire(PRIORITY_HIGH)
+        with pytest.raises(AppError):
+            await limiter.acquire(PRIORITY_HIGH)
+        limiter.release()
+        assert limiter.stats.active == 0
+        assert limiter.stats.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_token_bucket_limits_bursts() -> None:
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert [bucket.allow() for _ in range(3)] == [True, True, False]
+    assert bucket.retry_after() >= 1
+
+
+def test_ws_handshake_reads_hold_the_admission_slot(client, monkeypatch) -> None:
+    from app.core.admission import admission
+    from conftest import dev_headers
+
+    headers = dev_headers("ws-slot-owner")
+    session_id = client.post("/v1/sessions", json={"title": "Slot"}, headers=headers).json()["id"]
+    token = client.post(f"/v1/sessions/{session_id}/participants:join", headers=headers).json()[
+        "realtime"
+    ]["token"]
+
+    storage = type(get_storage())
+    active_during_read: list[int] = []
+    original = storage.get_session_async
+
+    async def recording_get_session(self, sid):
+        active_during_read.append(admission.limiter("ws").stats.active)
+        return await original(self, sid)
+
+    monkeypatch.setattr(storage, "get_session_async", recording_get_session)
+    with client.websocket_connect(f"/ws/sessions/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["type"] == "layout.snapshot"
+    assert active_during_read == [1]
+
+
+def test_observer_token_storm_is_shed_by_the_queue_bound(client, monkeypatch) -> None:
+    import time
+
+    import httpx
+
+    from app.core.admission import admission
+    from app.main import app
+
+    monkeypatch.setenv("ADMISSION_AUTH_CONCURRENCY", "1")
+    monkeypatch.setenv("ADMISSION_AUTH_QUEUE", "2")
+    monkeypatch.setenv("ADMISSION_QUEUE_TIMEOUT_MS", "30000")
+    admission.reset()
+
+    async def scenario() -> tuple[list[int], int, float]:
+        limiter = admission.limiter("auth")
+        # Hold the only slot so every mint has to queue or be shed.
+        await limiter.acquire(PRIORITY_HIGH)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+
+            def mint(i: int, role: str):
+                return http.post("/auth/token", json={"userId": f"storm-{i}", "role": role})
+
+            started = time.perf_counter()
+            observers = [asyncio.create_task(mint(i, "OBSERVER")) for i in range(6)]
+            surgeon = asyncio.create_task(mint(99, "SURGEON"))
+            while limiter.stats.shed < 4:
+                await asyncio.sleep(0.01)
+            shed_after = time.perf_counter() - started
+            limiter.release()
+            statuses = [r.status_code for r in await asyncio.gather(*observers)]
+            return statuses, (await surgeon).status_code, shed_after
+
+    try:
+        statuses, surgeon_status, shed_after = asyncio.run(scenario())
+    finally:
+        admission.reset()
+    # Beyond the two queued observers, mints are shed at once, not after 30s.
+    assert sorted(statuses) == [200, 200, 503, 503, 503, 503]
+    assert shed_after < 5
+    # The surgeon is not subject to the observer queue bound.
+    assert surgeon_status == 200
@@ -0,0 +1,93 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.database import get_conn
+from app.services.archival import archive_ended_sessions
+from app.services.realtime_hub import hub
+from app.services.version_cache import version_cache
+from app.storage import SQLiteStorage, get_storage
+from conftest import dev_headers
+
+
+def _live_session(client, owner: str) -> tuple[str, dict[str, str]]:
+    headers = dev_headers(owner)
+    session_id = client.post("/v1/sessions", json={"title": "Archive"}, headers=headers).json()[
+        "id"
+    ]
+    for base in range(3):
+        client.post(
+            f"/v1/sessions/{session_id}/layout",
+            json={"baseVersion": base, "layout": {"panels": [{"id": f"p{base}"}]}},
+            headers=headers,
+        )
+    return session_id, headers
+
+
+def test_end_closes_sockets_and_frees_state(client) -> None:
+    session_id, headers = _live_session(client, "archive-end")
+    token = client.post(f"/v1/sessions/{session_id}/participants:join", headers=headers).json()[
+        "realtime"
+    ]["token"]
+
+    with client.websocket_connect(f"/ws/sessions/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["type"] == "layout.snapshot"
+        assert ws.receive_json()["type"] == "presence.updated"
+
+        assert client.post(f"/v1/sessions/{session_id}/end", headers=headers).status_code == 200
+        assert ws.receive_json()["type"] == "session.ended"
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            ws.receive_json()
+        assert exc_info.value.code == 4410
+
+    assert session_id not in hub.active_sessions()
+    assert version_cache.layout_version(session_id) is None
+
+    # Ended sessions refuse new realtime connections.
+    with client.websocket_connect(f"/ws/sessions/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["payload"]["code"] == "SESSION_ENDED"
+
+
+def test_archived_session_is_read_only_but_readable(client) -> None:
+    session_id, headers = _live_session(client, "archive-cold")
+    before = client.get(f"/v1/sessions/{session_id}/layout/history", headers=headers).content
+    client.post(f"/v1/sessions/{session_id}/end", headers=headers)
+
+    assert session_id in archive_ended_sessions(grace_seconds=0)
+    assert session_id not in archive_ended_sessions(grace_seconds=0)
+
+    session = client.get(f"/v1/sessions/{session_id}", headers=headers).json()
+    assert session["status"] == "ARCHIVED"
+    listed = client.get("/v1/sessions", headers=headers).json()["items"]
+    assert session_id in {item["id"] for item in listed}
+    layout = client.get(f"/v1/sessions/{session_id}/layout", headers=headers).json()
+    assert layout["version"] == 3
+    assert layout["layout"] == {"panels": [{"id": "p2", "streamId": None}]}
+    history = client.get(f"/v1/sessions/{session_id}/layout/history", headers=headers)
+    assert history.content == before
+
+    for response in (
+        client.post(f"/v1/sessions/{session_id}/participants:join", headers=headers),
+        client.post(f"/v1/sessions/{session_id}/start", headers=headers),
+        client.post(
+            f"/v1/sessions/{session_id}/layout",
+            json={"baseVersion": 3, "layout": {"panels": []}},
+            headers=headers,
+        ),
+    ):
+        assert response.status_code == 409
+        assert response.json()["error"]["code"] == "SESSION_ARCHIVED"
+
+    if isinstance(get_storage(), SQLiteStorage):
+        with get_conn(get_storage().path) as conn:
+            for table in ("session_layouts", "session_participants"):
+                count = conn.execute(
+                    f"select count(*) from {table} where session_id = ?", (session_id,)
+                ).fetchone()[0]
+                assert count == 0
+
+
+def test_grace_period_keeps_recently_ended_sessions_hot(client) -> None:
+    session_id, headers = _live_session(client, "archive-grace")
+    client.post(f"/v1/sessions/{session_id}/end", headers=headers)
+    assert session_id not in archive_ended_sessions(grace_seconds=3600)
+    assert client.get(f"/v1/sessions/{session_id}", headers=headers).json()["status"] == "ENDED"
@@ -0,0 +1,85 @@
+import json
+
+from app.schemas.sessions import MAX_BULK_ENROLLMENT
+from conftest import dev_headers
+
+
+def test_batch_join_streams_tokens_and_grants_membership(client) -> None:
+    owner = dev_headers("bulk-owner")
+    session_id = client.post("/v1/sessions", json={"title": "Grand rounds"}, headers=owner).json()[
+        "id"
+    ]
+
+    roster = [{"userId": f"bulk-obs-{i}"} for i in range(3)]
+    roster.append({"userId": "bulk-obs-0", "role": "SURGEON"})
+    response = client.post(
+        f"/v1/sessions/{session_id}/participants:batchJoin",
+        json={"participants": roster},
+        headers=dev_headers("bulk-admin", "ADMIN"),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["participant"] for line in lines] == [
+        {"userId": "bulk-obs-0", "role": "SURGEON"},
+        {"userId": "bulk-obs-1", "role": "OBSERVER"},
+        {"userId": "bulk-obs-2", "role": "OBSERVER"},
+    ]
+    assert all(line["realtime"]["token"] for line in lines)
+
+    layout = client.get(
+        f"/v1/sessions/{session_id}/layout", headers=dev_headers("bulk-obs-1", "OBSERVER")
+    )
+    assert layout.status_code == 200
+
+
+def test_batch_join_requires_owner(client) -> None:
+    session_id = client.post(
+        "/v1/sessions", json={"title": "Grand rounds"}, headers=dev_headers("bulk-owner-2")
+    ).json()["id"]
+    response = client.post(
+        f"/v1/sessions/{session_id}/participants:batchJoin",
+        json={"participants": [{"userId": "x"}]},
+        headers=dev_headers("someone-else"),
+    )
+    assert response.status_code == 403
+
+
+def test_owner_surgeon_can_only_enroll_observers(client) -> None:
+    owner = dev_headers("bulk-owner-3")
+    session_id = client.post("/v1/sessions", json={"title": "Rounds"}, headers=owner).json()["id"]
+    for role in ("SURGEON", "ADMIN"):
+        response = client.post(
+            f"/v1/sessions/{session_id}/participants:batchJoin",
+            json={"participants": [{"userId": "bulk-obs"}, {"userId": "bulk-x", "role": role}]},
+            headers=owner,
+        )
+        assert response.status_code == 403
+    # Nothing from the rejected rosters was enrolled.
+    layout = client.get(
+        f"/v1/sessions/{session_id}/layout", headers=dev_headers("bulk-obs", "OBSERVER")
+    )
+    assert layout.status_code == 404
+
+    response = client.post(
+        f"/v1/sessions/{session_id}/participants:batchJoin",
+        json={"participants": [{"userId": "bulk-obs"}]},
+        headers=owner,
+    )
+    assert response.status_code == 200
+
+
+def test_full_roster_fits_the_body_cap(client) -> None:
+    session_id = client.post(
+        "/v1/sessions", json={"title": "Congress"}, headers=dev_headers("bulk-owner-4")
+    ).json()["id"]
+    roster = [{"userId": f"{i:06d}".ljust(200, "x")} for i in range(MAX_BULK_ENROLLMENT)]
+    body = json.dumps({"participants": roster}, indent=2)
+    assert len(body) > 1024 * 1024
+    response = client.post(
+        f"/v1/sessions/{session_id}/participants:batchJoin",
+        content=body,
+        headers={**dev_headers("bulk-owner-4"), "Content-Type": "application/json"},
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Enrolled-Count"] == str(MAX_BULK_ENROLLMENT)
@@ -0,0 +1,76 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+from app.core.database import SCHEMA, init_db, schema_version
+from app.services.layouts import now_iso, publish_layout
+from app.services.live_stats import live_stats
+from app.services.prewarm import prewarm
+from app.services.version_cache import version_cache
+from app.storage import get_storage
+
+
+def _user_version(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("pragma user_version").fetchone()[0]
+
+
+def test_init_db_skips_ddl_when_schema_version_matches(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "nested" / "cold.db")
+    assert init_db(path) is True
+    assert _user_version(path) == schema_version(tuple(SCHEMA))
+    assert init_db(path) is False
+
+    # An older file (or one from before versioning) gets the DDL again.
+    with sqlite3.connect(path) as conn:
+        conn.execute("pragma user_version = 0")
+    assert init_db(path) is True
+    assert init_db(path, force=True) is True
+    monkeypatch.setenv("LIVESURGERY_SCHEMA_MODE", "ddl")
+    assert init_db(path) is True
+
+
+def test_schema_version_tracks_the_table_set() -> None:
+    assert schema_version(("sessions",)) != schema_version(tuple(SCHEMA))
+    assert schema_version(("sessions",)) == schema_version(("sessions",))
+
+
+def test_prewarm_loads_live_layout_versions(client) -> None:
+    storage = get_storage()
+    storage.upsert_user("prewarm-owner", "SURGEON", now_iso())
+    storage.create_session(
+        "prewarm-live", "Prewarm", "PRIVATE", "prewarm-owner", "SURGEON", now_iso()
+    )
+    storage.set_session_status("prewarm-live", "LIVE", now_iso())
+    for base in range(3):
+        publish_layout("prewarm-live", base, {"panels": []}, "prewarm-owner")
+    version_cache.forget("prewarm-live")
+
+    rows = storage.live_sessions()
+    live_stats.load(rows)
+    assert version_cache.layout_version("prewarm-live") is None
+
+    prewarm(rows)
+    assert version_cache.layout_version("prewarm-live") == 3
+    sessions = json.loads(live_stats.snapshot_json())["sessions"]
+    assert next(s for s in sessions if s["id"] == "prewarm-live")["layoutVersion"] == 3
+
+
+def test_app_import_loads_only_the_selected_engine() -> None:
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in sys.modules if m.startswith('app.storage.')))"
+    )
+    env = {**os.environ, "LIVESURGERY_STORAGE": "sqlite"}
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+    ).stdout
+    assert "app.storage.memory" not in out
+    assert "app.storage.sharded" not in out
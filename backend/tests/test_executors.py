@@ -0,0 +1,92 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from app.core.executors import Executors, NamedExecutor
+from conftest import dev_headers
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_stats_track_queued_active_and_completed() -> None:
+    pool = NamedExecutor("test", max_workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking() -> str:
+        started.set()
+        release.wait(5)
+        return "done"
+
+    async def scenario() -> None:
+        first = asyncio.create_task(pool.run(blocking))
+        second = asyncio.create_task(pool.run(lambda: "next"))
+        await asyncio.to_thread(started.wait, 5)
+        stats = pool.snapshot()
+        assert (stats["active"], stats["queued"]) == (1, 1)
+        assert stats["maxQueued"] >= 1
+        release.set()
+        assert await first == "done"
+        assert await second == "next"
+
+    asyncio.run(scenario())
+    stats = pool.snapshot()
+    assert (stats["active"], stats["queued"], stats["completed"]) == (0, 0, 2)
+    assert stats["threads"] == 1
+    pool.shutdown()
+
+
+def test_cancelled_waiter_never_runs_and_leaves_the_queue() -> None:
+    pool = NamedExecutor("test", max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    ran: list[str] = []
+
+    async def scenario() -> None:
+        busy = asyncio.create_task(pool.run(lambda: started.set() or release.wait(5)))
+        waiter = asyncio.create_task(pool.run(ran.append, "late"))
+        await asyncio.to_thread(started.wait, 5)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert pool.snapshot()["queued"] == 0
+        release.set()
+        await busy
+
+    asyncio.run(scenario())
+    assert ran == []
+    pool.shutdown()
+
+
+def test_context_is_carried_into_the_pool() -> None:
+    pool = NamedExecutor("test", max_workers=1)
+
+    async def scenario() -> str | None:
+        _request_id.set("req_1")
+        return await pool.run(_request_id.get)
+
+    assert asyncio.run(scenario()) == "req_1"
+    pool.shutdown()
+
+
+def test_pool_sizes_come_from_env(monkeypatch) -> None:
+    monkeypatch.setenv("EXECUTOR_READ_THREADS", "3")
+    registry = Executors()
+    assert registry.get("read").max_workers == 3
+    assert registry.get("write").max_workers == 4
+    assert set(registry.snapshot()) == {"auth", "read", "write"}
+    with pytest.raises(KeyError):
+        registry.get("unknown")
+    registry.shutdown()
+
+
+def test_ops_executors_endpoint(client) -> None:
+    assert client.get("/v1/ops/executors", headers=dev_headers("pool-user")).status_code == 403
+    client.get("/v1/sessions", headers=dev_headers("pool-user"))
+    pools = client.get("/v1/ops/executors", headers=dev_headers("pool-admin", "ADMIN")).json()[
+        "pools"
+    ]
+    assert set(pools) == {"auth", "read", "write"}
+    assert {"threads", "queued", "active", "completed", "maxQueued", "meanQueueWaitMs"} <= set(
+        pools["read"]
+    )
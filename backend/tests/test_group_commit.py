@@ -0,0 +1,85 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.errors import AppError
+from app.services.layouts import get_latest_layout, publish_layout
+from app.storage import SQLiteStorage, get_storage
+from conftest import dev_headers
+
+
+def test_concurrent_publishes_keep_version_ordering(client) -> None:
+    session_id = client.post(
+        "/v1/sessions", json={"title": "Group commit"}, headers=dev_headers("gc-surgeon")
+    ).json()["id"]
+
+    def publish(i: int) -> int | str:
+        try:
+            return publish_layout(session_id, 0, {"panels": [], "writer": i}, "gc-surgeon")
+        except AppError as exc:
+            return exc.code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(publish, range(8)))
+
+    # Exactly one writer wins version 1; the rest see a conflict, not a lost update.
+    assert results.count(1) == 1
+    assert results.count("LAYOUT_VERSION_CONFLICT") == 7
+    assert get_latest_layout(session_id)[0] == 1
+
+
+def test_failed_write_does_not_poison_its_batch(client) -> None:
+    def boom(conn) -> None:
+        conn.execute("insert into users (id, role, created_at) values ('gc-bad', 'NOPE', 'x')")
+
+    def ok(conn) -> str:
+        conn.execute("insert into users (id, role, created_at) values ('gc-good', 'OBSERVER', 'x')")
+        return "ok"
+
+    storage = get_storage()
+    if not isinstance(storage, SQLiteStorage):
+        pytest.skip("group commit only applies to the sqlite engine")
+    writer = storage.writer
+    bad_future = writer.submit(boom)
+    good_future = writer.submit(ok)
+    assert good_future.result() == "ok"
+    with pytest.raises(Exception):
+        bad_future.result()
+
+
+def test_cancelled_waiter_does_not_kill_the_writer(client) -> None:
+    storage = get_storage()
+    if not isinstance(storage, SQLiteStorage):
+        pytest.skip("group commit only applies to the sqlite engine")
+    writer = storage.writer
+    started, release = threading.Event(), threading.Event()
+    ran: list[str] = []
+
+    def hold(conn) -> None:
+        started.set()
+        release.wait(5)
+
+    def write(name: str):
+        def op(conn) -> str:
+            ran.append(name)
+            return name
+
+        return op
+
+    async def scenario() -> str:
+        held = writer.submit(hold)
+        await asyncio.to_thread(started.wait, 5)
+        # Queued behind the held batch, then abandoned by its caller.
+        waiter = asyncio.create_task(writer.run_async(write("cancelled")))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await asyncio.wrap_future(held)
+        return await asyncio.wait_for(writer.run_async(write("next")), 5)
+
+    assert asyncio.run(scenario()) == "next"
+    assert ran == ["next"]
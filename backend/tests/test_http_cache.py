@@ -0,0 +1,75 @@
+from app.core import auth
+from conftest import dev_headers
+
+
+def _create_session(client, user_id: str) -> str:
+    response = client.post(
+        "/v1/sessions", json={"title": "Cache case"}, headers=dev_headers(user_id)
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_layout_etag_round_trip(client) -> None:
+    headers = dev_headers("etag-surgeon")
+    session_id = _create_session(client, "etag-surgeon")
+
+    first = client.get(f"/v1/sessions/{session_id}/layout", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag == '"layout-0"'
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    cached = client.get(
+        f"/v1/sessions/{session_id}/layout", headers={**headers, "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    published = client.post(
+        f"/v1/sessions/{session_id}/layout",
+        json={"baseVersion": 0, "layout": {"panels": []}},
+        headers=headers,
+    )
+    assert published.json() == {"version": 1}
+
+    refreshed = client.get(
+        f"/v1/sessions/{session_id}/layout", headers={**headers, "If-None-Match": etag}
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] == '"layout-1"'
+    assert refreshed.json()["layout"] == {"panels": []}
+
+
+def test_session_etag_changes_with_status(client) -> None:
+    headers = dev_headers("etag-owner")
+    session_id = _create_session(client, "etag-owner")
+
+    first = client.get(f"/v1/sessions/{session_id}", headers=headers)
+    etag = first.headers["etag"]
+    cached = client.get(f"/v1/sessions/{session_id}", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    client.post(f"/v1/sessions/{session_id}/start", headers=headers)
+    after = client.get(f"/v1/sessions/{session_id}", headers={**headers, "If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.json()["status"] == "LIVE"
+    assert after.headers["etag"] != etag
+
+
+def test_known_users_cache_is_bounded(monkeypatch) -> None:
+    monkeypatch.setattr(auth, "KNOWN_USERS_MAX", 2)
+    monkeypatch.setattr(auth, "_known_users", auth.OrderedDict())
+    for user_id in ("a", "b", "c"):
+        auth._remember_user(user_id, auth.Role.SURGEON)
+    assert list(auth._known_users) == ["b", "c"]
+    assert auth._is_known("b", auth.Role.SURGEON)
+    auth._remember_user("d", auth.Role.SURGEON)
+    assert list(auth._known_users) == ["b", "d"]
+
+
+def test_generated_dev_ids_are_not_remembered(client) -> None:
+    before = len(auth._known_users)
+    for _ in range(3):
+        assert client.get("/v1/sessions").status_code == 200
+    assert len(auth._known_users) == before
@@ -0,0 +1,81 @@
+import gzip
+import json
+
+from conftest import dev_headers
+
+
+def _session_with_history(client, user_id: str, versions: int) -> tuple[str, dict[str, str]]:
+    headers = dev_headers(user_id)
+    session_id = client.post("/v1/sessions", json={"title": "History"}, headers=headers).json()[
+        "id"
+    ]
+    for base in range(versions):
+        layout = {"panels": [{"id": f"p{base}", "streamId": None}]}
+        response = client.post(
+            f"/v1/sessions/{session_id}/layout",
+            json={"baseVersion": base, "layout": layout},
+            headers=headers,
+        )
+        assert response.status_code == 200
+    return session_id, headers
+
+
+def _lines(body: bytes) -> list[dict]:
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+def test_history_streams_ndjson_with_version_range(client) -> None:
+    session_id, headers = _session_with_history(client, "history-owner", 5)
+
+    response = client.get(f"/v1/sessions/{session_id}/layout/history", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = _lines(response.content)
+    assert [row["version"] for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[0]["layout"] == {"panels": [{"id": "p0", "streamId": None}]}
+    assert rows[0]["updatedBy"] == "history-owner"
+    assert rows[0]["updatedAt"].endswith("Z")
+
+    response = client.get(
+        f"/v1/sessions/{session_id}/layout/history",
+        params={"fromVersion": 2, "toVersion": 3},
+        headers=headers,
+    )
+    assert [row["version"] for row in _lines(response.content)] == [2, 3]
+
+    response = client.get(
+        f"/v1/sessions/{session_id}/layout/history",
+        params={"since": "2000-01-01T00:00:00Z", "until": "2000-01-02T00:00:00Z"},
+        headers=headers,
+    )
+    assert response.content == b""
+
+
+def test_history_gzip_mode_is_an_ndjson_archive(client) -> None:
+    session_id, headers = _session_with_history(client, "history-gzip", 3)
+    response = client.get(
+        f"/v1/sessions/{session_id}/layout/history",
+        params={"compress": "gzip"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert ".ndjson.gz" in response.headers["content-disposition"]
+    rows = _lines(gzip.decompress(response.content))
+    assert [row["version"] for row in rows] == [1, 2, 3]
+
+
+def test_history_rejects_bad_range_and_non_members(client) -> None:
+    session_id, headers = _session_with_history(client, "history-range", 1)
+    response = client.get(
+        f"/v1/sessions/{session_id}/layout/history",
+        params={"fromVersion": 3, "toVersion": 2},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == "INVALID_RANGE"
+
+    response = client.get(
+        f"/v1/sessions/{session_id}/layout/history", headers=dev_headers("history-stranger")
+    )
+    assert response.status_code == 404
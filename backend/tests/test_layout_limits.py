@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.schemas.layouts import MAX_LAYOUT_BYTES, MAX_LAYOUT_PANELS, MAX_WS_FRAME_BYTES
+from conftest import dev_headers
+
+
+def _session(client, user_id: str) -> tuple[str, dict[str, str]]:
+    headers = dev_headers(user_id)
+    session_id = client.post("/v1/sessions", json={"title": "Limits"}, headers=headers).json()["id"]
+    return session_id, headers
+
+
+def test_rest_publish_rejects_oversize_body_before_parsing(client) -> None:
+    session_id, headers = _session(client, "limits-rest")
+    body = b'{"baseVersion":0,"layout":{"panels":[]},"pad":"' + b"x" * MAX_LAYOUT_BYTES + b'"}'
+    response = client.post(
+        f"/v1/sessions/{session_id}/layout",
+        content=body,
+        headers={**headers, "Content-Type": "application/json"},
+    )
+    assert response.status_code == 413
+    assert response.json()["error"]["code"] == "PAYLOAD_TOO_LARGE"
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        {"panels": [{"id": f"p{i}"} for i in range(MAX_LAYOUT_PANELS + 1)]},
+        {"panels": [{"id": "p1"}, {"id": "p1"}]},
+        {"panels": [{"id": "p1", "html": "<script>"}]},
+    ],
+)
+def test_rest_publish_rejects_invalid_layouts(client, layout) -> None:
+    session_id, headers = _session(client, "limits-schema")
+    response = client.post(
+        f"/v1/sessions/{session_id}/layout",
+        json={"baseVersion": 0, "layout": layout},
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+
+def test_ws_rejects_invalid_layout_and_oversize_frames(client) -> None:
+    session_id, headers = _session(client, "limits-ws")
+    token = client.post(f"/v1/sessions/{session_id}/participants:join", headers=headers).json()[
+        "realtime"
+    ]["token"]
+
+    with client.websocket_connect(f"/ws/sessions/{session_id}?token={token}") as ws:
+        assert ws.receive_json()["type"] == "layout.snapshot"
+        assert ws.receive_json()["type"] == "presence.updated"
+
+        ws.send_json({"type": "layout.update", "payload": {"baseVersion": 0, "layout": {}}})
+        assert ws.receive_json()["payload"]["code"] == "INVALID_LAYOUT"
+
+        ws.send_text("x" * (MAX_WS_FRAME_BYTES + 1))
+        assert ws.receive_json()["payload"]["code"] == "FRAME_TOO_LARGE"
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            ws.receive_json()
+        assert exc_info.value.code == 1009
+
+
+def test_dockerfile_ws_max_size_matches_frame_cap() -> None:
+    dockerfile = Path(__file__).resolve().parents[1] / "Dockerfile"
+    cmd = json.loads(dockerfile.read_text().split("\nCMD ", 1)[1].splitlines()[0])
+    assert int(cmd[cmd.index("--ws-max-size") + 1]) == MAX_WS_FRAME_BYTES
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+from app.routes.ops import live_events
+from app.services.realtime_hub import hub
+from app.storage import get_storage
+from conftest import dev_headers
+
+ADMIN = dev_headers("ops-admin", "ADMIN")
+
+
+def _live(client) -> dict:
+    response = client.get("/v1/ops/live", headers=ADMIN)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _entry(snapshot: dict, session_id: str) -> dict | None:
+    return next((s for s in snapshot["sessions"] if s["id"] == session_id), None)
+
+
+def test_ops_live_requires_admin(client) -> None:
+    assert client.get("/v1/ops/live", headers=dev_headers("ops-surgeon")).status_code == 403
+    assert client.get("/v1/ops/live/stream", headers=dev_headers("ops-surgeon")).status_code == 403
+
+
+def test_ops_live_tracks_sessions_sockets_and_layouts(client) -> None:
+    headers = dev_headers("ops-owner")
+    session_id = client.post("/v1/sessions", json={"title": "Ops"}, headers=headers).json()["id"]
+    before = _live(client)
+    assert _entry(before, session_id) is None
+
+    client.post(f"/v1/sessions/{session_id}/start", headers=headers)
+    started = _entry(_live(client), session_id)
+    assert started["title"] == "Ops"
+    assert (started["participants"], started["layoutVersion"], started["conflicts"]) == (0, 0, 0)
+
+    for base in range(2):
+        client.post(
+            f"/v1/sessions/{session_id}/layout",
+            json={"baseVersion": base, "layout": {"panels": [{"id": "p1"}]}},
+            headers=headers,
+        )
+    stale = client.post(
+        f"/v1/sessions/{session_id}/layout",
+        json={"baseVersion": 0, "layout": {"panels": []}},
+        headers=headers,
+    )
+    assert stale.status_code == 409
+
+    token = client.post(f"/v1/sessions/{session_id}/participants:join", headers=headers).json()[
+        "realtime"
+    ]["token"]
+    with client.websocket_connect(f"/ws/sessions/{session_id}?token={token}") as ws:
+        ws.receive_json()  # layout.snapshot
+        ws.receive_json()  # presence.updated
+        during = _live(client)
+        entry = _entry(during, session_id)
+        assert (entry["participants"], entry["layoutVersion"], entry["conflicts"]) == (1, 2, 1)
+        assert during["totals"]["sockets"] == before["totals"]["sockets"] + 1
+        assert during["totals"]["layoutUpdates"] == before["totals"]["layoutUpdates"] + 2
+        assert during["totals"]["layoutConflicts"] == before["totals"]["layoutConflicts"] + 1
+        assert during["totals"]["layoutUpdatesPerSecond"] > 0
+
+    client.post(f"/v1/sessions/{session_id}/end", headers=headers)
+    after = _live(client)
+    assert _entry(after, session_id) is None
+    assert after["totals"]["sockets"] == before["totals"]["sockets"]
+
+
+def test_ops_live_matches_a_full_recount(client) -> None:
+    headers = dev_headers("ops-recount")
+    for title in ("Recount A", "Recount B"):
+        session_id = client.post("/v1/sessions", json={"title": title}, headers=headers).json()[
+            "id"
+        ]
+        client.post(f"/v1/sessions/{session_id}/start", headers=headers)
+
+    snapshot = _live(client)
+    live_ids = {row["id"] for row in get_storage().live_sessions()}
+    assert {s["id"] for s in snapshot["sessions"]} == live_ids
+    assert snapshot["totals"]["liveSessions"] == len(live_ids)
+    for entry in snapshot["sessions"]:
+        assert entry["participants"] == asyncio.run(hub.count(entry["id"]))
+
+
+def test_live_events_stream_snapshots_until_disconnect() -> None:
+    class _Request:
+        polls = 0
+
+        async def is_disconnected(self) -> bool:
+            self.polls += 1
+            return self.polls > 2
+
+    async def _collect() -> list[bytes]:
+        return [frame async for frame in live_events(_Request(), interval_seconds=0)]
+
+    frames = asyncio.run(_collect())
+    assert frames[0] == b"retry: 0\n\n"
+    assert len(frames) == 3
+    for frame in frames[1:]:
+        event, data = frame.decode().rstrip("\n").split("\n")
+        assert event == "event: live"
+        assert "totals" in json.loads(data.removeprefix("data: "))
@@ -0,0 +1,34 @@
+from app.routes.sessions import _row_to_payload, _to_item
+from conftest import dev_headers
+
+
+def test_fast_row_payload_matches_pydantic_output() -> None:
+    row = {
+        "id": "s1",
+        "title": "Case",
+        "visibility": "PRIVATE",
+        "status": "LIVE",
+        "created_by": "u1",
+        "created_at": "2026-10-19T12:00:00.123456+00:00",
+        "updated_at": "2026-10-19T12:00:00+00:00",
+    }
+    assert _row_to_payload(row) == _to_item(row).model_dump(mode="json")
+
+
+def test_list_and_layout_fast_paths(client) -> None:
+    headers = dev_headers("serial-surgeon")
+    created = client.post("/v1/sessions", json={"title": "Serial case"}, headers=headers).json()
+
+    listing = client.get("/v1/sessions", headers=headers).json()
+    assert listing["items"][0] == created
+    assert listing["nextCursor"] is None
+
+    layout = {"panels": [{"id": "p1", "streamId": "cam-ü"}]}
+    client.post(
+        f"/v1/sessions/{created['id']}/layout",
+        json={"baseVersion": 0, "layout": layout},
+        headers=headers,
+    )
+    response = client.get(f"/v1/sessions/{created['id']}/layout", headers=headers)
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"version": 1, "layout": layout}
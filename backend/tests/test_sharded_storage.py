@@ -0,0 +1,72 @@
+from app.core.database import get_conn
+from app.storage import ShardedSQLiteStorage, SQLiteStorage
+from app.storage.shard_migration import migrate
+from app.storage.sharded import shard_index
+
+NOW = "2026-10-19T10:00:00+00:00"
+
+
+def test_routing_is_stable_and_spreads_sessions() -> None:
+    assert shard_index("session-a", 4) == shard_index("session-a", 4)
+    assert len({shard_index(f"session-{i}", 4) for i in range(64)}) == 4
+
+
+def test_migration_moves_per_session_rows_into_shards(tmp_path) -> None:
+    path = str(tmp_path / "single.db")
+    single = SQLiteStorage(path)
+    single.init()
+    single.upsert_user("owner", "SURGEON", NOW)
+    for i in range(6):
+        single.create_session(f"s{i}", f"Case {i}", "PRIVATE", "owner", "SURGEON", NOW)
+        single.append_layout(f"s{i}", 0, f'{{"n":{i}}}', "owner", NOW)
+    # Cold-tier rows are per-session too and must follow their session.
+    single.set_session_status("s0", "ENDED", NOW)
+    single.archive_session("s0", NOW)
+    single.close()
+
+    moved = migrate(path, shard_count=3)
+    assert moved == {
+        "session_participants": 5,
+        "session_layouts": 5,
+        "session_archives": 1,
+        "session_layout_archive": 1,
+        "archived_memberships": 1,
+    }
+    with get_conn(path) as conn:
+        assert conn.execute("select count(*) from session_layouts").fetchone()[0] == 0
+
+    sharded = ShardedSQLiteStorage(path, shard_count=3)
+    sharded.init()
+    try:
+        assert len(sharded.list_sessions_for_user("owner", 100, 0)) == 6
+        for i in range(6):
+            assert sharded.is_participant(f"s{i}", "owner")
+            assert sharded.latest_layout(f"s{i}") == (1, f'{{"n":{i}}}')
+    finally:
+        sharded.close()
+
+
+def test_migration_accepts_database_without_archive_tables(tmp_path) -> None:
+    path = str(tmp_path / "old.db")
+    single = SQLiteStorage(path)
+    single.init()
+    single.upsert_user("owner", "SURGEON", NOW)
+    single.create_session("s0", "Case", "PRIVATE", "owner", "SURGEON", NOW)
+    single.append_layout("s0", 0, '{"n":0}', "owner", NOW)
+    single.close()
+    # A file from before the cold tier existed.
+    with get_conn(path) as conn:
+        for table in ("session_archives", "session_layout_archive", "archived_memberships"):
+            conn.execute(f"drop table {table}")
+        conn.execute("pragma user_version = 0")
+
+    moved = migrate(path, shard_count=2)
+    assert moved["session_layouts"] == 1
+    assert moved["session_archives"] == 0
+
+    sharded = ShardedSQLiteStorage(path, shard_count=2)
+    sharded.init()
+    try:
+        assert sharded.latest_layout("s0") == (1, '{"n":0}')
+    finally:
+        sharded.close()
@@ -0,0 +1,233 @@
+"""Behaviour every StorageEngine must share. Runs against each engine."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.errors import AppError
+from app.storage import MemoryStorage, ShardedSQLiteStorage, SQLiteStorage, StorageEngine
+
+T0 = "2026-10-19T10:00:00+00:00"
+T1 = "2026-10-19T11:00:00+00:00"
+T2 = "2026-10-19T12:00:00+00:00"
+
+
+@pytest.fixture(params=["sqlite", "sharded", "memory"])
+def engine(request, tmp_path) -> StorageEngine:
+    if request.param == "sqlite":
+        storage: StorageEngine = SQLiteStorage(str(tmp_path / "conformance.db"))
+    elif request.param == "sharded":
+        storage = ShardedSQLiteStorage(str(tmp_path / "conformance.db"), shard_count=3)
+    else:
+        storage = MemoryStorage()
+    storage.init()
+    yield storage
+    storage.close()
+
+
+def test_user_upsert_updates_role(engine: StorageEngine) -> None:
+    engine.upsert_user("u1", "OBSERVER", T0)
+    engine.upsert_user("u1", "SURGEON", T1)
+    user = engine.get_user("u1")
+    assert user["role"] == "SURGEON"
+    assert user["created_at"] == T0
+    assert engine.get_user("missing") is None
+
+
+def test_session_lifecycle_and_listing(engine: StorageEngine) -> None:
+    engine.upsert_user("owner", "SURGEON", T0)
+    created = engine.create_session("s1", "First", "PRIVATE", "owner", "SURGEON", T0)
+    engine.create_session("s2", "Second", "PUBLIC", "owner", "SURGEON", T1)
+    assert created == engine.get_session("s1")
+    assert created["status"] == "DRAFT"
+    assert engine.is_participant("s1", "owner")
+
+    engine.set_session_status("s1", "LIVE", T2)
+    assert engine.get_session("s1")["status"] == "LIVE"
+    assert engine.live_sessions() == [{"id": "s1", "title": "First", "updated_at": T2}]
+    assert [r["id"] for r in engine.list_sessions_for_user("owner", 10, 0)] == ["s1", "s2"]
+    assert [r["id"] for r in engine.list_sessions_for_user("owner", 1, 1)] == ["s2"]
+    assert engine.list_sessions_for_user("stranger", 10, 0) == []
+    assert engine.get_session("missing") is None
+
+
+def test_participants(engine: StorageEngine) -> None:
+    engine.upsert_user("owner", "SURGEON", T0)
+    engine.create_session("s1", "Case", "PRIVATE", "owner", "SURGEON", T0)
+    engine.upsert_user("viewer", "OBSERVER", T0)
+    assert not engine.is_participant("s1", "viewer")
+    engine.upsert_participant("s1", "viewer", "OBSERVER", T1)
+    assert engine.is_participant("s1", "viewer")
+
+    assert engine.set_participant_role("s1", "viewer", "ADMIN")
+    assert not engine.set_participant_role("s1", "nobody", "ADMIN")
+
+    engine.upsert_user("existing", "ADMIN", T0)
+    engine.enroll_participants("s1", {"existing": "OBSERVER", "new": "OBSERVER"}, T1)
+    assert engine.is_participant("s1", "existing")
+    assert engine.is_participant("s1", "new")
+    # Enrollment must not clobber an existing user's role.
+    assert engine.get_user("existing")["role"] == "ADMIN"
+    assert engine.get_user("new")["role"] == "OBSERVER"
+
+
+def test_async_api_matches_sync(engine: StorageEngine) -> None:
+    async def scenario() -> None:
+        engine.upsert_user("owner", "SURGEON", T0)
+        created = await engine.create_session_async(
+            "s1", "First", "PRIVATE", "owner", "SURGEON", T0
+        )
+        assert await engine.get_session_async("s1") == created
+        assert await engine.get_session_async("missing") is None
+        await engine.set_session_status_async("s1", "LIVE", T1)
+        assert (await engine.get_session_async("s1"))["status"] == "LIVE"
+
+        assert not await engine.is_participant_async("s1", "u1")
+        await engine.upsert_participant_async("s1", "u1", "OBSERVER", T1)
+        assert await engine.is_participant_async("s1", "u1")
+        rows = await engine.list_sessions_for_user_async("u1", 10, 0)
+        assert [r["id"] for r in rows] == ["s1"]
+
+        assert await engine.latest_layout_async("s1") is None
+        await engine.append_layout_async("s1", 0, '{"panels":[]}', "owner", T2)
+        assert await engine.latest_layout_async("s1") == (1, '{"panels":[]}')
+
+    asyncio.run(scenario())
+
+
+def test_layout_versions_and_conflicts(engine: StorageEngine) -> None:
+    engine.upsert_user("owner", "SURGEON", T0)
+    engine.create_session("s1", "Case", "PRIVATE", "owner", "SURGEON", T0)
+    assert engine.latest_layout("s1") is None
+
+    assert engine.append_layout("s1", 0, '{"panels":[]}', "owner", T1) == 1
+    assert engine.append_layout("s1", 1, '{"panels":[1]}', "owner", T2) == 2
+    with pytest.raises(AppError) as exc_info:
+        engine.append_layout("s1", 1, '{"stale":true}', "owner", T2)
+    assert exc_info.value.code == "LAYOUT_VERSION_CONFLICT"
+    assert engine.latest_layout("s1") == (2, '{"panels":[1]}')
+
+
+@pytest.mark.parametrize("base_version,expected", [(0, 1), (5, None)])
+def test_async_append_matches_sync(engine: StorageEngine, base_version, expected) -> None:
+    engine.upsert_user("owner", "SURGEON", T0)
+    engine.create_session("s1", "Case", "PRIVATE", "owner", "SURGEON", T0)
+
+    async def publish():
+        return await engine.append_layout_async("s1", base_version, "{}", "owner", T1)
+
+    if expected is None:
+        with pytest.raises(AppError):
+            asyncio.run(publish())
+    else:
+        assert asyncio.run(publish()) == expected
+
+
+def test_default_async_api_offloads_to_the_executors() -> None:
+    """An engine that only implements the sync API must not block the event loop."""
+
+    class SyncOnlyStorage(MemoryStorage):
+        _offload = StorageEngine._offload
+
+        def append_layout(self, *args) -> int:
+            threads.append(threading.current_thread().name)
+            return super().append_layout(*args)
+
+    threads: list[str] = []
+    engine = SyncOnlyStorage()
+    engine.upsert_user("owner", "SURGEON", T0)
+    engine.create_session("s1", "Case", "PRIVATE", "owner", "SURGEON", T0)
+    assert asyncio.run(engine.append_layout_async("s1", 0, "{}", "owner", T1)) == 1
+    assert len(threads) == 1 and threads[0].startswith("write-pool")
+
+
+def test_layout_history_pages_and_filters(engine: StorageEngine) -> None:
+    engine.upsert_user("owner", "SURGEON", T0)
+    engine.create_session("s1", "Case", "PRIVATE", "owner", "SURGEON", T0)
+    stamps = [T0, T0, T1, T1, T2]
+    for base, stamp in enumerate(stamps):
+        engine.append_layout("s1", base, f'{{"v":{base + 1}}}', "owner", stamp)
+
+    pages = list(engine.iter_layout_history("s1", chunk_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [row["version"] for page in pages for row in page] == [1, 2, 3, 4, 5]
+    assert pages[0][0] == {
+        "version": 1,
+        "layout_json": '{"v":1}',
+        "updated_by": "owner",
+        "updated_at": T0,
+    }
+
+    def versions(**filters) -> list[int]:
+        return [
+            row["version"]
+            for page in engine.iter_layout_history("s1", chunk_size=2, **filters)
+            for row in page
+        ]
+
+    assert versions(from_version=2, to_version=4) == [2, 3, 4]
+    assert versions(since=T1) == [3, 4, 5]
+    assert versions(since=T0, until=T1) == [1, 2]
+    assert versions(from_version=4, since=T0, until=T2) == [4]
+    assert versions(from_version=9) == []
+    assert list(engine.iter_layout_history("missing")) == []
+
+
+def test_archived_session_reads_are_transparent(engine: StorageEngine, monkeypatch) -> None:
+    # Small chunks so the archived history spans several compressed blobs.
+    monkeypatch.setattr("app.storage.sqlite.ARCHIVE_CHUNK_ROWS", 2)
+    monkeypatch.setattr("app.storage.memory.ARCHIVE_CHUNK_ROWS", 2)
+    engine.upsert_user("owner", "SURGEON", T0)
+    engine.create_session("s1", "Case", "PRIVATE", "owner", "SURGEON", T0)
+    engine.enroll_participants("s1", {"viewer": "OBSERVER"}, T0)
+    for base, stamp in enumerate([T0, T0, T1, T1, T2]):
+        engine.append_layout("s1", base, f'{{"v":{base + 1}}}', "owner", stamp)
+    engine.set_session_status("s1", "ENDED", T1)
+
+    def history(**filters) -> list[dict]:
+        return [
+            row
+            for page in engine.iter_layout_history("s1", chunk_size=2, **filters)
+            for row in page
+        ]
+
+    before = history()
+    assert engine.ended_sessions(T2, 10) == ["s1"]
+    assert engine.ended_sessions(T0, 10) == []
+
+    assert engine.archive_session("s1", T2) is True
+    assert engine.archive_session("s1", T2) is False
+
+    assert engine.is_participant("s1", "viewer")
+    assert not engine.is_participant("s1", "stranger")
+    assert [s["id"] for s in engine.list_sessions_for_user("viewer", 10, 0)] == ["s1"]
+    assert engine.latest_layout("s1") == (5, '{"v":5}')
+    assert history() == before
+    assert [r["version"] for r in history(from_version=2, to_version=4)] == [2, 3, 4]
+    assert [r["version"] for r in history(since=T1, until=T2)] == [3, 4]
+    with pytest.raises(AppError) as exc_info:
+        engine.append_layout("s1", 5, "{}", "owner", T2)
+    assert exc_info.value.code == "SESSION_ARCHIVED"
+
+
+def test_archive_skips_sessions_no_longer_ended(engine: StorageEngine) -> None:
+    engine.upsert_user("owner", "SURGEON", T0)
+    engine.create_session("s1", "Case", "PRIVATE", "owner", "SURGEON", T0)
+    engine.append_layout("s1", 0, '{"v":1}', "owner", T0)
+    engine.set_session_status("s1", "ENDED", T0)
+    assert engine.ended_sessions(T1, 10) == ["s1"]
+
+    # Restarted between the archival listing and the archive itself.
+    engine.set_session_status("s1", "LIVE", T1)
+    assert engine.archive_session("s1", T2) is False
+    assert engine.get_session("s1")["status"] == "LIVE"
+    assert engine.append_layout("s1", 1, '{"v":2}', "owner", T2) == 2
+
+    engine.set_session_status("s1", "ENDED", T2)
+    assert engine.archive_session("s1", T2) is True
+    assert engine.get_session("s1")["status"] == "ARCHIVED"
+    # ARCHIVED is terminal.
+    engine.set_session_status("s1", "LIVE", T2)
+    assert engine.get_session("s1")["status"] == "ARCHIVED"
+    assert engine.latest_layout("s1") == (2, '{"v":2}')
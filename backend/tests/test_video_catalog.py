@@ -0,0 +1,159 @@
+import os
+import struct
+
+import pytest
+
+from app.services.mp4 import read_mp4_metadata
+from app.services.video_catalog import video_catalog
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _mp4(duration_ms: int = 5000, mdat: bytes = b"\0" * 4096, large_mdat: bool = False) -> bytes:
+    mvhd = _box(b"mvhd", struct.pack(">4xIIII", 0, 0, 1000, duration_ms).ljust(100, b"\0"))
+    hdlr = _box(b"hdlr", b"\0" * 8 + b"vide" + b"\0" * 13)
+    sample_entry = struct.pack(">I4s", 86, b"avc1") + b"\0" * 24 + struct.pack(">HH", 1280, 720)
+    stsd = _box(b"stsd", struct.pack(">II", 0, 1) + sample_entry.ljust(86, b"\0"))
+    stbl = _box(b"stbl", stsd)
+    mdia = _box(b"mdia", hdlr + _box(b"minf", stbl))
+    moov = _box(b"moov", mvhd + _box(b"trak", mdia))
+    if large_mdat:
+        mdat_box = struct.pack(">I4sQ", 1, b"mdat", 16 + len(mdat)) + mdat
+    else:
+        mdat_box = _box(b"mdat", mdat)
+    return _box(b"ftyp", b"isom\0\0\0\0") + mdat_box + moov
+
+
+@pytest.fixture()
+def video_dir(tmp_path):
+    original = video_catalog.root
+    (tmp_path / "case-a.mp4").write_bytes(_mp4(5000, mdat=bytes(range(256)) * 64))
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "case-b.mp4").write_bytes(_mp4(90_500, large_mdat=True))
+    (tmp_path / "notes.txt").write_text("not a video")
+    video_catalog.set_root(str(tmp_path))
+    video_catalog.scan()
+    yield tmp_path
+    video_catalog.set_root(original)
+
+
+@pytest.mark.parametrize("large_mdat", [False, True])
+def test_moov_metadata_is_parsed_past_mdat(tmp_path, large_mdat) -> None:
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(_mp4(12_345, large_mdat=large_mdat))
+    with open(path, "rb") as f:
+        metadata = read_mp4_metadata(f)
+    assert metadata.duration_seconds == pytest.approx(12.345)
+    assert (metadata.codec, metadata.width, metadata.height) == ("avc1", 1280, 720)
+
+
+def test_scan_is_incremental(video_dir) -> None:
+    assert [entry.name for entry in video_catalog.list()] == ["case-a.mp4", "nested/case-b.mp4"]
+    assert video_catalog.scan() == {"added": 0, "updated": 0, "removed": 0}
+
+    before = video_catalog.get("case-a.mp4")
+    (video_dir / "case-a.mp4").write_bytes(_mp4(7000))
+    os.remove(video_dir / "nested" / "case-b.mp4")
+    (video_dir / "case-c.mov").write_bytes(_mp4(1000))
+    assert video_catalog.scan() == {"added": 1, "updated": 1, "removed": 1}
+    after = video_catalog.get("case-a.mp4")
+    assert after.etag != before.etag
+    assert after.duration_seconds == pytest.approx(7.0)
+    assert video_catalog.get("nested/case-b.mp4") is None
+    assert video_catalog.get("../outside.mp4") is None
+
+
+def test_catalog_listing_api(client, video_dir) -> None:
+    response = client.get("/video/catalog")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["name"] for item in items] == ["case-a.mp4", "nested/case-b.mp4"]
+    assert items[1]["durationSeconds"] == pytest.approx(90.5)
+    assert items[1]["codec"] == "avc1"
+    assert items[0]["url"] == "/videos/case-a.mp4"
+
+    cached = client.get("/video/catalog", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+    assert client.get("/video/catalog/nested/case-b.mp4").json()["width"] == 1280
+    assert client.get("/video/catalog/missing.mp4").status_code == 404
+
+
+def test_video_files_serve_ranges_cold_and_hot(client, video_dir) -> None:
+    data = (video_dir / "case-a.mp4").read_bytes()
+
+    full = client.get("/videos/case-a.mp4")
+    assert full.status_code == 200
+    assert full.content == data
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-type"] == "video/mp4"
+
+    # Second request admits the file into the hot cache; later ranges come from the map.
+    for _ in range(2):
+        part = client.get("/videos/case-a.mp4", headers={"Range": "bytes=100-1123"})
+        assert part.status_code == 206
+        assert part.content == data[100:1124]
+        assert part.headers["content-range"] == f"bytes 100-1123/{len(data)}"
+    assert "case-a.mp4" in video_catalog.cache
+
+    suffix = client.get("/videos/case-a.mp4", headers={"Range": "bytes=-10"})
+    assert suffix.content == data[-10:]
+    open_ended = client.get("/videos/case-a.mp4", headers={"Range": f"bytes={len(data) - 5}-"})
+    assert open_ended.content == data[-5:]
+
+    unsatisfiable = client.get("/videos/case-a.mp4", headers={"Range": f"bytes={len(data)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(data)}"
+
+    stale_if_range = client.get(
+        "/videos/case-a.mp4", headers={"Range": "bytes=0-9", "If-Range": '"other"'}
+    )
+    assert stale_if_range.status_code == 200
+    assert len(stale_if_range.content) == len(data)
+
+    not_modified = client.get("/videos/case-a.mp4", headers={"If-None-Match": full.headers["etag"]})
+    assert not_modified.status_code == 304
+
+    head = client.head("/videos/case-a.mp4")
+    assert head.status_code == 200
+    assert head.headers["content-length"] == str(len(data))
+    assert head.content == b""
+
+    assert client.get("/videos/missing.mp4").status_code == 404
+
+
+def test_files_changed_since_the_scan_are_served_as_they_are_now(client, video_dir) -> None:
+    path = video_dir / "case-a.mp4"
+    for _ in range(2):  # admitted to the hot cache at the old size
+        assert client.get("/videos/case-a.mp4").status_code == 200
+    old_etag = video_catalog.get("case-a.mp4").etag
+
+    shorter = path.read_bytes()[:1000]
+    path.write_bytes(shorter)
+    os.utime(path, ns=(1, 1))
+    response = client.get("/videos/case-a.mp4")
+    assert response.status_code == 200
+    assert response.content == shorter
+    assert response.headers["content-length"] == "1000"
+    assert response.headers["etag"] != old_etag
+
+    path.unlink()
+    assert client.get("/videos/case-a.mp4").status_code == 404
+
+
+def test_range_response_refuses_a_file_shorter_than_promised(client, tmp_path) -> None:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core.byte_ranges import ByteRangeResponse
+    from app.main import app
+
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"x" * 100)
+    probe = FastAPI(exception_handlers=app.exception_handlers)
+    probe.get("/clip")(lambda: ByteRangeResponse(str(path), 0, 199))
+    response = TestClient(probe).get("/clip")
+    assert response.status_code == 503
+    assert response.json()["error"]["code"] == "VIDEO_CHANGED"
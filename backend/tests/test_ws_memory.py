@@ -0,0 +1,54 @@
+import asyncio
+
+from app.services.idle_eviction import evict_idle_sessions
+from app.services.realtime_hub import hub
+from app.services.version_cache import VersionCache, version_cache
+from benchmarks.bench_ws_memory import BYTES_PER_CONNECTION_BUDGET, measure_idle_sockets
+
+
+def test_idle_sockets_stay_within_memory_budget() -> None:
+    result = asyncio.run(measure_idle_sockets(sockets=1000, per_session=20))
+    assert result["bytes_per_connection"] <= BYTES_PER_CONNECTION_BUDGET, result
+    # Every room was dropped from the hub once its last socket closed.
+    assert not hub.active_sessions()
+
+
+def test_evict_idle_keeps_live_sessions() -> None:
+    cache = VersionCache()
+    for session_id in ("live", "idle"):
+        cache.set_layout_version(session_id, 3)
+        cache.set_session_stamp(session_id, "2026-01-01T00:00:00+00:00")
+        cache.remember_member(session_id, "u1")
+
+    assert cache.evict_idle(0, keep={"live"}) == 1
+    assert cache.layout_version("idle") is None
+    assert not cache.is_member("idle", "u1")
+    assert cache.layout_version("live") == 3
+    assert cache.is_member("live", "u1")
+
+    # Recently used entries survive a non-zero TTL.
+    assert cache.evict_idle(60) == 0
+    assert len(cache) == 1
+
+
+def test_read_racing_eviction_does_not_resurrect_session() -> None:
+    cache = VersionCache()
+    cache.set_layout_version("s1", 1)
+    # A reader fetched the version, then the sweep dropped the session
+    # before the reader refreshed its last-used time.
+    cache.forget("s1")
+    cache._touch("s1")
+    assert len(cache) == 0
+
+
+def test_evict_idle_sessions_sweeps_shared_cache(client) -> None:
+    headers = {"X-Dev-User-Id": "evict-owner", "X-Dev-Role": "SURGEON"}
+    session_id = client.post("/v1/sessions", json={"title": "Evict"}, headers=headers).json()["id"]
+    assert version_cache.layout_version(session_id) == 0
+
+    evict_idle_sessions(0)
+    assert version_cache.layout_version(session_id) is None
+
+    # Evicted state is rebuilt from storage on the next read.
+    assert client.get(f"/v1/sessions/{session_id}/layout", headers=headers).status_code == 200
+    assert version_cache.layout_version(session_id) == 0